@@ -5,7 +5,7 @@ Contiene constantes y ajustes globales para toda la aplicación.
 import os
 from dotenv import load_dotenv
 
-# Cargar variables de entorno
+# Cargar variables de entorno (único punto de carga: el resto de módulos las lee de aquí)
 load_dotenv()
 
 # Configuración de la aplicación
@@ -19,25 +19,91 @@ requerimientos específicos de tu sistema.
 # Configuración de OpenAI
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4")  # Modelo por defecto
+OPENAI_API_BASE = os.getenv("OPENAI_API_BASE")  # URL base alternativa (p. ej. un servidor local de pruebas)
+OPENAI_STREAMING = os.getenv("OPENAI_STREAMING", "1") == "1"  # Mostrar las respuestas a medida que llegan
+OPENAI_MAX_TOKENS_PROMPT = int(os.getenv("OPENAI_MAX_TOKENS_PROMPT", 6000))  # Máximo de tokens por petición
+
+# Cliente compartido de OpenAI: concurrencia, pool de conexiones, reintentos y timeout
+OPENAI_MAX_CONCURRENCIA = int(os.getenv("OPENAI_MAX_CONCURRENCIA", 8))  # Peticiones en curso a la vez
+OPENAI_MAX_CONEXIONES = int(os.getenv("OPENAI_MAX_CONEXIONES", 16))
+OPENAI_REINTENTOS = int(os.getenv("OPENAI_REINTENTOS", 5))
+OPENAI_ESPERA_BASE = float(os.getenv("OPENAI_ESPERA_BASE", 1.0))  # Segundos
+OPENAI_ESPERA_MAX = float(os.getenv("OPENAI_ESPERA_MAX", 30.0))  # Segundos
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", 60.0))  # Segundos
 
 # Umbrales para interpretación difusa
 UMBRAL_BAJO = 0.33
 UMBRAL_MEDIO = 0.66
 UMBRAL_ALTO = 0.67
 
-# Pesos de las categorías para el cálculo final
-PESOS_CATEGORIAS = {
-    "División y Autonomía de Servicios": 0.4,
-    "Disponibilidad, Integración y Escalabilidad Global": 0.35,
-    "Arquitectura Orientada a Eventos": 0.25
-}
+# Diferencia máxima de puntuación para considerar dos arquitecturas cercanas
+UMBRAL_CERCANIA = 0.15
+
+# Motor de puntuación: "lineal" (media ponderada) o "difuso" (inferencia difusa, ver utils.inferencia_difusa)
+MOTOR_PUNTUACION = os.getenv("MOTOR_PUNTUACION", "lineal")
+INFERENCIA_ANCHO_TRANSICION = 0.1  # Anchura de la transición entre niveles de INTERPRETACION_DIFUSA
+INFERENCIA_PUNTOS = 101  # Puntos del universo de salida para la defuzzificación por centroide
+
+# Encuesta: enviar cada categoría en un formulario (una ejecución del script por categoría)
+ENCUESTA_MODO_FORMULARIO = os.getenv("ENCUESTA_MODO_FORMULARIO", "1") == "1"
+
+# Encuesta adaptativa (modo formulario): omite las categorías que ya no pueden cambiar el
+# resultado y permite terminar en cuanto la recomendación está decidida (solo con el motor lineal)
+ENCUESTA_ADAPTATIVA = os.getenv("ENCUESTA_ADAPTATIVA", "1") == "1" and MOTOR_PUNTUACION == "lineal"
+
+# Simulación de Monte Carlo de la incertidumbre en modo difuso
+MONTECARLO_MUESTRAS = int(os.getenv("MONTECARLO_MUESTRAS", 4000))
+MONTECARLO_SEMILLA = 12345  # Fija: las mismas respuestas muestran siempre las mismas probabilidades
+
+# Gráfico de radar: formato ("svg" nativo o "png" con matplotlib) y tamaño de la caché compartida
+RADAR_FORMATO = os.getenv("RADAR_FORMATO", "svg")
+RADAR_CACHE_MAX_ENTRADAS = int(os.getenv("RADAR_CACHE_MAX_ENTRADAS", 256))
 
 # Rutas de archivos
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
 os.makedirs(DATA_DIR, exist_ok=True)
 
-# Archivo para guardar resultados de encuestas
-RESULTADOS_FILE = os.path.join(DATA_DIR, "resultados.json")
+# Documentos de contexto de cada arquitectura (dentro de DATA_DIR)
+ARCHIVOS_CONTEXTO = {
+    "microservicios": "contexto_microservicios.json",
+    "eventos": "contexto_eventos.json",
+    "monolitico": "contexto_monolitico.json",
+    "hibrido": "contexto_hibrido.json"
+}
+
+# Banco de preguntas de la encuesta: archivos <banco>.v<versión>.json en PREGUNTAS_DIR
+PREGUNTAS_DIR = os.path.join(DATA_DIR, "preguntas")
+PREGUNTAS_BANCO = os.getenv("PREGUNTAS_BANCO", "arquitectura")  # Banco o variante a usar
+PREGUNTAS_VERSION = int(os.getenv("PREGUNTAS_VERSION", 0))  # 0 = la versión más reciente
+
+# Máximo de preguntas para precalcular la tabla binaria (2^N combinaciones; con más se evalúa al vuelo)
+TABLA_BINARIA_MAX_PREGUNTAS = int(os.getenv("TABLA_BINARIA_MAX_PREGUNTAS", 22))
+
+# Secciones de contexto que se envían en cada pregunta del chat (0 = documentos completos)
+CONTEXTO_SECCIONES_TOP_K = int(os.getenv("CONTEXTO_SECCIONES_TOP_K", 4))
+
+# Índice vectorial de la documentación (se construye con `python -m utils.indice_vectorial`)
+CONOCIMIENTO_PATRONES = ["contexto_*.json", "conocimiento/*.md", "conocimiento/*.json"]  # Relativos a DATA_DIR
+INDICE_VECTORIAL_DIR = os.path.join(DATA_DIR, "indice_vectorial")
+INDICE_VECTORIAL_ACTIVO = os.getenv("INDICE_VECTORIAL_ACTIVO", "1") == "1"  # Usarlo si está construido
+INDICE_VECTORIAL_DIMENSION = int(os.getenv("INDICE_VECTORIAL_DIMENSION", 128))
+INDICE_VECTORIAL_SIMILITUD_MIN = float(os.getenv("INDICE_VECTORIAL_SIMILITUD_MIN", 0.1))
+
+# Archivo para guardar resultados de encuestas (JSONL, un registro por encuesta finalizada)
+RESULTADOS_FILE = os.path.join(DATA_DIR, "resultados.jsonl")
+RESULTADOS_INTERVALO_FSYNC = float(os.getenv("RESULTADOS_INTERVALO_FSYNC", 1.0))  # Segundos
+RESULTADOS_MAX_LOTE = int(os.getenv("RESULTADOS_MAX_LOTE", 100))  # Registros por escritura
+RESULTADOS_MAX_BYTES = int(os.getenv("RESULTADOS_MAX_BYTES", 16 * 1024 * 1024))  # Tamaño para rotar
+RESULTADOS_MAX_SEGMENTOS = int(os.getenv("RESULTADOS_MAX_SEGMENTOS", 8))  # Segmentos antes de compactar
+
+# Instantánea de las estadísticas agregadas de las encuestas guardadas
+ESTADISTICAS_FILE = os.path.join(DATA_DIR, "estadisticas.json")
+
+# Caché persistente de respuestas de OpenAI
+CACHE_RESPUESTAS_ACTIVA = os.getenv("CACHE_RESPUESTAS_ACTIVA", "1") == "1"
+CACHE_RESPUESTAS_FILE = os.path.join(DATA_DIR, "cache_respuestas.sqlite3")
+CACHE_RESPUESTAS_TTL = int(os.getenv("CACHE_RESPUESTAS_TTL", 7 * 24 * 3600))  # Segundos
+CACHE_RESPUESTAS_MAX_ENTRADAS = int(os.getenv("CACHE_RESPUESTAS_MAX_ENTRADAS", 5000))
 
 # Frases de interpretación de resultados
 FRASES_INTERPRETACION = {
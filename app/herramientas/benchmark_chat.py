@@ -0,0 +1,165 @@
+"""
+Benchmark de extremo a extremo del chat.
+Simula muchos usuarios concurrentes que mantienen conversaciones con el asesor a través
+de get_openai_response (o de su versión en streaming) y reporta la latencia p50/p95/p99,
+el tiempo hasta el primer token y el throughput. Por defecto arranca el servidor mock
+local, de modo que no se consumen créditos de la API.
+
+Uso (desde la carpeta app/):
+    python -m herramientas.benchmark_chat --usuarios 50 --turnos 4 --stream
+    python -m herramientas.benchmark_chat --base-url http://127.0.0.1:8800/v1 --usuarios 20
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import sys
+import threading
+import time
+
+
+def iniciar_mock(latencia, tokens_por_segundo, tokens, tasa_errores):
+    """Arranca el servidor mock en un hilo propio y devuelve su URL base"""
+    from aiohttp import web
+    from herramientas.servidor_mock_openai import ServidorMock
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        puerto = s.getsockname()[1]
+
+    servidor = ServidorMock(latencia, tokens_por_segundo, tokens, tasa_errores)
+    loop = asyncio.new_event_loop()
+    listo = threading.Event()
+
+    async def arrancar():
+        runner = web.AppRunner(servidor.aplicacion())
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", puerto).start()
+        listo.set()
+
+    def ejecutar():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(arrancar())
+        loop.run_forever()
+
+    threading.Thread(target=ejecutar, name="servidor-mock", daemon=True).start()
+    listo.wait()
+    return f"http://127.0.0.1:{puerto}/v1"
+
+
+def percentil(valores, p):
+    """Percentil p (0-100) con interpolación lineal"""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    posicion = (len(ordenados) - 1) * p / 100
+    inferior = int(posicion)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (posicion - inferior)
+
+
+def simular_usuario(turnos, stream, latencias, ttfts, errores, lock):
+    """Completa una encuesta aleatoria y mantiene una conversación de varios turnos"""
+    from utils.evaluacion_helper import procesar_respuestas, generar_interpretacion_textual
+    from utils.modelo_evaluacion import MODELO
+    from utils.openai_helper import get_openai_response, get_openai_response_stream
+
+    respuestas = {str(id_pregunta): {"valor": float(random.randint(0, 1))} for id_pregunta in MODELO.ids}
+    resultados = procesar_respuestas(respuestas)
+    recomendacion = resultados["recomendacion"]
+    historial = []
+    preguntas = [
+        "¿Qué tecnologías debería usar?",
+        "¿Cuáles son las ventajas y desventajas?",
+        "¿Cómo planifico la migración de forma incremental?",
+        "¿Qué patrones de integración recomiendas?",
+    ]
+
+    for turno in range(turnos):
+        pregunta = f"{random.choice(preguntas)} (usuario {threading.get_ident()}, turno {turno})"
+        context = {
+            "resultados_encuesta": resultados,
+            "interpretacion_preliminar": generar_interpretacion_textual(resultados),
+            "historial_chat": list(historial),
+            "tiene_arquitecturas_cercanas": bool(recomendacion["cercanas"]),
+            "arquitectura_principal": recomendacion["tipo"],
+            "arquitecturas_cercanas": recomendacion["cercanas"],
+        }
+
+        inicio = time.perf_counter()
+        primer_token = None
+        if stream:
+            fragmentos = []
+            for fragmento in get_openai_response_stream(pregunta, context):
+                if primer_token is None:
+                    primer_token = time.perf_counter() - inicio
+                fragmentos.append(fragmento)
+            respuesta = "".join(fragmentos)
+        else:
+            respuesta = get_openai_response(pregunta, context)
+        duracion = time.perf_counter() - inicio
+
+        with lock:
+            if respuesta.startswith("Lo siento, ha ocurrido un error"):
+                errores.append(respuesta)
+            else:
+                latencias.append(duracion)
+                if primer_token is not None:
+                    ttfts.append(primer_token)
+
+        historial.append({"role": "user", "content": pregunta})
+        historial.append({"role": "assistant", "content": respuesta})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de latencia del chat de asesoría.")
+    parser.add_argument("--usuarios", type=int, default=20, help="Usuarios concurrentes")
+    parser.add_argument("--turnos", type=int, default=3, help="Turnos de conversación por usuario")
+    parser.add_argument("--stream", action="store_true", help="Usar respuestas en streaming")
+    parser.add_argument("--base-url", help="URL base de la API (por defecto se arranca el servidor mock)")
+    parser.add_argument("--con-cache", action="store_true", help="No desactivar la caché de respuestas")
+    parser.add_argument("--latencia", type=float, default=0.5, help="Mock: segundos hasta el primer token")
+    parser.add_argument("--tokens-por-segundo", type=float, default=40.0, help="Mock: velocidad de generación")
+    parser.add_argument("--tokens", type=int, default=100, help="Mock: tokens por respuesta")
+    parser.add_argument("--tasa-errores", type=float, default=0.0, help="Mock: fracción de respuestas 429")
+    args = parser.parse_args(argv)
+
+    base_url = args.base_url or iniciar_mock(args.latencia, args.tokens_por_segundo, args.tokens, args.tasa_errores)
+
+    # La configuración se lee al importar los módulos de la aplicación
+    os.environ["OPENAI_API_BASE"] = base_url
+    os.environ.setdefault("OPENAI_API_KEY", "clave-benchmark")
+    os.environ.setdefault("OPENAI_MODEL", "gpt-4")
+    if not args.con_cache:
+        os.environ["CACHE_RESPUESTAS_ACTIVA"] = "0"
+    from utils.cliente_openai import obtener_cliente
+
+    latencias, ttfts, errores = [], [], []
+    lock = threading.Lock()
+    hilos = [
+        threading.Thread(target=simular_usuario, args=(args.turnos, args.stream, latencias, ttfts, errores, lock))
+        for _ in range(args.usuarios)
+    ]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    duracion = time.perf_counter() - inicio
+
+    print(f"Endpoint: {base_url}")
+    print(f"Usuarios: {args.usuarios} | Turnos por usuario: {args.turnos} | Streaming: {'sí' if args.stream else 'no'}")
+    print(f"Turnos completados: {len(latencias)} | Errores: {len(errores)} | Duración: {duracion:.2f} s")
+    print(f"Throughput: {len(latencias) / duracion:.2f} turnos/s")
+    print("Latencia total (s): p50={:.3f} p95={:.3f} p99={:.3f}".format(
+        percentil(latencias, 50), percentil(latencias, 95), percentil(latencias, 99)))
+    if ttfts:
+        print("Primer token (s):   p50={:.3f} p95={:.3f} p99={:.3f}".format(
+            percentil(ttfts, 50), percentil(ttfts, 95), percentil(ttfts, 99)))
+    print(f"Cliente OpenAI: {obtener_cliente().metricas()}")
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Evaluador por lotes de encuestas desde la línea de comandos.
+Lee respuestas en formato JSONL (un objeto por línea) desde un archivo o la entrada
+estándar y escribe en JSONL la recomendación y las puntuaciones globales de cada una.
+Procesa la entrada en bloques, por lo que la memoria usada no depende del tamaño del archivo.
+
+Cada línea de entrada puede ser:
+    {"id": "abc", "respuestas": {"1": 1.0, "2": 0.0, ...}}
+    {"1": {"valor": 1.0, "peso": 0.9, "categoria": "..."}, ...}   (formato de la encuesta)
+
+Uso (desde la carpeta app/):
+    python -m herramientas.evaluar_lote respuestas.jsonl -o resultados.jsonl --procesos 4
+    python -m herramientas.evaluar_lote respuestas.jsonl --motor difuso
+    cat respuestas.jsonl | python -m herramientas.evaluar_lote > resultados.jsonl
+"""
+import argparse
+import json
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from utils.modelo_evaluacion import MODELO
+from config import MOTOR_PUNTUACION
+from utils.evaluacion_helper import MOTORES, procesar_respuestas_lote, recomendacion_desde_lote
+
+
+def evaluar_bloque(lineas, primera_linea, motor=MOTOR_PUNTUACION):
+    """
+    Evalúa un bloque de líneas JSONL.
+
+    Args:
+        lineas (list): Líneas de texto del bloque
+        primera_linea (int): Número de línea (desde 1) de la primera línea del bloque
+        motor (str, optional): Motor de puntuación ("lineal" o "difuso")
+
+    Returns:
+        tuple: (texto JSONL con un resultado por línea, número de líneas con error)
+    """
+    identificadores = []
+    vectores = []
+    salida = [None] * len(lineas)
+    errores = 0
+
+    for posicion, linea in enumerate(lineas):
+        numero_linea = primera_linea + posicion
+        try:
+            registro = json.loads(linea)
+            respuestas = registro["respuestas"] if "respuestas" in registro else registro
+            identificador = registro.get("id", numero_linea)
+            vector = MODELO.vector_respuestas(respuestas)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            errores += 1
+            salida[posicion] = json.dumps({"id": numero_linea, "error": f"Línea inválida: {e}"}, ensure_ascii=False)
+            continue
+        # Solo se añaden a la vez, cuando la línea es válida, para que las listas queden alineadas
+        identificadores.append((posicion, identificador))
+        vectores.append(vector)
+
+    if vectores:
+        resultados = procesar_respuestas_lote(np.vstack(vectores), motor)
+        for fila, (posicion, identificador) in enumerate(identificadores):
+            recomendacion = recomendacion_desde_lote(resultados, fila)
+            salida[posicion] = json.dumps({
+                "id": identificador,
+                "recomendacion": {
+                    "tipo": recomendacion["tipo"],
+                    "descripcion": recomendacion["descripcion"],
+                    "puntuacion": recomendacion["puntuacion"],
+                    "cercanas": recomendacion["cercanas"]
+                },
+                "puntuaciones_globales": dict(zip(resultados["arquitecturas"],
+                                                  resultados["puntuaciones_globales"][fila].tolist())),
+                "promedios_categorias": dict(zip(resultados["categorias"],
+                                                 resultados["promedios"][fila].tolist()))
+            }, ensure_ascii=False)
+
+    return "".join(f"{linea}\n" for linea in salida), errores
+
+
+def leer_bloques(entrada, tamano_bloque):
+    """Genera bloques (lineas, primera_linea) de como mucho tamano_bloque líneas no vacías"""
+    bloque = []
+    primera_linea = 1
+    for numero_linea, linea in enumerate(entrada, start=1):
+        if not linea.strip():
+            continue
+        if not bloque:
+            primera_linea = numero_linea
+        bloque.append(linea)
+        if len(bloque) >= tamano_bloque:
+            yield bloque, primera_linea
+            bloque = []
+    if bloque:
+        yield bloque, primera_linea
+
+
+def evaluar_flujo(entrada, salida, tamano_bloque=5000, procesos=1, motor=MOTOR_PUNTUACION):
+    """
+    Evalúa todas las encuestas de un flujo JSONL y escribe los resultados en orden.
+
+    Args:
+        entrada: Archivo de texto con una encuesta por línea
+        salida: Archivo de texto donde se escriben los resultados
+        tamano_bloque (int): Número de encuestas por bloque
+        procesos (int): Número de procesos de trabajo (1 = sin paralelismo)
+        motor (str, optional): Motor de puntuación ("lineal" o "difuso")
+
+    Returns:
+        tuple: (encuestas procesadas, líneas con error)
+    """
+    total = 0
+    errores = 0
+
+    if procesos <= 1:
+        for lineas, primera_linea in leer_bloques(entrada, tamano_bloque):
+            texto, errores_bloque = evaluar_bloque(lineas, primera_linea, motor)
+            salida.write(texto)
+            total += len(lineas)
+            errores += errores_bloque
+        return total, errores
+
+    # Como mucho dos bloques pendientes por proceso para acotar la memoria
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        pendientes = deque()
+        for lineas, primera_linea in leer_bloques(entrada, tamano_bloque):
+            pendientes.append((len(lineas), ejecutor.submit(evaluar_bloque, lineas, primera_linea, motor)))
+            if len(pendientes) >= 2 * procesos:
+                cantidad, futuro = pendientes.popleft()
+                texto, errores_bloque = futuro.result()
+                salida.write(texto)
+                total += cantidad
+                errores += errores_bloque
+        while pendientes:
+            cantidad, futuro = pendientes.popleft()
+            texto, errores_bloque = futuro.result()
+            salida.write(texto)
+            total += cantidad
+            errores += errores_bloque
+
+    return total, errores
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evalúa encuestas de arquitectura en formato JSONL.")
+    parser.add_argument("entrada", nargs="?", default="-",
+                        help="Archivo JSONL de entrada ('-' o vacío para la entrada estándar)")
+    parser.add_argument("-o", "--salida", default="-",
+                        help="Archivo JSONL de salida ('-' para la salida estándar)")
+    parser.add_argument("--tamano-bloque", type=int, default=5000,
+                        help="Encuestas evaluadas por bloque (por defecto 5000)")
+    parser.add_argument("--procesos", type=int, default=1,
+                        help="Número de procesos de trabajo (por defecto 1)")
+    parser.add_argument("--motor", choices=MOTORES, default=MOTOR_PUNTUACION,
+                        help=f"Motor de puntuación (por defecto {MOTOR_PUNTUACION})")
+    args = parser.parse_args(argv)
+
+    entrada = sys.stdin if args.entrada == "-" else open(args.entrada, "r", encoding="utf-8")
+    salida = sys.stdout if args.salida == "-" else open(args.salida, "w", encoding="utf-8")
+    try:
+        total, errores = evaluar_flujo(entrada, salida, args.tamano_bloque, args.procesos, args.motor)
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if salida is not sys.stdout:
+            salida.close()
+
+    print(f"Encuestas procesadas: {total} (con error: {errores})", file=sys.stderr)
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
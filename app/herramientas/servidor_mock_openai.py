@@ -0,0 +1,119 @@
+"""
+Servidor local que imita el endpoint ChatCompletion de la API de OpenAI.
+Sirve para probar y medir el chat sin consumir créditos: responde a
+POST /v1/chat/completions con texto generado, con o sin streaming (SSE), simulando
+una latencia hasta el primer token y una velocidad de generación configurables.
+
+Uso (desde la carpeta app/):
+    python -m herramientas.servidor_mock_openai --puerto 8800 --latencia 0.5 --tokens-por-segundo 40
+    OPENAI_API_BASE=http://127.0.0.1:8800/v1 streamlit run main.py
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from aiohttp import web
+
+PALABRAS = (
+    "arquitectura servicio evento escalabilidad despliegue dominio consistencia mensaje "
+    "cola resiliencia latencia contrato integración módulo datos patrón"
+).split()
+
+
+class ServidorMock:
+    """
+    Simulador del endpoint de chat.
+
+    Args:
+        latencia (float): Segundos hasta el primer token
+        tokens_por_segundo (float): Velocidad de generación tras el primer token
+        tokens (int): Tokens de cada respuesta
+        tasa_errores (float): Fracción de peticiones que responden 429 (para probar reintentos)
+    """
+
+    def __init__(self, latencia=0.5, tokens_por_segundo=40.0, tokens=150, tasa_errores=0.0):
+        self.latencia = latencia
+        self.tokens_por_segundo = tokens_por_segundo
+        self.tokens = tokens
+        self.tasa_errores = tasa_errores
+        self.peticiones = 0
+
+    def aplicacion(self):
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self.chat_completions)
+        app.router.add_post("/chat/completions", self.chat_completions)
+        return app
+
+    async def chat_completions(self, request):
+        self.peticiones += 1
+        cuerpo = await request.json()
+        modelo = cuerpo.get("model") or "mock"
+        max_tokens = min(cuerpo.get("max_tokens") or self.tokens, self.tokens)
+
+        if self.tasa_errores and random.random() < self.tasa_errores:
+            return web.json_response(
+                {"error": {"message": "Rate limit simulado", "type": "rate_limit_error"}},
+                status=429, headers={"Retry-After": "1"}
+            )
+
+        identificador = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        fragmentos = [f"{random.choice(PALABRAS)} " for _ in range(max_tokens)]
+        await asyncio.sleep(self.latencia)
+
+        if not cuerpo.get("stream"):
+            await asyncio.sleep(len(fragmentos) / self.tokens_por_segundo)
+            return web.json_response({
+                "id": identificador,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": modelo,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(fragmentos)},
+                    "finish_reason": "stop"
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": len(fragmentos), "total_tokens": len(fragmentos)}
+            })
+
+        respuesta = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await respuesta.prepare(request)
+        for indice, fragmento in enumerate(fragmentos):
+            if indice:
+                await asyncio.sleep(1 / self.tokens_por_segundo)
+            delta = {"role": "assistant", "content": fragmento} if indice == 0 else {"content": fragmento}
+            await respuesta.write(self._evento(identificador, modelo, delta, None))
+        await respuesta.write(self._evento(identificador, modelo, {}, "stop"))
+        await respuesta.write(b"data: [DONE]\n\n")
+        await respuesta.write_eof()
+        return respuesta
+
+    @staticmethod
+    def _evento(identificador, modelo, delta, finish_reason):
+        datos = {
+            "id": identificador,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": modelo,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+        }
+        return f"data: {json.dumps(datos, ensure_ascii=False)}\n\n".encode("utf-8")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor local que imita la API ChatCompletion de OpenAI.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8800)
+    parser.add_argument("--latencia", type=float, default=0.5, help="Segundos hasta el primer token")
+    parser.add_argument("--tokens-por-segundo", type=float, default=40.0, help="Velocidad de generación")
+    parser.add_argument("--tokens", type=int, default=150, help="Tokens por respuesta")
+    parser.add_argument("--tasa-errores", type=float, default=0.0, help="Fracción de respuestas 429")
+    args = parser.parse_args(argv)
+
+    servidor = ServidorMock(args.latencia, args.tokens_por_segundo, args.tokens, args.tasa_errores)
+    web.run_app(servidor.aplicacion(), host=args.host, port=args.puerto)
+
+
+if __name__ == "__main__":
+    main()
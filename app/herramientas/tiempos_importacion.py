@@ -0,0 +1,76 @@
+"""
+Informe de tiempos de importación (arranque en frío) de la aplicación.
+Importa cada módulo en un intérprete nuevo con `python -X importtime`, de modo que no se
+beneficia de módulos ya cargados, y resume el tiempo total de cada uno y las
+dependencias más costosas. Sirve para vigilar el arranque de nuevas réplicas del contenedor.
+
+Uso (desde la carpeta app/):
+    python -m herramientas.tiempos_importacion
+    python -m herramientas.tiempos_importacion pages.chat utils.graficos --top 15 --repeticiones 3
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+# Módulos que se miden por defecto: la portada (config + streamlit) y cada página
+MODULOS_POR_DEFECTO = ["config", "streamlit", "pages.inicio", "pages.encuesta", "pages.chat"]
+
+
+def medir_importacion(modulo):
+    """
+    Importa un módulo en un proceso nuevo y devuelve los tiempos de -X importtime.
+
+    Args:
+        modulo (str): Nombre del módulo a importar
+
+    Returns:
+        tuple: (tiempo acumulado total en ms, lista de (módulo, propio ms, acumulado ms),
+            mensaje de error o None)
+    """
+    directorio_app = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=directorio_app, capture_output=True, text=True
+    )
+
+    tiempos = []
+    for linea in proceso.stderr.splitlines():
+        # Formato: "import time:  propio |  acumulado | [sangría]módulo"
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, nombre = linea[len("import time:"):].split("|", 2)
+        tiempos.append((nombre.strip(), int(propio) / 1000, int(acumulado) / 1000))
+
+    # El acumulado del módulo pedido incluye todas sus dependencias no cargadas antes
+    total = next((acumulado for nombre, _, acumulado in tiempos if nombre == modulo), 0.0)
+    error = None
+    if proceso.returncode != 0:
+        error = proceso.stderr.strip().splitlines()[-1] if proceso.stderr.strip() else "error desconocido"
+    return total, tiempos, error
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tiempos de importación en frío de los módulos de la aplicación.")
+    parser.add_argument("modulos", nargs="*", default=MODULOS_POR_DEFECTO, help="Módulos a medir")
+    parser.add_argument("--top", type=int, default=10, help="Dependencias más lentas a mostrar por módulo")
+    parser.add_argument("--repeticiones", type=int, default=1, help="Mediciones por módulo (se informa la mediana)")
+    args = parser.parse_args(argv)
+
+    errores = 0
+    for modulo in args.modulos:
+        mediciones = [medir_importacion(modulo) for _ in range(max(1, args.repeticiones))]
+        mediciones.sort(key=lambda medicion: medicion[0])
+        total, tiempos, error = mediciones[len(mediciones) // 2]
+
+        print(f"{modulo}: {total:.1f} ms ({len(tiempos)} módulos importados)")
+        if error:
+            errores += 1
+            print(f"  ERROR: {error}")
+        for nombre, propio, acumulado in sorted(tiempos, key=lambda t: t[1], reverse=True)[:args.top]:
+            print(f"  {propio:9.1f} ms propio | {acumulado:9.1f} ms acumulado | {nombre}")
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
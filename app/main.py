@@ -1,8 +1,23 @@
+import importlib
 import streamlit as st
-import os
-from pages import inicio, encuesta, chat
 from config import APP_TITLE, APP_DESCRIPTION
 
+# Módulo de cada página. Se importan al navegar a ellas por primera vez, de modo que la
+# portada no carga numpy, openai ni el motor de evaluación; Python guarda en caché los
+# módulos ya importados, así que las recargas posteriores no repiten el coste.
+MODULOS_PAGINAS = {
+    "inicio": "pages.inicio",
+    "encuesta": "pages.encuesta",
+    "chat": "pages.chat",
+    "estadisticas": "pages.estadisticas"
+}
+
+
+def cargar_pagina(page_id):
+    """Importa (solo la primera vez en el proceso) y devuelve el módulo de una página"""
+    return importlib.import_module(MODULOS_PAGINAS[page_id])
+
+
 def main():
     # Configuración inicial de la aplicación
     st.set_page_config(
@@ -25,7 +40,8 @@ def main():
         pages = {
             "inicio": "🏠 Inicio",
             "encuesta": "📝 Evaluación",
-            "chat": "💬 Chatbot"
+            "chat": "💬 Chatbot",
+            "estadisticas": "📊 Estadísticas"
         }
         
         # Navegación a través de botones
@@ -43,12 +59,8 @@ def main():
             st.write("Este asistente utiliza IA para ayudarte a determinar la arquitectura de software más adecuada para tu proyecto.")
     
     # Renderizar la página actual
-    if st.session_state.page == "inicio":
-        inicio.app()
-    elif st.session_state.page == "encuesta":
-        encuesta.app()
-    elif st.session_state.page == "chat":
-        chat.app()
+    if st.session_state.page in MODULOS_PAGINAS:
+        cargar_pagina(st.session_state.page).app()
 
 if __name__ == "__main__":
     main()
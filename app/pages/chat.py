@@ -1,10 +1,13 @@
 import streamlit as st
 import json
 import os
-from utils.openai_helper import get_openai_response, cargar_contexto_arquitectura
-import matplotlib.pyplot as plt
-import numpy as np
-import matplotlib as mpl
+from utils.openai_helper import get_openai_response, get_openai_response_stream, cargar_contexto_arquitectura
+from config import OPENAI_STREAMING, RADAR_FORMATO, MOTOR_PUNTUACION
+from utils.graficos import generar_radar
+from utils.incertidumbre import probabilidades_recomendacion
+from utils.sensibilidad import analizar_sensibilidad, principales_factores
+from utils.evaluacion_helper import obtener_nombre_arquitectura
+from utils.modelo_evaluacion import MODELO
 
 def app():
     st.title("Chat de Asesoría Arquitectónica")
@@ -20,6 +23,9 @@ def app():
     
     resultados = st.session_state.resultados_encuesta
     
+    # Preguntas que no llegaron a responderse porque la encuesta adaptativa terminó antes
+    imputadas = int(MODELO.mascara_imputadas(st.session_state.respuestas).sum()) if st.session_state.get("respuestas") else 0
+    
     # Crear un gráfico de resumen por categoría
     categorias = [cat for cat in resultados.keys() if cat not in ["puntuaciones_globales", "recomendacion"]]
     promedios = [resultados[cat]["promedio"] for cat in categorias]
@@ -48,6 +54,12 @@ def app():
             delta=f"{'+' if promedios[2] > 0.5 else ''}{(promedios[2] - 0.5):.2f}"
         )
     
+    if imputadas:
+        st.caption(
+            f"La encuesta terminó antes porque la recomendación ya estaba decidida: las {imputadas} preguntas "
+            f"sin responder cuentan con un valor neutro (0.5) en los promedios y las puntuaciones."
+        )
+    
     # Mostrar puntuaciones globales en un gráfico de radar
     st.subheader("Valoración Estilo Arquitectónico")
     
@@ -66,6 +78,43 @@ def app():
         arquitecturas_cercanas_presentes = True
         st.info(f"También podrías considerar: {', '.join([arq.capitalize() for arq in recomendacion['cercanas']])}")
     
+    # En modo difuso, mostrar la probabilidad de cada arquitectura dada la imprecisión de las respuestas
+    if st.session_state.get("modo_respuesta") == "difuso" and st.session_state.get("respuestas"):
+        # Las simulaciones solo dependen de las respuestas: se calculan una vez por encuesta
+        # y no en cada ejecución del script (cada mensaje del chat vuelve a ejecutar la página)
+        if st.session_state.get("incertidumbre_encuesta") is None:
+            st.session_state.incertidumbre_encuesta = probabilidades_recomendacion(st.session_state.respuestas)
+        incertidumbre = st.session_state.incertidumbre_encuesta
+        with st.expander("📊 Confianza de la recomendación", expanded=False):
+            st.caption(
+                f"Probabilidad de que cada arquitectura obtenga la mayor puntuación si cada respuesta varía "
+                f"dentro de su banda (baja, media o alta), estimada con {incertidumbre['muestras']} simulaciones."
+            )
+            for arquitectura, probabilidad in sorted(incertidumbre["ganadora"].items(), key=lambda x: -x[1]):
+                inferior, superior = incertidumbre["intervalos"][arquitectura]
+                st.progress(probabilidad, text=(
+                    f"{obtener_nombre_arquitectura(arquitectura)}: {probabilidad:.0%} "
+                    f"(puntuación entre {inferior:.2f} y {superior:.2f})"
+                ))
+            st.caption(f"Probabilidad de recomendar un enfoque híbrido: {incertidumbre['recomendacion']['hibrido']:.0%}")
+    
+    # Respuestas que más cerca están de cambiar la recomendación (análisis exacto del motor lineal)
+    if st.session_state.get("respuestas") and MOTOR_PUNTUACION == "lineal":
+        analisis = analizar_sensibilidad(st.session_state.respuestas)
+        with st.expander("🔍 ¿Qué respuestas cambiarían tu resultado?", expanded=False):
+            for pregunta in principales_factores(analisis, 5):
+                cambio = pregunta["cambio_recomendacion"]
+                if cambio is None:
+                    efecto = "por sí sola no cambia la recomendación."
+                elif st.session_state.get("modo_respuesta") == "binario":
+                    efecto = (f"responder lo contrario cambiaría la recomendación a "
+                              f"{obtener_nombre_arquitectura(pregunta['nueva_recomendacion'])}."
+                              if pregunta["invertir_cambia"] else "por sí sola no cambia la recomendación.")
+                else:
+                    efecto = (f"{'bajarla' if cambio < 0 else 'subirla'} a {pregunta['valor'] + cambio:.2f} "
+                              f"cambiaría la recomendación a {obtener_nombre_arquitectura(pregunta['nueva_recomendacion'])}.")
+                st.markdown(f"- **{pregunta['id']}. {pregunta['texto']}** (respuesta actual {pregunta['valor']:.2f}): {efecto}")
+    
     # Interpretación textual (como estaba en el estado de sesión)
     st.write(st.session_state.interpretacion_preliminar)
     
@@ -73,81 +122,12 @@ def app():
     col_grafico, col_contexto = st.columns([1, 1])
     
     with col_grafico:
-        # Extraer puntuaciones para cada arquitectura
-        puntuaciones = resultados["puntuaciones_globales"]
-        
-        # Crear nombres más claros para la visualización
-        nombres_arquitecturas = {
-            "microservicios": "Microservicios",
-            "eventos": "Eventos",
-            "monolitico": "Monolítica",
-            "hibrido": "SOA"  # Cambiamos híbrido por SOA para adaptar a la imagen
-        }
-        
-        # Preparar datos para el gráfico radar
-        arquitecturas = [nombres_arquitecturas.get(arq, arq) for arq in puntuaciones.keys()]
-        valores = [puntuaciones[arq] for arq in puntuaciones.keys()]
-        
-        # Crear valores ideales (1.0) para cada arquitectura
-        valores_ideales = [1.0] * len(arquitecturas)
-        
-        # Crear valores mínimos (0.33) para cada arquitectura
-        valores_minimos = [0.33] * len(arquitecturas)
-        
-        # Configurar el gráfico de radar
-        fig = plt.figure(figsize=(6, 5))  # Tamaño reducido
-        ax = fig.add_subplot(111, polar=True)
-        
-        # Configurar el estilo del gráfico
-        plt.style.use('default')
-        
-        # Número de variables
-        N = len(arquitecturas)
-        
-        # Calcular ángulos para cada eje (en radianes)
-        angulos = [n / float(N) * 2 * np.pi for n in range(N)]
-        
-        # Cerrar el polígono repitiendo el primer ángulo
-        angulos += angulos[:1]
-        
-        # Ajustar valores para cerrar el polígono
-        valores += valores[:1]
-        valores_ideales += valores_ideales[:1]
-        valores_minimos += valores_minimos[:1]
-        
-        # Añadir los ejes
-        plt.xticks(angulos[:-1], arquitecturas, size=10)  # Tamaño de texto reducido
-        
-        # Dibujar límites del gráfico
-        ax.set_rlabel_position(0)
-        plt.yticks([0.2, 0.4, 0.6, 0.8, 1.0], ["20%", "40%", "60%", "80%", "100%"], color="grey", size=8)  # Tamaño de texto reducido
-        plt.ylim(0, 1)
-        
-        # Dibujar cada línea y rellenar área
-        ax.plot(angulos, valores_ideales, linewidth=1, linestyle='dashed', color='blue', label='Ideal', alpha=0.9)
-        ax.plot(angulos, valores, linewidth=2, linestyle='solid', color='green', label='Real', alpha=0.9)
-        ax.plot(angulos, valores_minimos, linewidth=1, linestyle='dotted', color='red', label='Mínimo', alpha=0.9)
-        
-        # Rellenar áreas
-        ax.fill(angulos, valores, color='green', alpha=0.2)
-        
-        # Añadir valores numéricos a los puntos del polígono real
-        for i, valor in enumerate(valores[:-1]):  # Excluir el último que es repetido
-            porcentaje = int(valor * 100)
-            ax.annotate(f"{porcentaje}%", 
-                       xy=(angulos[i], valor),
-                       xytext=(angulos[i], valor + 0.05),
-                       ha='center',
-                       va='bottom',
-                       bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.7),
-                       fontsize=8)  # Tamaño de texto reducido
-        
-        # Añadir título y leyenda
-        plt.title('VALORACIÓN ESTILO ARQUITECTÓNICO', size=12, y=1.1)  # Tamaño del título reducido
-        plt.legend(loc='upper right', bbox_to_anchor=(0.1, 0.1), fontsize=8)  # Tamaño de leyenda reducido
-        
-        # Mostrar gráfico en Streamlit
-        st.pyplot(fig)
+        # Gráfico de radar de las puntuaciones globales (servido desde la caché compartida)
+        grafico = generar_radar(resultados["puntuaciones_globales"])
+        if RADAR_FORMATO == "svg":
+            st.markdown(grafico.decode("utf-8"), unsafe_allow_html=True)
+        else:
+            st.image(grafico, use_column_width=True)
 
     with col_contexto:
         # Sección para mostrar el contexto de la arquitectura
@@ -263,6 +243,7 @@ def app():
         context = {
             "resultados_encuesta": resultados,
             "interpretacion_preliminar": st.session_state.interpretacion_preliminar,
+            "preguntas_sin_responder": imputadas,
             "historial_chat": st.session_state.messages[:-1]  # Todo el historial excepto el último mensaje
         }
         
@@ -288,15 +269,22 @@ def app():
         else:
             context["tiene_arquitecturas_cercanas"] = False
         
-        # Obtener respuesta del modelo
-        response = get_openai_response(prompt, context)
+        # Obtener y mostrar la respuesta del modelo
+        with st.chat_message("assistant", avatar="🤖"):
+            if OPENAI_STREAMING:
+                # Mostrar los fragmentos a medida que llegan
+                marcador = st.empty()
+                response = ""
+                for fragmento in get_openai_response_stream(prompt, context):
+                    response += fragmento
+                    marcador.markdown(response + "▌")
+                marcador.markdown(response)
+            else:
+                response = get_openai_response(prompt, context)
+                st.write(response)
         
         # Agregar respuesta del asistente al historial
         st.session_state.messages.append({"role": "assistant", "content": response})
-        
-        # Mostrar respuesta del asistente
-        with st.chat_message("assistant", avatar="🤖"):
-            st.write(response)
 
 if __name__ == "__main__":
     app()
@@ -2,16 +2,24 @@ import streamlit as st
 import numpy as np
 import json
 import os
-from context.arquitectura_data import PREGUNTAS_ARQUITECTURA, INTERPRETACION_DIFUSA
-from utils.evaluacion_helper import procesar_respuestas, generar_interpretacion_textual
+from context.arquitectura_data import BANCO_PREGUNTAS, INTERPRETACION_DIFUSA
+from utils.evaluacion_helper import procesar_respuestas, generar_interpretacion_textual, obtener_nombre_arquitectura
+from utils.modelo_evaluacion import MODELO
+from utils.persistencia_resultados import guardar_resultado
+from utils.puntuacion_incremental import AcumuladorPuntuaciones
+from utils.cuestionario_adaptativo import estado_adaptativo, completar_respuestas
+from utils.estado_sesion import RespuestasSesion, ResultadosSesion
+from config import ENCUESTA_MODO_FORMULARIO, ENCUESTA_ADAPTATIVA, MOTOR_PUNTUACION
 
 def app():
     st.title("Evaluación de Arquitectura de Software")
     st.write("Responde las siguientes preguntas para recibir una recomendación sobre la arquitectura más adecuada para tu sistema.")
     
-    # Configuración de sesión para guardar respuestas
+    # Configuración de sesión para guardar respuestas (vector compacto por posición de pregunta)
     if 'respuestas' not in st.session_state:
-        st.session_state.respuestas = {}
+        st.session_state.respuestas = RespuestasSesion()
+    elif not isinstance(st.session_state.respuestas, RespuestasSesion):
+        st.session_state.respuestas = RespuestasSesion(st.session_state.respuestas)
     
     if 'pagina_actual' not in st.session_state:
         st.session_state.pagina_actual = 0
@@ -34,10 +42,26 @@ def app():
     
     if modo != st.session_state.modo_respuesta:
         st.session_state.modo_respuesta = modo
-        st.session_state.respuestas = {}  # Reiniciar respuestas al cambiar el modo
+        st.session_state.respuestas = RespuestasSesion()  # Reiniciar respuestas al cambiar el modo
+        st.session_state.acumulador_puntuaciones = AcumuladorPuntuaciones()
+    
+    # Puntuaciones en curso para la vista previa (se actualizan solo con las respuestas que cambian);
+    # se reconstruyen si las respuestas se han reiniciado o completado fuera de esta página
+    acumulador = st.session_state.get("acumulador_puntuaciones")
+    if acumulador is None or acumulador.respondidas != len(st.session_state.respuestas):
+        st.session_state.acumulador_puntuaciones = AcumuladorPuntuaciones.desde_respuestas(st.session_state.respuestas)
+    
+    # Ejecuciones del script en esta encuesta (métrica de coste por encuesta completada)
+    st.session_state.ejecuciones_encuesta = st.session_state.get("ejecuciones_encuesta", 0) + 1
     
     # Dividir las preguntas por categorías para navegación
-    total_categorias = len(PREGUNTAS_ARQUITECTURA)
+    total_categorias = len(MODELO.categorias)
+    
+    # Modo formulario: cada categoría se envía de una vez
+    if ENCUESTA_MODO_FORMULARIO:
+        _categoria_en_formulario(total_categorias)
+        _vista_previa()
+        return
     
     # Mostrar navegación por categorías
     if st.session_state.pagina_actual > 0:
@@ -53,12 +77,12 @@ def app():
                 st.experimental_rerun()
     
     # Mostrar la categoría actual
-    categoria_actual = PREGUNTAS_ARQUITECTURA[st.session_state.pagina_actual]
+    categoria_actual = BANCO_PREGUNTAS.categorias[st.session_state.pagina_actual]
     st.subheader(f"Categoría: {categoria_actual['categoria']}")
     st.write(categoria_actual['descripcion'])
     
     # Mostrar las preguntas de la categoría actual
-    for pregunta in categoria_actual['preguntas']:
+    for pregunta in BANCO_PREGUNTAS.preguntas_categoria(categoria_actual['categoria']):
         st.write(f"**{pregunta['id']}. {pregunta['texto']}**")
         st.caption(pregunta['descripcion'])
         
@@ -94,38 +118,192 @@ def app():
             else:
                 st.info(f"Interpretación: Valor ALTO ({valor_numerico:.2f})")
         
-        # Guardar la respuesta
-        st.session_state.respuestas[f"{pregunta['id']}"] = {
-            "valor": valor_numerico,
-            "peso": pregunta['peso'],
-            "categoria": categoria_actual['categoria']
-        }
+        # Guardar la respuesta (el peso y la categoría se consultan en el modelo)
+        st.session_state.respuestas[f"{pregunta['id']}"] = valor_numerico
+        st.session_state.acumulador_puntuaciones.actualizar(pregunta['id'], valor_numerico)
         
         st.divider()
     
+    # Vista previa de las puntuaciones en la barra lateral
+    _vista_previa()
+    
     # Botón para finalizar encuesta
     if st.session_state.pagina_actual == total_categorias - 1:
         if st.button("Finalizar Encuesta y Ver Resultados"):
-            # Indicar que la encuesta está completada
-            st.session_state.encuesta_completada = True
-            
             # Mostrar mensaje de éxito
             st.success("¡Encuesta completada! Procesando resultados...")
             
-            # Calcular y guardar los resultados utilizando el helper
-            resultados = procesar_respuestas(st.session_state.respuestas)
-            st.session_state.resultados_encuesta = resultados
-            
-            # Generar interpretación preliminar
-            interpretacion = generar_interpretacion_textual(resultados)
-            st.session_state.interpretacion_preliminar = interpretacion
+            _finalizar_encuesta()
             
             # Informar al usuario que será redirigido
             st.info("A continuación, serás redirigido al chat de asesoría...")
-            
-            # Cambiar a la página de chat
-            st.session_state.page = "chat"
             st.experimental_rerun()
 
+def _categoria_en_formulario(total_categorias):
+    """
+    Muestra la categoría actual dentro de un formulario.
+    Los cambios de las respuestas no provocan ejecuciones del script: las respuestas de la
+    categoría se envían juntas al pulsar un botón de navegación, y el callback del botón las
+    guarda y cambia de categoría sin necesidad de volver a ejecutar la página.
+    """
+    pagina = st.session_state.pagina_actual
+    modo = st.session_state.modo_respuesta
+    categoria_actual = BANCO_PREGUNTAS.categorias[pagina]
+    preguntas = BANCO_PREGUNTAS.preguntas_categoria(categoria_actual['categoria'])
+    
+    # Encuesta adaptativa: terminar en cuanto la recomendación está decidida
+    hay_siguiente = pagina < total_categorias - 1
+    sin_influencia = set()
+    if ENCUESTA_ADAPTATIVA:
+        estado = estado_adaptativo(st.session_state.respuestas)
+        if estado["decidida"] and st.session_state.respuestas:
+            st.success(f"La recomendación ya está decidida: **{obtener_nombre_arquitectura(estado['recomendacion'])}**. "
+                       "Las preguntas restantes no pueden cambiarla.")
+            st.button("Finalizar ahora", on_click=_finalizar_encuesta)
+        
+        # Preguntas pendientes de mayor a menor influencia; las ya respondidas y las que
+        # no pueden cambiar el resultado, al final
+        orden = {id_pregunta: posicion for posicion, id_pregunta in enumerate(estado["pendientes"])}
+        preguntas = sorted(preguntas, key=lambda p: orden.get(p['id'], len(orden)))
+        sin_influencia = set(estado["omitibles"])
+        hay_siguiente = _siguiente_categoria(pagina, estado) is not None
+    
+    st.subheader(f"Categoría: {categoria_actual['categoria']}")
+    st.write(categoria_actual['descripcion'])
+    
+    with st.form(key=f"formulario_{modo}_{pagina}"):
+        for pregunta in preguntas:
+            st.write(f"**{pregunta['id']}. {pregunta['texto']}**")
+            st.caption(pregunta['descripcion'])
+            if pregunta['id'] in sin_influencia:
+                st.caption("ℹ️ Esta respuesta ya no puede cambiar la recomendación.")
+            
+            # Partir de la respuesta ya guardada si se vuelve a una categoría anterior
+            guardada = st.session_state.respuestas.get(f"{pregunta['id']}")
+            if modo == "binario":
+                st.radio(
+                    f"Respuesta para pregunta {pregunta['id']}:",
+                    ["No", "Sí"],
+                    index=1 if guardada and guardada["valor"] == 1.0 else 0,
+                    horizontal=True,
+                    key=f"formulario_binario_{pregunta['id']}"
+                )
+            else:
+                st.slider(
+                    f"Valor entre 0 (No) y 1 (Sí):",
+                    min_value=0.0,
+                    max_value=1.0,
+                    value=guardada["valor"] if guardada else 0.5,
+                    step=0.01,
+                    key=f"formulario_difuso_{pregunta['id']}",
+                    help=(f"Bajo: hasta {INTERPRETACION_DIFUSA['baja'][1]}, "
+                          f"medio: hasta {INTERPRETACION_DIFUSA['media'][1]}, alto: el resto")
+                )
+            st.divider()
+        
+        col1, col2 = st.columns([5, 1])
+        with col1:
+            if pagina > 0:
+                st.form_submit_button("← Categoría Anterior", on_click=_enviar_categoria, args=(pagina, -1))
+        with col2:
+            if hay_siguiente:
+                st.form_submit_button("Siguiente →", on_click=_enviar_categoria, args=(pagina, 1))
+        if not hay_siguiente:
+            st.form_submit_button("Finalizar Encuesta y Ver Resultados", on_click=_enviar_categoria, args=(pagina, 0))
+
+def _enviar_categoria(pagina, direccion):
+    """
+    Callback de los botones del formulario: guarda las respuestas de la categoría y navega.
+    
+    Args:
+        pagina (int): Categoría enviada
+        direccion (int): -1 anterior, 1 siguiente, 0 finalizar la encuesta
+    """
+    modo = st.session_state.modo_respuesta
+    categoria = BANCO_PREGUNTAS.categorias[pagina]
+    for pregunta in BANCO_PREGUNTAS.preguntas_categoria(categoria['categoria']):
+        if modo == "binario":
+            valor_numerico = 1.0 if st.session_state[f"formulario_binario_{pregunta['id']}"] == "Sí" else 0.0
+        else:
+            valor_numerico = st.session_state[f"formulario_difuso_{pregunta['id']}"]
+        st.session_state.respuestas[f"{pregunta['id']}"] = valor_numerico
+        st.session_state.acumulador_puntuaciones.actualizar(pregunta['id'], valor_numerico)
+    
+    if direccion == 1 and ENCUESTA_ADAPTATIVA:
+        # Saltar las categorías que ya no pueden cambiar el resultado
+        siguiente = _siguiente_categoria(pagina, estado_adaptativo(st.session_state.respuestas))
+        if siguiente is None:
+            _finalizar_encuesta()
+        else:
+            st.session_state.pagina_actual = siguiente
+    elif direccion:
+        st.session_state.pagina_actual = pagina + direccion
+    else:
+        _finalizar_encuesta()
+
+def _siguiente_categoria(pagina, estado):
+    """
+    Siguiente categoría que aún puede cambiar el resultado en la encuesta adaptativa.
+    
+    Args:
+        pagina (int): Categoría actual
+        estado (dict): Estado devuelto por estado_adaptativo
+    
+    Returns:
+        int: Índice de la categoría, o None si no queda ninguna
+    """
+    if estado["decidida"]:
+        return None
+    for siguiente in range(pagina + 1, len(BANCO_PREGUNTAS.categorias)):
+        if BANCO_PREGUNTAS.categorias[siguiente]['categoria'] not in estado["categorias_omitibles"]:
+            return siguiente
+    return None
+
+def _finalizar_encuesta():
+    """Calcula, guarda e interpreta los resultados y pasa al chat"""
+    # Indicar que la encuesta está completada
+    st.session_state.encuesta_completada = True
+    
+    # En la encuesta adaptativa, completar las preguntas que no han hecho falta
+    # (su valor no puede cambiar la recomendación)
+    if ENCUESTA_ADAPTATIVA and ENCUESTA_MODO_FORMULARIO:
+        st.session_state.respuestas = completar_respuestas(st.session_state.respuestas)
+    
+    # La vista previa de esta encuesta no debe pasar a la siguiente
+    st.session_state.pop("acumulador_puntuaciones", None)
+    
+    # Calcular y guardar los resultados utilizando el helper
+    resultados = procesar_respuestas(st.session_state.respuestas)
+    st.session_state.resultados_encuesta = ResultadosSesion(resultados, st.session_state.respuestas)
+    # La confianza de la recomendación se calcula en el chat la primera vez que se muestra
+    st.session_state.pop("incertidumbre_encuesta", None)
+    
+    # Guardar el resultado junto con las ejecuciones del script que ha costado
+    # (la escritura a disco se hace en segundo plano)
+    guardar_resultado(st.session_state.respuestas, resultados, sesion={
+        "ejecuciones": st.session_state.get("ejecuciones_encuesta", 0),
+        "formulario": ENCUESTA_MODO_FORMULARIO,
+        "motor": MOTOR_PUNTUACION,
+        "respondidas": sum(1 for r in st.session_state.respuestas.values() if not r.get("imputada"))
+    })
+    st.session_state.ejecuciones_encuesta = 0
+    
+    # Generar interpretación preliminar
+    interpretacion = generar_interpretacion_textual(resultados)
+    st.session_state.interpretacion_preliminar = interpretacion
+    
+    # Cambiar a la página de chat
+    st.session_state.page = "chat"
+
+def _vista_previa():
+    """Muestra en la barra lateral las puntuaciones con las respuestas dadas hasta ahora"""
+    acumulador = st.session_state.acumulador_puntuaciones
+    with st.sidebar:
+        st.markdown("---")
+        st.subheader("Vista previa")
+        st.caption(f"{acumulador.respondidas} de {len(MODELO.ids)} preguntas respondidas (motor {MOTOR_PUNTUACION})")
+        for arquitectura, puntuacion in acumulador.puntuaciones(MOTOR_PUNTUACION).items():
+            st.progress(min(max(puntuacion, 0.0), 1.0), text=f"{obtener_nombre_arquitectura(arquitectura)}: {puntuacion:.2f}")
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,92 @@
+import streamlit as st
+import pandas as pd
+from utils.estadisticas_agregadas import obtener_estadisticas
+from utils.evaluacion_helper import obtener_nombre_arquitectura
+from utils.modelo_evaluacion import MODELO
+from context.arquitectura_data import BANCO_PREGUNTAS
+from config import MOTOR_PUNTUACION
+
+def app():
+    st.title("Estadísticas de las Evaluaciones")
+    st.write("Resumen agregado de todas las encuestas completadas. Se actualiza a medida que se guardan nuevos resultados.")
+
+    # Estado agregado en memoria (no recorre el histórico de resultados)
+    estadisticas = obtener_estadisticas().instantanea()
+
+    if estadisticas["registros"] == 0:
+        st.info("Todavía no hay encuestas completadas.")
+        return
+
+    st.metric("Encuestas completadas", estadisticas["registros"])
+
+    # Las recomendaciones y puntuaciones de motores distintos no son comparables
+    motores = sorted(set(estadisticas["recomendaciones"]) | set(estadisticas["puntuaciones_globales"]))
+    motor = MOTOR_PUNTUACION if MOTOR_PUNTUACION in motores or not motores else motores[0]
+    if len(motores) > 1:
+        motor = st.radio(
+            "Motor de puntuación:",
+            motores,
+            index=motores.index(motor),
+            format_func=lambda x: {"lineal": "Lineal", "difuso": "Difuso"}.get(x, x),
+            horizontal=True
+        )
+    recomendaciones_motor = estadisticas["recomendaciones"].get(motor, {})
+
+    # Distribución de recomendaciones
+    st.subheader("Distribución de Recomendaciones")
+    recomendaciones = pd.DataFrame(
+        {"Encuestas": list(recomendaciones_motor.values())},
+        index=[obtener_nombre_arquitectura(tipo) for tipo in recomendaciones_motor]
+    )
+    st.bar_chart(recomendaciones)
+
+    # Media y dispersión de las puntuaciones globales y de los promedios por categoría
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("Puntuaciones Globales")
+        st.dataframe(_tabla_resumen(
+            {obtener_nombre_arquitectura(arq): resumen for arq, resumen in estadisticas["puntuaciones_globales"].get(motor, {}).items()}
+        ), use_container_width=True)
+
+    with col2:
+        st.subheader("Promedio por Categoría")
+        st.dataframe(_tabla_resumen(estadisticas["categorias"]), use_container_width=True)
+
+    # Coste de servidor de cada encuesta según el modo de la encuesta
+    if estadisticas["ejecuciones_encuesta"]:
+        st.subheader("Ejecuciones del Script por Encuesta")
+        nombres_modos = {"formulario": "Formulario por categoría", "widgets": "Respuesta a respuesta"}
+        st.dataframe(_tabla_resumen(
+            {nombres_modos.get(modo, modo): resumen for modo, resumen in estadisticas["ejecuciones_encuesta"].items()}
+        ), use_container_width=True)
+
+    # Histograma de respuestas de una pregunta del banco activo
+    st.subheader("Respuestas por Pregunta")
+    st.caption(f"Banco de preguntas: {BANCO_PREGUNTAS.identificador}")
+    histogramas = estadisticas["preguntas"].get(BANCO_PREGUNTAS.identificador, {})
+    textos = {str(id_pregunta): texto for id_pregunta, texto in zip(MODELO.ids, MODELO.textos)}
+    preguntas = [id_pregunta for id_pregunta in textos if id_pregunta in histogramas]
+    if not preguntas:
+        return
+
+    id_pregunta = st.selectbox(
+        "Pregunta:",
+        preguntas,
+        format_func=lambda x: f"{x}. {textos[x]}"
+    )
+
+    intervalos = estadisticas["intervalos_histograma"]
+    etiquetas = [f"{i / intervalos:.1f}–{(i + 1) / intervalos:.1f}" for i in range(intervalos)]
+    st.bar_chart(pd.DataFrame({"Respuestas": histogramas[id_pregunta]}, index=etiquetas))
+
+def _tabla_resumen(resumenes):
+    """Convierte los resúmenes de media y varianza en una tabla para mostrar"""
+    return pd.DataFrame(
+        [[r["media"], r["varianza"], r["desviacion"], r["n"]] for r in resumenes.values()],
+        index=list(resumenes.keys()),
+        columns=["Media", "Varianza", "Desviación", "N"]
+    ).round(3)
+
+if __name__ == "__main__":
+    app()
@@ -34,7 +34,8 @@ def app():
     # Botón para iniciar la encuesta
     if st.button("Comenzar Evaluación"):
         st.session_state.pagina_actual = 0  # Reiniciar a la primera página de la encuesta
-        st.session_state.respuestas = {}   # Limpiar respuestas anteriores
+        st.session_state.pop("respuestas", None)   # Limpiar respuestas anteriores (la encuesta las crea al entrar)
+        st.session_state.pop("acumulador_puntuaciones", None)  # Y la vista previa de la encuesta anterior
         st.session_state.page = "encuesta"  # Cambiar a la página de encuesta
         st.experimental_rerun()
     
@@ -0,0 +1,220 @@
+"""
+Banco de preguntas versionado.
+Cada banco (o variante de un banco) se guarda en PREGUNTAS_DIR como <banco>.v<versión>.json
+con la misma estructura de categorías que PREGUNTAS_ARQUITECTURA. Al cargarlo se validan
+los ids y se construyen una sola vez los índices id -> pregunta y categoría -> rango de
+posiciones. Cada banco se lee una sola vez por proceso: BANCO_PREGUNTAS, PREGUNTAS_ARQUITECTURA
+y el modelo compilado se fijan al importarse, así que para usar un archivo modificado hay
+que reiniciar la aplicación (o publicar el cambio como una versión nueva).
+
+Las claves cualificadas "<banco>@v<versión>:<id>" identifican una pregunta sin ambigüedad
+cuando conviven varios bancos o versiones.
+
+Además de las preguntas, el banco define cómo se combinan sus categorías en las puntuaciones
+globales: cada categoría que interviene declara su "rol" (ROLES_CATEGORIA, una categoría por
+rol) y su "peso", y "fraccion_global" reparte la categoría global entre microservicios y
+eventos. Las categorías sin rol solo se muestran como promedios.
+"""
+import glob
+import hashlib
+import json
+import os
+import re
+import threading
+from config import PREGUNTAS_DIR, PREGUNTAS_BANCO, PREGUNTAS_VERSION
+
+CAMPOS_CATEGORIA = ("categoria", "descripcion", "preguntas")
+CAMPOS_PREGUNTA = ("id", "texto", "descripcion", "peso")
+
+# Papel de cada categoría en las puntuaciones globales: autonomía de servicios (microservicios
+# y, en negativo, monolítico), categoría global (repartida entre microservicios y eventos) y eventos
+ROLES_CATEGORIA = ("autonomia", "global", "eventos")
+ARQUITECTURAS_FRACCION_GLOBAL = ("microservicios", "eventos")
+
+_PATRON_ARCHIVO = re.compile(r"^(?P<banco>[\w-]+)\.v(?P<version>\d+)\.json$")
+_PATRON_CLAVE = re.compile(r"^(?P<banco>[\w-]+)@v(?P<version>\d+):(?P<id>.+)$")
+
+_cache = {}
+_lock = threading.Lock()
+
+
+class BancoPreguntas:
+    """
+    Banco de preguntas compilado.
+
+    Args:
+        nombre (str): Nombre del banco (o variante)
+        version (int): Versión del banco
+        categorias (list): Categorías con sus preguntas (estructura de PREGUNTAS_ARQUITECTURA)
+        fraccion_global (dict): Fracción de la categoría global para microservicios y eventos
+        huella (str, optional): Identificador del contenido del archivo de origen
+
+    Atributos:
+        preguntas (list): Todas las preguntas en orden, cada una con su "categoria"
+        indice_id (dict): Id de pregunta (str) -> posición en preguntas
+        indice_categoria (dict): Nombre de categoría -> slice de sus preguntas
+        categoria_rol (dict): Rol -> nombre de la categoría que lo cumple
+
+    Raises:
+        ValueError: Si falta algún campo, hay duplicados o los roles y pesos no son válidos
+    """
+
+    def __init__(self, nombre, version, categorias, fraccion_global, huella=None):
+        self.nombre = nombre
+        self.version = version
+        self.categorias = categorias
+        self.fraccion_global = fraccion_global
+        self.huella = huella
+        self.categoria_rol = {}
+        self.preguntas = []
+        self.indice_id = {}
+        self.indice_categoria = {}
+
+        for categoria in categorias:
+            faltantes = [campo for campo in CAMPOS_CATEGORIA if campo not in categoria]
+            if faltantes:
+                raise ValueError(f"Categoría sin los campos {faltantes} en el banco {self.identificador}")
+            if categoria["categoria"] in self.indice_categoria:
+                raise ValueError(f"Categoría duplicada en el banco {self.identificador}: {categoria['categoria']}")
+            self._validar_rol(categoria)
+
+            inicio = len(self.preguntas)
+            for pregunta in categoria["preguntas"]:
+                faltantes = [campo for campo in CAMPOS_PREGUNTA if campo not in pregunta]
+                if faltantes:
+                    raise ValueError(f"Pregunta sin los campos {faltantes} en el banco {self.identificador}")
+                clave = str(pregunta["id"])
+                if clave in self.indice_id:
+                    raise ValueError(f"Id de pregunta duplicado en el banco {self.identificador}: {clave}")
+                self.indice_id[clave] = len(self.preguntas)
+                self.preguntas.append({**pregunta, "categoria": categoria["categoria"]})
+            self.indice_categoria[categoria["categoria"]] = slice(inicio, len(self.preguntas))
+
+        faltantes = [rol for rol in ROLES_CATEGORIA if rol not in self.categoria_rol]
+        if faltantes:
+            raise ValueError(f"Ninguna categoría del banco {self.identificador} tiene el rol {faltantes}")
+        if not isinstance(fraccion_global, dict) or sorted(fraccion_global) != sorted(ARQUITECTURAS_FRACCION_GLOBAL):
+            raise ValueError(
+                f"El banco {self.identificador} debe definir fraccion_global para {list(ARQUITECTURAS_FRACCION_GLOBAL)}"
+            )
+
+    def _validar_rol(self, categoria):
+        """Comprueba el rol y el peso de una categoría y la registra en categoria_rol"""
+        rol = categoria.get("rol")
+        if rol is None:
+            return
+        if rol not in ROLES_CATEGORIA:
+            raise ValueError(
+                f"Rol '{rol}' no válido en la categoría {categoria['categoria']} del banco {self.identificador} "
+                f"(roles: {list(ROLES_CATEGORIA)})"
+            )
+        if rol in self.categoria_rol:
+            raise ValueError(f"Rol '{rol}' repetido en el banco {self.identificador}")
+        peso = categoria.get("peso")
+        if not isinstance(peso, (int, float)) or peso <= 0:
+            raise ValueError(f"La categoría {categoria['categoria']} del banco {self.identificador} necesita un peso positivo")
+        self.categoria_rol[rol] = categoria["categoria"]
+
+    @property
+    def identificador(self):
+        """Nombre y versión del banco ("<banco>@v<versión>")"""
+        return f"{self.nombre}@v{self.version}"
+
+    def clave(self, id_pregunta):
+        """Clave cualificada de una pregunta: "<banco>@v<versión>:<id>" """
+        return f"{self.identificador}:{id_pregunta}"
+
+    def id_local(self, clave):
+        """
+        Id de pregunta (str) a partir de un id simple o de una clave cualificada.
+
+        Raises:
+            KeyError: Si la clave es de otro banco o versión, o la pregunta no existe
+        """
+        clave = str(clave)
+        coincidencia = _PATRON_CLAVE.match(clave)
+        if coincidencia:
+            if (coincidencia["banco"], int(coincidencia["version"])) != (self.nombre, self.version):
+                raise KeyError(f"La pregunta {clave} no pertenece al banco {self.identificador}")
+            clave = coincidencia["id"]
+        if clave not in self.indice_id:
+            raise KeyError(clave)
+        return clave
+
+    def preguntas_categoria(self, categoria):
+        """Preguntas de una categoría, en orden"""
+        return self.preguntas[self.indice_categoria[categoria]]
+
+    def __len__(self):
+        return len(self.preguntas)
+
+
+def ruta_banco(nombre, version):
+    """Ruta del archivo de una versión de un banco"""
+    return os.path.join(PREGUNTAS_DIR, f"{nombre}.v{version}.json")
+
+
+def versiones_disponibles(nombre=PREGUNTAS_BANCO, directorio=None):
+    """
+    Versiones de un banco presentes en el directorio de preguntas.
+
+    Returns:
+        list: Números de versión ordenados de menor a mayor
+    """
+    versiones = []
+    for ruta in glob.glob(os.path.join(directorio or PREGUNTAS_DIR, f"{nombre}.v*.json")):
+        coincidencia = _PATRON_ARCHIVO.match(os.path.basename(ruta))
+        if coincidencia and coincidencia["banco"] == nombre:
+            versiones.append(int(coincidencia["version"]))
+    return sorted(versiones)
+
+
+def leer_banco(ruta):
+    """
+    Lee y compila un archivo de banco de preguntas.
+
+    Args:
+        ruta (str): Archivo <banco>.v<versión>.json
+
+    Returns:
+        BancoPreguntas: Banco compilado
+    """
+    with open(ruta, "rb") as f:
+        contenido = f.read()
+    datos = json.loads(contenido.decode("utf-8"))
+
+    coincidencia = _PATRON_ARCHIVO.match(os.path.basename(ruta))
+    nombre = datos.get("banco") or (coincidencia["banco"] if coincidencia else None)
+    version = datos.get("version") or (int(coincidencia["version"]) if coincidencia else None)
+    if nombre is None or version is None:
+        raise ValueError(f"No se puede determinar el banco y la versión de {ruta}")
+
+    return BancoPreguntas(nombre, int(version), datos["categorias"], datos.get("fraccion_global"),
+                          hashlib.sha1(contenido).hexdigest()[:12])
+
+
+def cargar_banco(nombre=PREGUNTAS_BANCO, version=PREGUNTAS_VERSION):
+    """
+    Devuelve un banco de preguntas compilado; cada versión se lee una sola vez por proceso.
+
+    Args:
+        nombre (str, optional): Nombre del banco o variante
+        version (int, optional): Versión; 0 o None para la más reciente
+
+    Returns:
+        BancoPreguntas: Banco compilado
+
+    Raises:
+        FileNotFoundError: Si no existe ninguna versión del banco
+    """
+    if not version:
+        versiones = versiones_disponibles(nombre)
+        if not versiones:
+            raise FileNotFoundError(f"No hay ningún banco de preguntas '{nombre}' en {PREGUNTAS_DIR}")
+        version = versiones[-1]
+
+    ruta = ruta_banco(nombre, version)
+    with _lock:
+        if ruta not in _cache:
+            _cache[ruta] = leer_banco(ruta)
+        return _cache[ruta]
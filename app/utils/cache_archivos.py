@@ -0,0 +1,76 @@
+"""
+Caché compartida en el proceso para archivos JSON de la carpeta de datos.
+Cada archivo se lee y se parsea una sola vez; solo se vuelve a cargar cuando cambia
+su fecha de modificación o su tamaño. Las sesiones de Streamlit se ejecutan como hilos
+del mismo proceso, por lo que todas comparten esta caché.
+"""
+import json
+import os
+import threading
+
+# Ruta -> (firma del archivo, contenido parseado)
+_cache = {}
+_lock = threading.Lock()
+_estadisticas = {"aciertos": 0, "fallos": 0}
+
+
+def cargar_json(ruta):
+    """
+    Devuelve el contenido parseado de un archivo JSON, usando la caché si no ha cambiado.
+
+    El objeto devuelto es compartido entre llamadas y no debe modificarse.
+
+    Args:
+        ruta (str): Ruta del archivo
+
+    Returns:
+        Contenido del archivo parseado
+
+    Raises:
+        OSError: Si el archivo no existe o no se puede leer
+        json.JSONDecodeError: Si el contenido no es JSON válido
+    """
+    estado = os.stat(ruta)
+    firma = (estado.st_mtime_ns, estado.st_size)
+
+    with _lock:
+        entrada = _cache.get(ruta)
+        if entrada is not None and entrada[0] == firma:
+            _estadisticas["aciertos"] += 1
+            return entrada[1]
+
+    with open(ruta, 'r', encoding='utf-8') as f:
+        datos = json.load(f)
+
+    with _lock:
+        _cache[ruta] = (firma, datos)
+        _estadisticas["fallos"] += 1
+    return datos
+
+
+def estadisticas_cache():
+    """
+    Devuelve los contadores de la caché.
+
+    Returns:
+        dict: Aciertos, fallos (lecturas de disco), archivos en caché y tasa de aciertos
+    """
+    with _lock:
+        aciertos = _estadisticas["aciertos"]
+        fallos = _estadisticas["fallos"]
+        archivos = len(_cache)
+    total = aciertos + fallos
+    return {
+        "aciertos": aciertos,
+        "fallos": fallos,
+        "archivos": archivos,
+        "tasa_aciertos": aciertos / total if total else 0.0
+    }
+
+
+def limpiar_cache():
+    """Vacía la caché y reinicia los contadores"""
+    with _lock:
+        _cache.clear()
+        _estadisticas["aciertos"] = 0
+        _estadisticas["fallos"] = 0
@@ -0,0 +1,172 @@
+"""
+Caché persistente de respuestas de OpenAI en SQLite.
+Las respuestas se indexan por un hash de las partes estables de la consulta (modelo, tipo de
+recomendación y arquitecturas cercanas, prompts de sistema, secciones de contexto recuperadas,
+historial y pregunta normalizada). El resumen con las puntuaciones exactas de cada usuario no
+forma parte de la clave, de modo que usuarios con la misma recomendación que hacen la misma
+pregunta reutilizan la respuesta.
+Las entradas caducan tras un TTL y, al superar el tamaño máximo, se eliminan las menos
+usadas recientemente (LRU).
+"""
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from config import (
+    CACHE_RESPUESTAS_FILE,
+    CACHE_RESPUESTAS_TTL,
+    CACHE_RESPUESTAS_MAX_ENTRADAS,
+)
+
+# Una conexión por hilo (las sesiones de Streamlit se ejecutan en hilos distintos)
+_local = threading.local()
+_lock = threading.Lock()
+_estadisticas = {"aciertos": 0, "fallos": 0, "latencia_ahorrada": 0.0}
+
+
+def _conexion():
+    """Devuelve la conexión SQLite del hilo actual, creando el esquema si hace falta"""
+    conexion = getattr(_local, "conexion", None)
+    if conexion is None:
+        conexion = sqlite3.connect(CACHE_RESPUESTAS_FILE, timeout=5)
+        conexion.execute("PRAGMA journal_mode=WAL")
+        conexion.execute("""
+            CREATE TABLE IF NOT EXISTS respuestas (
+                clave TEXT PRIMARY KEY,
+                respuesta TEXT NOT NULL,
+                creado REAL NOT NULL,
+                ultimo_acceso REAL NOT NULL,
+                latencia REAL NOT NULL,
+                aciertos INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        conexion.execute("CREATE INDEX IF NOT EXISTS idx_ultimo_acceso ON respuestas (ultimo_acceso)")
+        conexion.commit()
+        _local.conexion = conexion
+    return conexion
+
+
+def normalizar_pregunta(texto):
+    """
+    Normaliza una pregunta para que variaciones triviales compartan entrada en la caché:
+    minúsculas, sin tildes, sin signos de puntuación en los extremos y espacios colapsados.
+    """
+    texto = unicodedata.normalize("NFKD", texto.lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    texto = re.sub(r"\s+", " ", texto)
+    return texto.strip(" ¿?¡!.,;:")
+
+
+def clave_mensajes(messages, modelo, recomendacion=None):
+    """
+    Calcula la clave de caché de una lista de mensajes.
+
+    El último mensaje del usuario se normaliza con normalizar_pregunta; el resto de
+    mensajes se usa tal cual, así que los mensajes propios de un usuario (como sus
+    puntuaciones) deben quitarse antes.
+
+    Args:
+        messages (list): Mensajes estables de la consulta
+        modelo (str): Nombre del modelo
+        recomendacion (dict, optional): Recomendación del usuario; solo cuentan "tipo" y "cercanas"
+
+    Returns:
+        str: Hash SHA-256 en hexadecimal
+    """
+    mensajes_clave = [dict(mensaje) for mensaje in messages]
+    if mensajes_clave and mensajes_clave[-1].get("role") == "user":
+        mensajes_clave[-1]["content"] = normalizar_pregunta(mensajes_clave[-1]["content"])
+    recomendacion = recomendacion or {}
+    contenido = json.dumps({
+        "modelo": modelo,
+        "tipo": recomendacion.get("tipo"),
+        "cercanas": sorted(recomendacion.get("cercanas") or []),
+        "mensajes": mensajes_clave
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(contenido.encode("utf-8")).hexdigest()
+
+
+def obtener(clave):
+    """
+    Busca una respuesta en la caché.
+
+    Args:
+        clave (str): Clave calculada con clave_mensajes
+
+    Returns:
+        str: Respuesta guardada o None si no existe o ha caducado
+    """
+    ahora = time.time()
+    try:
+        conexion = _conexion()
+        fila = conexion.execute(
+            "SELECT respuesta, latencia FROM respuestas WHERE clave = ? AND creado >= ?",
+            (clave, ahora - CACHE_RESPUESTAS_TTL)
+        ).fetchone()
+        if fila is not None:
+            conexion.execute(
+                "UPDATE respuestas SET ultimo_acceso = ?, aciertos = aciertos + 1 WHERE clave = ?",
+                (ahora, clave)
+            )
+            conexion.commit()
+    except sqlite3.Error as e:
+        print(f"Error al leer la caché de respuestas: {e}")
+        fila = None
+
+    with _lock:
+        if fila is None:
+            _estadisticas["fallos"] += 1
+            return None
+        _estadisticas["aciertos"] += 1
+        _estadisticas["latencia_ahorrada"] += fila[1]
+    return fila[0]
+
+
+def guardar(clave, respuesta, latencia):
+    """
+    Guarda una respuesta en la caché y aplica la política de expiración y tamaño.
+
+    Args:
+        clave (str): Clave calculada con clave_mensajes
+        respuesta (str): Texto de la respuesta
+        latencia (float): Segundos que tardó OpenAI en generar la respuesta
+    """
+    ahora = time.time()
+    try:
+        conexion = _conexion()
+        conexion.execute(
+            "INSERT OR REPLACE INTO respuestas (clave, respuesta, creado, ultimo_acceso, latencia, aciertos) "
+            "VALUES (?, ?, ?, ?, ?, 0)",
+            (clave, respuesta, ahora, ahora, latencia)
+        )
+        # Eliminar las entradas caducadas y, si sobran, las de acceso más antiguo
+        conexion.execute("DELETE FROM respuestas WHERE creado < ?", (ahora - CACHE_RESPUESTAS_TTL,))
+        conexion.execute(
+            "DELETE FROM respuestas WHERE clave IN ("
+            "SELECT clave FROM respuestas ORDER BY ultimo_acceso DESC LIMIT -1 OFFSET ?)",
+            (CACHE_RESPUESTAS_MAX_ENTRADAS,)
+        )
+        conexion.commit()
+    except sqlite3.Error as e:
+        print(f"Error al guardar en la caché de respuestas: {e}")
+
+
+def estadisticas_cache_respuestas():
+    """
+    Devuelve las estadísticas de uso de la caché en este proceso.
+
+    Returns:
+        dict: Aciertos, fallos, tasa de aciertos, segundos de latencia ahorrados y entradas guardadas
+    """
+    with _lock:
+        estadisticas = dict(_estadisticas)
+    total = estadisticas["aciertos"] + estadisticas["fallos"]
+    estadisticas["tasa_aciertos"] = estadisticas["aciertos"] / total if total else 0.0
+    try:
+        estadisticas["entradas"] = _conexion().execute("SELECT COUNT(*) FROM respuestas").fetchone()[0]
+    except sqlite3.Error:
+        estadisticas["entradas"] = None
+    return estadisticas
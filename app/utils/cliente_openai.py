@@ -0,0 +1,216 @@
+"""
+Cliente asíncrono compartido para la API de OpenAI.
+Todas las sesiones de Streamlit del proceso envían sus peticiones a un único bucle asyncio
+que se ejecuta en un hilo propio. El bucle mantiene una sesión aiohttp con conexiones
+persistentes, limita el número de peticiones en curso con un semáforo FIFO (las peticiones
+que esperan se atienden por orden de llegada) y reintenta los errores transitorios y de
+límite de uso con espera exponencial y jitter.
+"""
+import asyncio
+import queue
+import random
+import threading
+from collections import deque
+import aiohttp
+import openai
+from config import (
+    OPENAI_MAX_CONCURRENCIA,
+    OPENAI_MAX_CONEXIONES,
+    OPENAI_REINTENTOS,
+    OPENAI_ESPERA_BASE,
+    OPENAI_ESPERA_MAX,
+    OPENAI_TIMEOUT,
+)
+
+# Errores que se consideran transitorios y se reintentan
+ERRORES_REINTENTABLES = (
+    openai.error.RateLimitError,
+    openai.error.ServiceUnavailableError,
+    openai.error.APIConnectionError,
+    openai.error.Timeout,
+    openai.error.TryAgain,
+    openai.error.APIError,
+)
+
+_cliente = None
+_lock_cliente = threading.Lock()
+
+
+class SemaforoFIFO:
+    """Semáforo asyncio que atiende a las tareas en espera estrictamente por orden de llegada"""
+
+    def __init__(self, valor):
+        self._valor = valor
+        self._esperando = deque()
+
+    @property
+    def en_cola(self):
+        return len(self._esperando)
+
+    async def acquire(self):
+        if self._valor > 0 and not self._esperando:
+            self._valor -= 1
+            return
+        futuro = asyncio.get_running_loop().create_future()
+        self._esperando.append(futuro)
+        try:
+            await futuro
+        except asyncio.CancelledError:
+            # Si ya se había cedido el turno a esta tarea, pasarlo a la siguiente
+            if futuro.done() and not futuro.cancelled():
+                self.release()
+            else:
+                self._esperando.remove(futuro)
+            raise
+
+    def release(self):
+        while self._esperando:
+            futuro = self._esperando.popleft()
+            if not futuro.done():
+                futuro.set_result(None)
+                return
+        self._valor += 1
+
+    async def __aenter__(self):
+        await self.acquire()
+
+    async def __aexit__(self, *exc):
+        self.release()
+
+
+class ClienteOpenAI:
+    """
+    Cliente de OpenAI con bucle de eventos propio, reutilizable desde código síncrono.
+
+    Args:
+        max_concurrencia (int): Máximo de peticiones en curso a la vez
+        max_conexiones (int): Tamaño del pool de conexiones HTTP
+        reintentos (int): Número máximo de reintentos por petición
+        espera_base (float): Espera inicial (segundos) del backoff exponencial
+        espera_max (float): Espera máxima (segundos) entre reintentos
+        timeout (float): Timeout (segundos) de cada petición a la API
+    """
+
+    def __init__(self, max_concurrencia=OPENAI_MAX_CONCURRENCIA, max_conexiones=OPENAI_MAX_CONEXIONES,
+                 reintentos=OPENAI_REINTENTOS, espera_base=OPENAI_ESPERA_BASE,
+                 espera_max=OPENAI_ESPERA_MAX, timeout=OPENAI_TIMEOUT):
+        self.max_concurrencia = max_concurrencia
+        self.max_conexiones = max_conexiones
+        self.reintentos = reintentos
+        self.espera_base = espera_base
+        self.espera_max = espera_max
+        self.timeout = timeout
+        self._metricas = {"peticiones": 0, "en_curso": 0, "reintentos": 0, "errores": 0}
+
+        self._loop = asyncio.new_event_loop()
+        self._hilo = threading.Thread(target=self._loop.run_forever, name="cliente-openai", daemon=True)
+        self._hilo.start()
+        asyncio.run_coroutine_threadsafe(self._iniciar(), self._loop).result()
+
+    async def _iniciar(self):
+        conector = aiohttp.TCPConnector(limit=self.max_conexiones, keepalive_timeout=60)
+        self._sesion = aiohttp.ClientSession(connector=conector)
+        self._semaforo = SemaforoFIFO(self.max_concurrencia)
+
+    def chat_completion(self, **parametros):
+        """
+        Equivalente síncrono de openai.ChatCompletion.create (sin streaming).
+
+        Returns:
+            La respuesta de la API
+        """
+        futuro = asyncio.run_coroutine_threadsafe(self._completar(parametros), self._loop)
+        return futuro.result()
+
+    def chat_completion_stream(self, **parametros):
+        """
+        Equivalente síncrono de openai.ChatCompletion.create con stream=True.
+
+        Yields:
+            str: Fragmentos de contenido a medida que llegan
+        """
+        cola = queue.Queue()
+        futuro = asyncio.run_coroutine_threadsafe(self._completar_stream(parametros, cola), self._loop)
+        try:
+            while True:
+                tipo, valor = cola.get()
+                if tipo == "fin":
+                    return
+                if tipo == "error":
+                    raise valor
+                yield valor
+        finally:
+            # Si el consumidor abandona el stream se cancela la petición en curso
+            futuro.cancel()
+
+    async def _completar(self, parametros):
+        async with self._semaforo:
+            return await self._con_reintentos(parametros)
+
+    async def _completar_stream(self, parametros, cola):
+        try:
+            async with self._semaforo:
+                respuesta = await self._con_reintentos(dict(parametros, stream=True))
+                async for chunk in respuesta:
+                    contenido = chunk.choices[0].delta.get("content")
+                    if contenido:
+                        cola.put(("dato", contenido))
+            cola.put(("fin", None))
+        except Exception as e:
+            cola.put(("error", e))
+
+    async def _con_reintentos(self, parametros):
+        """Llama a la API reintentando los errores transitorios con backoff exponencial y jitter"""
+        # La sesión compartida se fija en el contexto de cada tarea
+        openai.aiosession.set(self._sesion)
+        self._metricas["peticiones"] += 1
+        self._metricas["en_curso"] += 1
+        try:
+            for intento in range(self.reintentos + 1):
+                try:
+                    return await openai.ChatCompletion.acreate(request_timeout=self.timeout, **parametros)
+                except ERRORES_REINTENTABLES as e:
+                    if intento == self.reintentos:
+                        self._metricas["errores"] += 1
+                        raise
+                    self._metricas["reintentos"] += 1
+                    await asyncio.sleep(self._espera(intento, e))
+        finally:
+            self._metricas["en_curso"] -= 1
+
+    def _espera(self, intento, error):
+        """Segundos de espera antes del reintento: Retry-After si la API lo indica, si no full jitter"""
+        cabeceras = getattr(error, "headers", None) or {}
+        retry_after = cabeceras.get("retry-after") if hasattr(cabeceras, "get") else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.espera_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.espera_max, self.espera_base * 2 ** intento))
+
+    def metricas(self):
+        """
+        Devuelve el estado del cliente.
+
+        Returns:
+            dict: Peticiones totales, en curso, en cola, reintentos y errores definitivos
+        """
+        metricas = dict(self._metricas)
+        metricas["en_cola"] = self._semaforo.en_cola
+        return metricas
+
+
+def obtener_cliente():
+    """
+    Devuelve el cliente compartido del proceso, creándolo la primera vez.
+
+    Returns:
+        ClienteOpenAI: Cliente compartido
+    """
+    global _cliente
+    if _cliente is None:
+        with _lock_cliente:
+            if _cliente is None:
+                _cliente = ClienteOpenAI()
+    return _cliente
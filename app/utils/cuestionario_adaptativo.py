@@ -0,0 +1,123 @@
+"""
+Cuestionario adaptativo con terminación anticipada.
+Con el cuestionario completo, cada puntuación global es lineal en las respuestas
+(MODELO.proyeccion_global), así que para unas respuestas parciales se pueden calcular cotas
+exactas de cada puntuación y de cada diferencia entre dos arquitecturas considerando todos
+los valores posibles (entre 0 y 1) de las preguntas pendientes. Cuando esas cotas garantizan
+la misma arquitectura ganadora y el mismo conjunto de arquitecturas cercanas para cualquier
+respuesta futura, la recomendación está decidida y la encuesta puede terminar; las
+preguntas que ya no pueden influir se omiten y el resto se ordena por su influencia.
+"""
+import numpy as np
+from config import UMBRAL_CERCANIA
+from context.arquitectura_data import BANCO_PREGUNTAS
+from utils.modelo_evaluacion import MODELO, ARQUITECTURAS
+
+# Valor con el que se completan las preguntas no respondidas al terminar antes
+VALOR_IMPUTADO = 0.5
+
+# Margen de las comparaciones con las cotas: el modelo suma en otro orden y un empate o un
+# cruce exacto del umbral puede caer a cualquier lado por redondeo
+EPSILON_DECISION = 1e-9
+
+
+def estado_adaptativo(respuestas):
+    """
+    Calcula si la recomendación ya está decidida y qué preguntas pueden cambiarla.
+
+    Args:
+        respuestas (dict): Respuestas dadas hasta ahora (ver ModeloEvaluacion.vector_respuestas)
+
+    Returns:
+        dict: "decidida" (bool), "ganadora" y "cercanas" (candidatas con las respuestas
+            pendientes en su valor medio; definitivas si decidida), "recomendacion" (tipo
+            final si decidida, si no None), "cotas" (mínimo y máximo alcanzable de cada
+            puntuación global), "pendientes" (ids de las preguntas sin responder que aún
+            pueden cambiar el resultado, de mayor a menor influencia), "omitibles" (ids sin
+            responder que ya no pueden cambiarlo) y "categorias_omitibles"
+    """
+    vector = MODELO.vector_respuestas(respuestas)
+    pendientes = np.isnan(vector)
+    coeficientes = MODELO.proyeccion_global
+    base = np.where(pendientes, 0.0, vector) @ coeficientes + MODELO.desplazamiento
+
+    # Cotas de cada puntuación global: cada pregunta pendiente puede valer entre 0 y 1
+    pendientes_coef = coeficientes[pendientes]
+    cotas_min = base + np.minimum(pendientes_coef, 0.0).sum(axis=0)
+    cotas_max = base + np.maximum(pendientes_coef, 0.0).sum(axis=0)
+
+    # Candidata: el resultado con las preguntas pendientes en su valor medio
+    central = base + VALOR_IMPUTADO * pendientes_coef.sum(axis=0)
+    ganadora = int(np.argmax(central))
+    cercanas_candidatas = [a for a in range(len(ARQUITECTURAS)) if a != ganadora and central[ganadora] - central[a] < UMBRAL_CERCANIA]
+
+    # Cotas de las diferencias ganadora - a, y condiciones que aún no están garantizadas
+    influencia = np.zeros(len(vector))
+    decidida = True
+    for a in range(len(ARQUITECTURAS)):
+        if a == ganadora:
+            continue
+        coef_diferencia = coeficientes[:, ganadora] - coeficientes[:, a]
+        diferencia = base[ganadora] - base[a]
+        minimo = diferencia + np.minimum(coef_diferencia[pendientes], 0.0).sum()
+        maximo = diferencia + np.maximum(coef_diferencia[pendientes], 0.0).sum()
+
+        # La ganadora debe seguir por delante y la cercanía debe ser la misma en todo el rango;
+        # si ninguna pregunta pendiente influye en la diferencia, ya no puede cambiar (incluido
+        # un empate exacto, que hace cercanas a las dos arquitecturas)
+        fija = not np.any(coef_diferencia[pendientes])
+        gana_siempre = minimo > EPSILON_DECISION
+        cercania_fija = maximo < UMBRAL_CERCANIA - EPSILON_DECISION or minimo >= UMBRAL_CERCANIA + EPSILON_DECISION
+        if not (fija or (gana_siempre and cercania_fija)):
+            decidida = False
+            influencia = np.maximum(influencia, np.abs(coef_diferencia))
+
+    influencia = np.where(pendientes, influencia, 0.0)
+    orden = np.argsort(-influencia, kind="stable")
+    ids_pendientes = [MODELO.ids[j] for j in orden if pendientes[j] and influencia[j] > 0]
+    ids_omitibles = [MODELO.ids[j] for j in range(len(vector)) if pendientes[j] and influencia[j] == 0]
+
+    # Categorías cuyas preguntas pendientes ya no influyen (las columnas del modelo siguen
+    # el orden del banco, así que cada rango del banco es también un rango de columnas)
+    omitible = pendientes & (influencia == 0)
+    categorias_omitibles = [
+        categoria for categoria, rango in BANCO_PREGUNTAS.indice_categoria.items()
+        if omitible[rango].any() and not (pendientes[rango] & ~omitible[rango]).any()
+    ]
+
+    cercanas = [ARQUITECTURAS[a] for a in cercanas_candidatas]
+    return {
+        "decidida": decidida,
+        "ganadora": ARQUITECTURAS[ganadora],
+        "cercanas": cercanas,
+        "recomendacion": ("hibrido" if cercanas else ARQUITECTURAS[ganadora]) if decidida else None,
+        "cotas": {arq: (float(cotas_min[k]), float(cotas_max[k])) for k, arq in enumerate(ARQUITECTURAS)},
+        "pendientes": ids_pendientes,
+        "omitibles": ids_omitibles,
+        "categorias_omitibles": categorias_omitibles
+    }
+
+
+def completar_respuestas(respuestas):
+    """
+    Completa las preguntas sin responder con VALOR_IMPUTADO para terminar la encuesta.
+
+    Si la recomendación está decidida, cualquier valor de las preguntas pendientes da la
+    misma recomendación, así que el valor imputado no la altera.
+
+    Args:
+        respuestas (dict | RespuestasSesion): Respuestas de la encuesta
+
+    Returns:
+        dict | RespuestasSesion: Copia de las respuestas con las pendientes marcadas como "imputada"
+    """
+    completas = respuestas.copy()
+    for pregunta in BANCO_PREGUNTAS.preguntas:
+        if f"{pregunta['id']}" not in completas:
+            completas[f"{pregunta['id']}"] = {
+                "valor": VALOR_IMPUTADO,
+                "peso": pregunta["peso"],
+                "categoria": pregunta["categoria"],
+                "imputada": True
+            }
+    return completas
@@ -0,0 +1,286 @@
+"""
+Estadísticas agregadas de las encuestas guardadas.
+Se actualizan de forma incremental cada vez que el escritor de resultados guarda un lote
+(ver utils.persistencia_resultados): distribución de recomendaciones, media y varianza
+(algoritmo de Welford) del promedio de cada categoría, de cada puntuación global (ambas
+separadas por motor de puntuación, porque no son comparables entre motores) y de las
+ejecuciones del script por encuesta, e histogramas de intervalos fijos de las respuestas
+a cada pregunta, agrupados por banco de preguntas y versión. El estado se guarda en
+ESTADISTICAS_FILE tras cada lote junto con el id del último registro incorporado; al
+cargarlo se reproducen solo los registros posteriores (los que llegaron a disco sin que se
+guardara la instantánea, p. ej. si el proceso terminó entre ambas escrituras), así que
+consultarlo nunca recorre el histórico completo.
+"""
+import json
+import math
+import os
+import threading
+from config import ESTADISTICAS_FILE
+
+# Intervalos de igual anchura en [0, 1] de los histogramas de respuestas
+INTERVALOS_HISTOGRAMA = 10
+
+# Versión del formato de la instantánea (cambiarla obliga a recalcularla)
+VERSION_ESTADISTICAS = 4
+
+# Banco de los registros guardados antes de versionar las preguntas (mismas preguntas que la v1)
+BANCO_REGISTROS_ANTERIORES = "arquitectura@v1"
+
+# Motor de los registros guardados antes de que existiera el motor difuso
+MOTOR_REGISTROS_ANTERIORES = "lineal"
+
+_estadisticas = None
+_lock_global = threading.Lock()
+
+
+def acumulador_vacio():
+    """Estado inicial de un acumulador de Welford"""
+    return {"n": 0, "media": 0.0, "m2": 0.0}
+
+
+def actualizar_acumulador(acumulador, valor):
+    """
+    Añade un valor a un acumulador de media y varianza (algoritmo de Welford).
+
+    Args:
+        acumulador (dict): Acumulador con n, media y m2 (se modifica)
+        valor (float): Nuevo valor; los NaN se ignoran
+    """
+    if valor is None or math.isnan(valor):
+        return
+    acumulador["n"] += 1
+    delta = valor - acumulador["media"]
+    acumulador["media"] += delta / acumulador["n"]
+    acumulador["m2"] += delta * (valor - acumulador["media"])
+
+
+def resumen_acumulador(acumulador):
+    """
+    Media, varianza muestral y desviación típica de un acumulador.
+
+    Returns:
+        dict: n, media, varianza y desviacion
+    """
+    n = acumulador["n"]
+    varianza = acumulador["m2"] / (n - 1) if n > 1 else 0.0
+    return {"n": n, "media": acumulador["media"] if n else 0.0, "varianza": varianza, "desviacion": math.sqrt(varianza)}
+
+
+def intervalo_histograma(valor):
+    """Índice del intervalo del histograma al que pertenece un valor en [0, 1]"""
+    return min(max(int(valor * INTERVALOS_HISTOGRAMA), 0), INTERVALOS_HISTOGRAMA - 1)
+
+
+class EstadisticasAgregadas:
+    """
+    Estadísticas de las encuestas actualizadas registro a registro.
+
+    Args:
+        ruta (str): Archivo donde se guarda la instantánea del estado
+    """
+
+    def __init__(self, ruta=ESTADISTICAS_FILE):
+        self.ruta = ruta
+        self._lock = threading.Lock()
+        self._estado = self._estado_vacio()
+
+    @staticmethod
+    def _estado_vacio():
+        return {
+            "version": VERSION_ESTADISTICAS,
+            "registros": 0,
+            "ultimo_id": None,
+            "recomendaciones": {},
+            "categorias": {},
+            "puntuaciones_globales": {},
+            "preguntas": {},
+            "ejecuciones_encuesta": {}
+        }
+
+    def actualizar(self, registro):
+        """
+        Incorpora un registro guardado (ver persistencia_resultados.crear_registro).
+
+        Args:
+            registro (dict): Registro con 'respuestas' y 'resultados'
+        """
+        resultados = registro.get("resultados", {})
+        with self._lock:
+            estado = self._estado
+            estado["registros"] += 1
+            if registro.get("id"):
+                estado["ultimo_id"] = registro["id"]
+
+            # Recomendaciones y puntuaciones globales, separadas por motor de puntuación
+            sesion = registro.get("sesion") or {}
+            motor = sesion.get("motor", MOTOR_REGISTROS_ANTERIORES)
+            tipo = resultados.get("recomendacion", {}).get("tipo")
+            if tipo:
+                recomendaciones = estado["recomendaciones"].setdefault(motor, {})
+                recomendaciones[tipo] = recomendaciones.get(tipo, 0) + 1
+
+            puntuaciones_globales = estado["puntuaciones_globales"].setdefault(motor, {})
+            for arquitectura, puntuacion in resultados.get("puntuaciones_globales", {}).items():
+                acumulador = puntuaciones_globales.setdefault(arquitectura, acumulador_vacio())
+                actualizar_acumulador(acumulador, puntuacion)
+
+            for categoria, datos in resultados.items():
+                if categoria in ("puntuaciones_globales", "recomendacion") or not isinstance(datos, dict):
+                    continue
+                acumulador = estado["categorias"].setdefault(categoria, acumulador_vacio())
+                actualizar_acumulador(acumulador, datos.get("promedio"))
+
+            # Ejecuciones del script por encuesta, separadas por modo de la encuesta
+            if "ejecuciones" in sesion:
+                modo = "formulario" if sesion.get("formulario") else "widgets"
+                acumulador = estado.setdefault("ejecuciones_encuesta", {}).setdefault(modo, acumulador_vacio())
+                actualizar_acumulador(acumulador, sesion["ejecuciones"])
+
+            # Los ids de pregunta solo son únicos dentro de un banco y versión
+            preguntas = estado["preguntas"].setdefault(registro.get("banco", BANCO_REGISTROS_ANTERIORES), {})
+            for id_pregunta, valor in registro.get("respuestas", {}).items():
+                histograma = preguntas.setdefault(str(id_pregunta), [0] * INTERVALOS_HISTOGRAMA)
+                histograma[intervalo_histograma(valor)] += 1
+
+    def actualizar_lote(self, registros):
+        """Incorpora un lote de registros y guarda la instantánea"""
+        for registro in registros:
+            self.actualizar(registro)
+        self.guardar()
+
+    def instantanea(self):
+        """
+        Estado actual listo para mostrar (no recorre el histórico).
+
+        Returns:
+            dict: Número de registros, distribución de recomendaciones y resumen por
+                arquitectura (ambos por motor), resumen por categoría e histogramas por banco ("<banco>@v<versión>") y pregunta
+        """
+        # Los resúmenes son valores nuevos; solo hay que copiar los contadores y los histogramas
+        with self._lock:
+            estado = self._estado
+            return {
+                "registros": estado["registros"],
+                "recomendaciones": {motor: dict(conteos) for motor, conteos in estado["recomendaciones"].items()},
+                "categorias": {nombre: resumen_acumulador(a) for nombre, a in estado["categorias"].items()},
+                "puntuaciones_globales": {
+                    motor: {nombre: resumen_acumulador(a) for nombre, a in acumuladores.items()}
+                    for motor, acumuladores in estado["puntuaciones_globales"].items()
+                },
+                "preguntas": {
+                    banco: {id_pregunta: list(histograma) for id_pregunta, histograma in histogramas.items()}
+                    for banco, histogramas in estado["preguntas"].items()
+                },
+                "ejecuciones_encuesta": {
+                    modo: resumen_acumulador(a) for modo, a in estado.get("ejecuciones_encuesta", {}).items()
+                },
+                "intervalos_histograma": INTERVALOS_HISTOGRAMA
+            }
+
+    def guardar(self):
+        """Guarda el estado en disco (escritura atómica)"""
+        with self._lock:
+            datos = json.dumps(self._estado, ensure_ascii=False)
+        directorio = os.path.dirname(self.ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        with open(f"{self.ruta}.tmp", "w", encoding="utf-8") as f:
+            f.write(datos)
+        os.replace(f"{self.ruta}.tmp", self.ruta)
+
+    def cargar(self):
+        """
+        Carga la instantánea guardada.
+
+        Returns:
+            bool: True si había una instantánea válida
+        """
+        try:
+            with open(self.ruta, "r", encoding="utf-8") as f:
+                estado = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if estado.get("version") != VERSION_ESTADISTICAS:
+            return False
+        with self._lock:
+            self._estado = estado
+        return True
+
+    def reproducir_pendientes(self, registros):
+        """
+        Incorpora los registros guardados después del último de la instantánea cargada.
+
+        Args:
+            registros (iterable): Registros en orden cronológico (ver persistencia_resultados.leer_registros)
+
+        Returns:
+            bool: False si el último registro de la instantánea no está entre los guardados
+                (el estado no se modifica y hay que reconstruirlo)
+        """
+        with self._lock:
+            ultimo_id = self._estado.get("ultimo_id")
+            vacia = self._estado["registros"] == 0
+        # Una instantánea sin registros se pone al día con todos los guardados
+        encontrado = ultimo_id is None and vacia
+        pendientes = []
+        for registro in registros:
+            if encontrado:
+                pendientes.append(registro)
+            elif registro.get("id") == ultimo_id:
+                encontrado = True
+        if not encontrado:
+            return False
+        if pendientes:
+            self.actualizar_lote(pendientes)
+        return True
+
+    def reconstruir(self, registros):
+        """
+        Recalcula el estado desde cero a partir de los registros guardados.
+
+        Args:
+            registros (iterable): Registros (ver persistencia_resultados.leer_registros)
+        """
+        with self._lock:
+            self._estado = self._estado_vacio()
+        for registro in registros:
+            self.actualizar(registro)
+        self.guardar()
+
+
+def cargar_estadisticas(ruta=ESTADISTICAS_FILE, ruta_resultados=None):
+    """
+    Carga la instantánea de disco y la pone al día con los registros guardados después.
+    Si no hay instantánea válida o no encaja con los registros guardados, se recalcula
+    recorriendo todos los resultados.
+
+    Args:
+        ruta (str): Archivo de la instantánea
+        ruta_resultados (str, optional): Archivo de resultados (por defecto RESULTADOS_FILE)
+
+    Returns:
+        EstadisticasAgregadas: Estadísticas al día
+    """
+    from utils.persistencia_resultados import leer_registros
+    leer = (lambda: leer_registros(ruta_resultados)) if ruta_resultados else leer_registros
+
+    estadisticas = EstadisticasAgregadas(ruta)
+    if not (estadisticas.cargar() and estadisticas.reproducir_pendientes(leer())):
+        estadisticas.reconstruir(leer())
+    return estadisticas
+
+
+def obtener_estadisticas():
+    """
+    Devuelve las estadísticas compartidas del proceso, cargadas la primera vez con
+    cargar_estadisticas.
+
+    Returns:
+        EstadisticasAgregadas: Estadísticas compartidas
+    """
+    global _estadisticas
+    if _estadisticas is None:
+        with _lock_global:
+            if _estadisticas is None:
+                _estadisticas = cargar_estadisticas()
+    return _estadisticas
@@ -0,0 +1,200 @@
+"""
+Estado compacto de la encuesta en la sesión.
+Las respuestas se guardan en un vector de longitud fija indexado por la posición de la
+pregunta en el modelo (NaN = sin responder) y los resultados solo conservan los vectores
+de sumas, conteos, promedios y puntuaciones. El peso y la categoría de cada pregunta no se
+copian en la sesión: se consultan en el modelo al acceder a ellos.
+
+Las clases exponen la misma interfaz de diccionario que el formato anterior
+(respuestas[id]["valor"], resultados[categoria]["promedio"], etc.), así que las páginas y
+utilidades existentes funcionan sin cambios.
+"""
+from collections.abc import Mapping, MutableMapping
+import numpy as np
+from utils.modelo_evaluacion import MODELO, ARQUITECTURAS
+
+
+class RespuestaSesion(Mapping):
+    """
+    Vista de solo lectura de una respuesta: {"valor", "peso", "categoria"} y "imputada"
+    si el valor se completó al terminar antes la encuesta adaptativa.
+    """
+
+    __slots__ = ("_respuestas", "_columna")
+
+    def __init__(self, respuestas, columna):
+        self._respuestas = respuestas
+        self._columna = columna
+
+    def _claves(self):
+        if self._respuestas.imputadas[self._columna]:
+            return ("valor", "peso", "categoria", "imputada")
+        return ("valor", "peso", "categoria")
+
+    def __getitem__(self, clave):
+        modelo = self._respuestas.modelo
+        if clave == "valor":
+            return float(self._respuestas.valores[self._columna])
+        if clave == "peso":
+            return float(modelo.pesos[self._columna])
+        if clave == "categoria":
+            return modelo.categorias[modelo.indice_categoria[self._columna]]
+        if clave == "imputada" and self._respuestas.imputadas[self._columna]:
+            return True
+        raise KeyError(clave)
+
+    def __iter__(self):
+        return iter(self._claves())
+
+    def __len__(self):
+        return len(self._claves())
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class RespuestasSesion(MutableMapping):
+    """
+    Respuestas de una encuesta en curso: id de pregunta (str) -> RespuestaSesion.
+
+    Al asignar se acepta un valor numérico o un diccionario con "valor" (y opcionalmente
+    "imputada"); el resto de claves se ignora porque se obtiene del modelo.
+
+    Args:
+        respuestas (dict, optional): Respuestas iniciales en cualquiera de los dos formatos
+        modelo (ModeloEvaluacion, optional): Modelo con el orden, los pesos y las categorías
+    """
+
+    __slots__ = ("modelo", "valores", "imputadas")
+
+    def __init__(self, respuestas=None, modelo=MODELO):
+        self.modelo = modelo
+        self.valores = np.full(len(modelo.ids), np.nan)
+        self.imputadas = np.zeros(len(modelo.ids), dtype=bool)
+        if respuestas:
+            self.update(respuestas)
+
+    def _columna(self, id_pregunta):
+        return self.modelo.columna(id_pregunta)
+
+    def __getitem__(self, id_pregunta):
+        columna = self._columna(id_pregunta)
+        if np.isnan(self.valores[columna]):
+            raise KeyError(id_pregunta)
+        return RespuestaSesion(self, columna)
+
+    def __setitem__(self, id_pregunta, respuesta):
+        columna = self._columna(id_pregunta)
+        if isinstance(respuesta, Mapping):
+            self.valores[columna] = respuesta["valor"]
+            self.imputadas[columna] = bool(respuesta.get("imputada", False))
+        else:
+            self.valores[columna] = respuesta
+            self.imputadas[columna] = False
+
+    def __delitem__(self, id_pregunta):
+        columna = self._columna(id_pregunta)
+        if np.isnan(self.valores[columna]):
+            raise KeyError(id_pregunta)
+        self.valores[columna] = np.nan
+        self.imputadas[columna] = False
+
+    def __iter__(self):
+        for columna in np.flatnonzero(~np.isnan(self.valores)):
+            yield str(self.modelo.ids[columna])
+
+    def __len__(self):
+        return int(np.count_nonzero(~np.isnan(self.valores)))
+
+    def __repr__(self):
+        return f"RespuestasSesion({ {id_pregunta: float(self.valores[self._columna(id_pregunta)]) for id_pregunta in self} })"
+
+    def vector(self):
+        """Copia del vector de respuestas en el orden del modelo (NaN = sin responder)"""
+        return self.valores.copy()
+
+    def __reduce__(self):
+        # Al serializar no se copia el modelo compartido
+        modelo = None if self.modelo is MODELO else self.modelo
+        return (_restaurar, (RespuestasSesion, modelo, {"valores": self.valores, "imputadas": self.imputadas}))
+
+    def copy(self):
+        """Copia independiente de las respuestas"""
+        copia = RespuestasSesion(modelo=self.modelo)
+        copia.valores[:] = self.valores
+        copia.imputadas[:] = self.imputadas
+        return copia
+
+
+class ResultadosSesion(Mapping):
+    """
+    Resultados compactos de una encuesta con la interfaz del diccionario de
+    procesar_respuestas: una entrada por categoría, "puntuaciones_globales" y "recomendacion".
+    El detalle de respuestas de cada categoría se reconstruye a partir del vector y, como en
+    procesar_respuestas, no incluye los valores imputados.
+
+    Args:
+        resultados (dict): Resultados devueltos por procesar_respuestas
+        respuestas: Respuestas de la encuesta (dict o RespuestasSesion)
+        modelo (ModeloEvaluacion, optional): Modelo con el que se evaluaron
+    """
+
+    __slots__ = ("modelo", "vector", "sumas", "conteos", "promedios", "puntuaciones", "recomendacion")
+
+    def __init__(self, resultados, respuestas, modelo=MODELO):
+        self.modelo = modelo
+        self.vector = modelo.vector_respuestas(respuestas)
+        self.vector[modelo.mascara_imputadas(respuestas)] = np.nan
+        self.sumas = np.array([resultados[c]["puntuacion_ponderada"] for c in modelo.categorias])
+        self.conteos = np.array([resultados[c]["total_preguntas"] for c in modelo.categorias], dtype=np.int16)
+        self.promedios = np.array([resultados[c]["promedio"] for c in modelo.categorias])
+        self.puntuaciones = np.array([resultados["puntuaciones_globales"][arq] for arq in ARQUITECTURAS])
+        self.recomendacion = resultados["recomendacion"]
+
+    def _categoria(self, indice):
+        modelo = self.modelo
+        columnas = [j for j in np.flatnonzero(modelo.indice_categoria == indice) if not np.isnan(self.vector[j])]
+        return {
+            "puntuacion_ponderada": float(self.sumas[indice]),
+            "total_preguntas": int(self.conteos[indice]),
+            "respuestas": [
+                {"id": str(modelo.ids[j]), "valor": float(self.vector[j]), "peso": float(modelo.pesos[j])}
+                for j in columnas
+            ],
+            "promedio": float(self.promedios[indice])
+        }
+
+    def __getitem__(self, clave):
+        if clave == "puntuaciones_globales":
+            return {arq: float(puntuacion) for arq, puntuacion in zip(ARQUITECTURAS, self.puntuaciones)}
+        if clave == "recomendacion":
+            return self.recomendacion
+        if clave in self.modelo.categorias:
+            return self._categoria(self.modelo.categorias.index(clave))
+        raise KeyError(clave)
+
+    def __iter__(self):
+        yield from self.modelo.categorias
+        yield "puntuaciones_globales"
+        yield "recomendacion"
+
+    def __len__(self):
+        return len(self.modelo.categorias) + 2
+
+    def __reduce__(self):
+        modelo = None if self.modelo is MODELO else self.modelo
+        return (_restaurar, (ResultadosSesion, modelo, {
+            atributo: getattr(self, atributo) for atributo in self.__slots__ if atributo != "modelo"
+        }))
+
+    def __repr__(self):
+        return f"ResultadosSesion({dict(self)!r})"
+
+
+def _restaurar(clase, modelo, atributos):
+    """Reconstruye un objeto serializado con __reduce__ (el modelo por defecto no se serializa)"""
+    objeto = clase.__new__(clase)
+    objeto.modelo = MODELO if modelo is None else modelo
+    for atributo, valor in atributos.items():
+        setattr(objeto, atributo, valor)
+    return objeto
@@ -4,52 +4,74 @@ Este módulo se encarga de calcular los puntajes y determinar la arquitectura m
 """
 import numpy as np
 from context.arquitectura_data import PREGUNTAS_ARQUITECTURA, INTERPRETACION_DIFUSA
-from config import UMBRAL_BAJO, UMBRAL_MEDIO, UMBRAL_ALTO, PESOS_CATEGORIAS, FRASES_INTERPRETACION
+from config import UMBRAL_BAJO, UMBRAL_MEDIO, UMBRAL_ALTO, UMBRAL_CERCANIA, FRASES_INTERPRETACION, MOTOR_PUNTUACION
+from utils.modelo_evaluacion import MODELO, ARQUITECTURAS
+from utils.inferencia_difusa import puntuar_difuso
+from utils import tabla_binaria
 
-def procesar_respuestas(respuestas):
+# Motores de puntuación disponibles
+MOTORES = ("lineal", "difuso")
+
+def procesar_respuestas(respuestas, motor=MOTOR_PUNTUACION):
     """
     Procesa las respuestas de la encuesta y calcula los resultados por categoría.
     
     Args:
         respuestas (dict): Diccionario con las respuestas de la encuesta
+        motor (str, optional): Motor de las puntuaciones globales ("lineal" o "difuso")
             
     Returns:
         dict: Resultados procesados con puntuaciones por categoría
     """
-    resultados = {}
+    _validar_motor(motor)
+    
+    vector = MODELO.vector_respuestas(respuestas)
+    
+    # En modo binario, puntuaciones globales y recomendación se leen de la tabla precalculada;
+    # del modelo solo hacen falta entonces los promedios por categoría
+    registro_binario = tabla_binaria.consultar(vector) if motor == "lineal" else None
+    evaluacion = MODELO.agregar_categorias(vector[None, :])
     
     # Agrupar por categorías
-    for categoria in PREGUNTAS_ARQUITECTURA:
-        nombre_categoria = categoria['categoria']
+    resultados = {}
+    for indice, nombre_categoria in enumerate(MODELO.categorias):
         resultados[nombre_categoria] = {
-            "puntuacion_ponderada": 0,
-            "total_preguntas": 0,
-            "respuestas": []
+            "puntuacion_ponderada": float(evaluacion["sumas"][0, indice]),
+            "total_preguntas": int(evaluacion["conteos"][0, indice]),
+            "respuestas": [],
+            "promedio": float(evaluacion["promedios"][0, indice])
         }
     
-    # Procesar las respuestas
+    # Detalle de las respuestas de cada categoría (los valores imputados al terminar antes
+    # la encuesta cuentan en los promedios, pero no son respuestas del usuario)
     for id_pregunta, respuesta in respuestas.items():
-        categoria = respuesta['categoria']
-        valor = respuesta['valor']
-        peso = respuesta['peso']
-        
-        resultados[categoria]["puntuacion_ponderada"] += valor * peso
-        resultados[categoria]["total_preguntas"] += 1
+        if respuesta.get("imputada"):
+            continue
+        columna = MODELO.columna(id_pregunta)
+        categoria = MODELO.categorias[MODELO.indice_categoria[columna]]
         resultados[categoria]["respuestas"].append({
             "id": id_pregunta,
-            "valor": valor,
-            "peso": peso
+            "valor": respuesta['valor'],
+            "peso": float(MODELO.pesos[columna])
         })
     
-    # Calcular el promedio ponderado para cada categoría
-    for categoria in resultados:
-        if resultados[categoria]["total_preguntas"] > 0:
-            resultados[categoria]["promedio"] = resultados[categoria]["puntuacion_ponderada"] / resultados[categoria]["total_preguntas"]
-        else:
-            resultados[categoria]["promedio"] = 0
+    # Motor difuso: puntuaciones por inferencia sobre los promedios por categoría
+    if motor == "difuso":
+        return _asignar_puntuaciones_globales(resultados, puntuar_difuso(evaluacion["promedios"])[0])
     
-    # Calcular puntuaciones globales
-    calcular_puntuaciones_globales(resultados)
+    if registro_binario is not None:
+        puntuaciones, indice_maximo, cercanas = registro_binario
+        resultados["puntuaciones_globales"] = {
+            arquitectura: float(puntuacion) for arquitectura, puntuacion in zip(ARQUITECTURAS, puntuaciones)
+        }
+        resultados["recomendacion"] = construir_recomendacion(
+            ARQUITECTURAS[indice_maximo],
+            [arq for arq, cercana in zip(ARQUITECTURAS, cercanas) if cercana],
+            float(puntuaciones[indice_maximo])
+        )
+    else:
+        # Guardar puntuaciones globales y recomendación
+        _asignar_puntuaciones_globales(resultados, MODELO.proyectar(evaluacion["promedios"])[0])
     
     return resultados
 
@@ -63,47 +85,15 @@ def calcular_puntuaciones_globales(resultados):
     Returns:
         dict: El mismo diccionario resultados con las puntuaciones globales añadidas
     """
-    # Extraer los promedios por categoría
-    promedios = {cat: resultados[cat]["promedio"] for cat in resultados}
-    
-    # Extraer las categorías para facilitar el acceso
-    cat_microservicios = "División y Autonomía de Servicios"
-    cat_global = "Disponibilidad, Integración y Escalabilidad Global"
-    cat_eventos = "Arquitectura Orientada a Eventos"
+    # Extraer los promedios por categoría en el orden del modelo
+    promedios = np.array([[resultados[cat]["promedio"] for cat in MODELO.categorias]])
     
-    # Calcular puntuación para microservicios (ponderada por las categorías relevantes)
-    # Usamos principalmente la categoría de autonomía de servicios y la global
-    peso_ms_autonomia = PESOS_CATEGORIAS[cat_microservicios]
-    peso_ms_global = PESOS_CATEGORIAS[cat_global] * 0.7  # Damos menos peso a la parte global
-    
-    puntuacion_microservicios = (
-        promedios[cat_microservicios] * peso_ms_autonomia + 
-        promedios[cat_global] * peso_ms_global
-    ) / (peso_ms_autonomia + peso_ms_global)
-    
-    # Calcular puntuación para arquitectura orientada a eventos
-    # Usamos principalmente la categoría de eventos y parte de la global
-    peso_ev_eventos = PESOS_CATEGORIAS[cat_eventos]
-    peso_ev_global = PESOS_CATEGORIAS[cat_global] * 0.3  # Damos menos peso a la parte global
-    
-    puntuacion_eventos = (
-        promedios[cat_eventos] * peso_ev_eventos + 
-        promedios[cat_global] * peso_ev_global
-    ) / (peso_ev_eventos + peso_ev_global)
-    
-    # Calcular puntuación para monolítico (inverso de microservicios)
-    # Cuando la puntuación de microservicios es baja, monolítico es alto
-    puntuacion_monolitico = 1 - puntuacion_microservicios
-    
-    # Calcular puntuación híbrida (promedio entre microservicios y eventos)
-    puntuacion_hibrida = (puntuacion_microservicios + puntuacion_eventos) / 2
-    
-    # Guardar resultados globales
+    return _asignar_puntuaciones_globales(resultados, MODELO.proyectar(promedios)[0])
+
+def _asignar_puntuaciones_globales(resultados, puntuaciones):
+    """Guarda en resultados las puntuaciones globales (vector en el orden de ARQUITECTURAS) y la recomendación"""
     resultados["puntuaciones_globales"] = {
-        "microservicios": puntuacion_microservicios,
-        "eventos": puntuacion_eventos,
-        "monolitico": puntuacion_monolitico,
-        "hibrido": puntuacion_hibrida
+        arquitectura: float(puntuacion) for arquitectura, puntuacion in zip(ARQUITECTURAS, puntuaciones)
     }
     
     # Determinar la recomendación final
@@ -130,9 +120,23 @@ def determinar_recomendacion(puntuaciones):
     cercanas = []
     
     for arq in arquitecturas:
-        if arq != max_arquitectura and (max_puntuacion - puntuaciones[arq]) < 0.15:
+        if arq != max_arquitectura and (max_puntuacion - puntuaciones[arq]) < UMBRAL_CERCANIA:
             cercanas.append(arq)
     
+    return construir_recomendacion(max_arquitectura, cercanas, max_puntuacion)
+
+def construir_recomendacion(max_arquitectura, cercanas, max_puntuacion):
+    """
+    Construye el diccionario de recomendación a partir de la arquitectura ganadora.
+    
+    Args:
+        max_arquitectura (str): Código de la arquitectura con mayor puntuación
+        cercanas (list): Códigos de las arquitecturas con puntuación cercana
+        max_puntuacion (float): Puntuación de la arquitectura ganadora
+    
+    Returns:
+        dict: Información sobre la recomendación
+    """
     # Generar la recomendación
     if max_arquitectura == "microservicios":
         tipo_recomendacion = "microservicios"
@@ -206,4 +210,109 @@ def generar_interpretacion_textual(resultados):
     if recomendacion["puntuacion"] < 0.75:
         mensaje += " Sin embargo, la puntuación no es muy alta, lo que sugiere que podrías considerar también enfoques alternativos."
     
-    return mensaje 
\ No newline at end of file
+    return mensaje
+
+def procesar_respuestas_lote(respuestas, motor=MOTOR_PUNTUACION):
+    """
+    Procesa en bloque un conjunto de encuestas en una sola pasada vectorizada.
+    
+    Utiliza el mismo modelo compilado que procesar_respuestas, por lo que los
+    resultados de cada fila coinciden exactamente con el cálculo individual.
+    
+    Args:
+        respuestas (np.ndarray | pandas.DataFrame): Matriz N×18 con los valores de las
+            respuestas. Las columnas de un array siguen el orden de PREGUNTAS_ARQUITECTURA;
+            las de un DataFrame son los ids de las preguntas. NaN indica pregunta sin responder.
+        motor (str, optional): Motor de las puntuaciones globales ("lineal" o "difuso")
+    
+    Returns:
+        dict: Arrays con los resultados del lote:
+            - "categorias": nombres de las categorías (orden de las columnas de "promedios")
+            - "promedios": matriz N×3 con el promedio ponderado por categoría
+            - "arquitecturas": códigos de arquitectura (orden de las columnas de puntuaciones)
+            - "puntuaciones_globales": matriz N×4 con las puntuaciones globales
+            - "indice_maximo": índice de la arquitectura con mayor puntuación
+            - "cercanas": matriz N×4 booleana con las arquitecturas cercanas a la máxima
+            - "indice_recomendacion": índice del tipo recomendado (híbrido si hay cercanas)
+    """
+    _validar_motor(motor)
+    evaluacion = MODELO.evaluar(_matriz_respuestas(respuestas))
+    puntuaciones = evaluacion["puntuaciones"] if motor == "lineal" else puntuar_difuso(evaluacion["promedios"])
+    indice_maximo, cercanas, indice_recomendacion = determinar_recomendacion_lote(puntuaciones)
+    
+    return {
+        "categorias": list(MODELO.categorias),
+        "promedios": evaluacion["promedios"],
+        "arquitecturas": list(ARQUITECTURAS),
+        "puntuaciones_globales": puntuaciones,
+        "indice_maximo": indice_maximo,
+        "cercanas": cercanas,
+        "indice_recomendacion": indice_recomendacion
+    }
+
+def calcular_puntuaciones_globales_lote(promedios):
+    """
+    Versión vectorizada de calcular_puntuaciones_globales.
+    
+    Args:
+        promedios (np.ndarray): Matriz N×3 con los promedios por categoría,
+            en el orden de PREGUNTAS_ARQUITECTURA
+    
+    Returns:
+        np.ndarray: Matriz N×4 con las puntuaciones en el orden de ARQUITECTURAS
+    """
+    return MODELO.proyectar(np.atleast_2d(np.asarray(promedios, dtype=float)))
+
+def determinar_recomendacion_lote(puntuaciones):
+    """
+    Versión vectorizada de determinar_recomendacion.
+    
+    Args:
+        puntuaciones (np.ndarray): Matriz N×4 con las puntuaciones en el orden de ARQUITECTURAS
+    
+    Returns:
+        tuple: (indice_maximo, cercanas, indice_recomendacion) donde indice_maximo es el
+            índice de la arquitectura con mayor puntuación (el primero en caso de empate),
+            cercanas es una matriz N×4 booleana e indice_recomendacion el índice del tipo final
+    """
+    return MODELO.recomendar(puntuaciones)
+
+def recomendacion_desde_lote(resultados_lote, fila):
+    """
+    Reconstruye para una fila del lote el diccionario que devuelve determinar_recomendacion.
+    
+    Args:
+        resultados_lote (dict): Resultado de procesar_respuestas_lote
+        fila (int): Índice de la fila
+    
+    Returns:
+        dict: Información sobre la recomendación
+    """
+    indice_maximo = int(resultados_lote["indice_maximo"][fila])
+    cercanas = [
+        arq for arq, cercana in zip(ARQUITECTURAS, resultados_lote["cercanas"][fila]) if cercana
+    ]
+    max_puntuacion = float(resultados_lote["puntuaciones_globales"][fila, indice_maximo])
+    return construir_recomendacion(ARQUITECTURAS[indice_maximo], cercanas, max_puntuacion)
+
+def _validar_motor(motor):
+    """Comprueba que el motor de puntuación existe"""
+    if motor not in MOTORES:
+        raise ValueError(f"Motor de puntuación desconocido: {motor} (disponibles: {', '.join(MOTORES)})")
+
+def _matriz_respuestas(respuestas):
+    """Convierte un array o DataFrame de respuestas en una matriz float N×18 ordenada por pregunta"""
+    ids = MODELO.ids
+    
+    # DataFrame de pandas: reordenar las columnas por id de pregunta (int o str)
+    if hasattr(respuestas, "columns"):
+        columnas = {str(columna): columna for columna in respuestas.columns}
+        faltantes = [id_pregunta for id_pregunta in ids if str(id_pregunta) not in columnas]
+        if faltantes:
+            raise ValueError(f"Faltan columnas para las preguntas: {faltantes}")
+        respuestas = respuestas[[columnas[str(id_pregunta)] for id_pregunta in ids]].to_numpy(dtype=float)
+    
+    matriz = np.atleast_2d(np.asarray(respuestas, dtype=float))
+    if matriz.ndim != 2 or matriz.shape[1] != len(ids):
+        raise ValueError(f"Se esperaba una matriz N×{len(ids)} de respuestas, se recibió {matriz.shape}")
+    return matriz
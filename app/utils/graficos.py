@@ -0,0 +1,239 @@
+"""
+Generación del gráfico de radar de valoración arquitectónica.
+El gráfico se genera directamente como SVG; matplotlib solo se importa si se pide el
+formato PNG. Las imágenes se guardan en una caché LRU compartida por todas las sesiones,
+indexada por las puntuaciones globales cuantizadas, de modo que las recargas de la
+página del chat sirven los bytes ya renderizados en lugar de volver a dibujar el gráfico.
+"""
+import html
+import io
+import math
+import threading
+from collections import OrderedDict
+from config import RADAR_CACHE_MAX_ENTRADAS, RADAR_FORMATO
+
+# Nombres de las arquitecturas en los ejes del gráfico
+NOMBRES_RADAR = {
+    "microservicios": "Microservicios",
+    "eventos": "Eventos",
+    "monolitico": "Monolítica",
+    "hibrido": "SOA"  # Cambiamos híbrido por SOA para adaptar a la imagen
+}
+
+# Valores de referencia dibujados junto a las puntuaciones reales
+VALOR_IDEAL = 1.0
+VALOR_MINIMO = 0.33
+
+# Decimales con los que se cuantiza la posición de cada vértice del polígono
+DECIMALES_CUANTIZACION = 3
+
+_cache = OrderedDict()
+_lock_cache = threading.Lock()
+_lock_render = threading.Lock()
+_estadisticas = {"aciertos": 0, "fallos": 0}
+
+
+def clave_radar(puntuaciones):
+    """
+    Clave de caché de unas puntuaciones globales.
+
+    Cada arquitectura aporta su valor cuantizado (posición del vértice) y el porcentaje
+    entero que se muestra en la anotación, para que la imagen cacheada sea idéntica a la
+    que se dibujaría con los valores originales.
+    """
+    return tuple(
+        (arquitectura, round(valor, DECIMALES_CUANTIZACION), int(valor * 100))
+        for arquitectura, valor in puntuaciones.items()
+    )
+
+
+def generar_radar(puntuaciones, formato=RADAR_FORMATO):
+    """
+    Devuelve el gráfico de radar de las puntuaciones.
+
+    Args:
+        puntuaciones (dict): Puntuaciones globales por arquitectura
+        formato (str): "svg" (renderizado nativo) o "png" (matplotlib)
+
+    Returns:
+        bytes: Imagen en el formato pedido (el SVG codificado en UTF-8)
+    """
+    clave = (formato,) + clave_radar(puntuaciones)
+    with _lock_cache:
+        imagen = _cache.get(clave)
+        if imagen is not None:
+            _cache.move_to_end(clave)
+            _estadisticas["aciertos"] += 1
+            return imagen
+        _estadisticas["fallos"] += 1
+
+    if formato == "svg":
+        imagen = _renderizar_radar_svg(clave[1:]).encode("utf-8")
+    else:
+        imagen = _renderizar_radar_png(clave[1:])
+
+    with _lock_cache:
+        _cache[clave] = imagen
+        _cache.move_to_end(clave)
+        while len(_cache) > RADAR_CACHE_MAX_ENTRADAS:
+            _cache.popitem(last=False)
+    return imagen
+
+
+def generar_radar_png(puntuaciones):
+    """Devuelve el gráfico de radar de las puntuaciones en formato PNG (requiere matplotlib)"""
+    return generar_radar(puntuaciones, "png")
+
+
+def generar_radar_svg(puntuaciones):
+    """Devuelve el gráfico de radar de las puntuaciones como texto SVG"""
+    return generar_radar(puntuaciones, "svg").decode("utf-8")
+
+
+def _renderizar_radar_svg(clave):
+    """Dibuja el gráfico de radar a partir de una clave de caché y lo devuelve como SVG"""
+    ancho, alto = 600, 520
+    cx, cy, radio = 300, 280, 180
+    N = len(clave)
+    angulos = [n / float(N) * 2 * math.pi for n in range(N)]
+
+    def punto(angulo, valor):
+        # Eje polar con el ángulo 0 a la derecha y sentido antihorario (como matplotlib)
+        return cx + radio * valor * math.cos(angulo), cy - radio * valor * math.sin(angulo)
+
+    def poligono(valores, **atributos):
+        puntos = " ".join("{:.1f},{:.1f}".format(*punto(a, v)) for a, v in zip(angulos, valores))
+        extra = " ".join(f'{nombre.replace("_", "-")}="{valor}"' for nombre, valor in atributos.items())
+        return f'<polygon points="{puntos}" {extra}/>'
+
+    elementos = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {ancho} {alto}" '
+        f'font-family="DejaVu Sans, Arial, sans-serif" style="width:100%;height:auto">',
+        f'<rect width="{ancho}" height="{alto}" fill="white"/>',
+        f'<text x="{cx}" y="30" font-size="20" text-anchor="middle">VALORACIÓN ESTILO ARQUITECTÓNICO</text>',
+    ]
+
+    # Rejilla circular, radios de cada eje y etiquetas de porcentaje
+    for nivel in (0.2, 0.4, 0.6, 0.8):
+        elementos.append(f'<circle cx="{cx}" cy="{cy}" r="{radio * nivel:.1f}" fill="none" stroke="#b0b0b0" stroke-width="0.8"/>')
+    elementos.append(f'<circle cx="{cx}" cy="{cy}" r="{radio}" fill="none" stroke="black" stroke-width="1"/>')
+    for angulo in angulos:
+        x, y = punto(angulo, 1.0)
+        elementos.append(f'<line x1="{cx}" y1="{cy}" x2="{x:.1f}" y2="{y:.1f}" stroke="#b0b0b0" stroke-width="0.8"/>')
+    for nivel in (0.2, 0.4, 0.6, 0.8, 1.0):
+        x, y = punto(0, nivel)
+        elementos.append(f'<text x="{x:.1f}" y="{y - 4:.1f}" font-size="12" fill="grey" text-anchor="middle">{int(nivel * 100)}%</text>')
+
+    # Etiquetas de los ejes
+    for angulo, (arquitectura, _, _) in zip(angulos, clave):
+        x, y = punto(angulo, 1.14)
+        anclaje = "start" if math.cos(angulo) > 0.1 else "end" if math.cos(angulo) < -0.1 else "middle"
+        nombre = html.escape(NOMBRES_RADAR.get(arquitectura, arquitectura))
+        elementos.append(f'<text x="{x:.1f}" y="{y + 6:.1f}" font-size="16" text-anchor="{anclaje}">{nombre}</text>')
+
+    # Polígonos de referencia y de las puntuaciones reales
+    valores = [valor for _, valor, _ in clave]
+    elementos.append(poligono([VALOR_IDEAL] * N, fill="none", stroke="blue", stroke_width=1,
+                              stroke_dasharray="6,4", stroke_opacity=0.9))
+    elementos.append(poligono(valores, fill="green", fill_opacity=0.2, stroke="green", stroke_width=2.5,
+                              stroke_opacity=0.9))
+    elementos.append(poligono([VALOR_MINIMO] * N, fill="none", stroke="red", stroke_width=1,
+                              stroke_dasharray="2,3", stroke_opacity=0.9))
+
+    # Valores numéricos junto a cada vértice del polígono real
+    for angulo, (_, valor, porcentaje) in zip(angulos, clave):
+        x, y = punto(angulo, valor + 0.05)
+        elementos.append(
+            f'<rect x="{x - 21:.1f}" y="{y - 20:.1f}" width="42" height="20" rx="5" '
+            f'fill="white" fill-opacity="0.7" stroke="black" stroke-opacity="0.7"/>'
+        )
+        elementos.append(f'<text x="{x:.1f}" y="{y - 5:.1f}" font-size="12" text-anchor="middle">{porcentaje}%</text>')
+
+    # Leyenda
+    leyenda = [("Ideal", "blue", "6,4", 1), ("Real", "green", "none", 2.5), ("Mínimo", "red", "2,3", 1)]
+    elementos.append(f'<rect x="10" y="{alto - 78}" width="100" height="68" fill="white" stroke="#cccccc" rx="3"/>')
+    for i, (etiqueta, color, trazo, grosor) in enumerate(leyenda):
+        y = alto - 60 + i * 20
+        elementos.append(f'<line x1="18" y1="{y}" x2="46" y2="{y}" stroke="{color}" stroke-width="{grosor}" stroke-dasharray="{trazo}"/>')
+        elementos.append(f'<text x="54" y="{y + 4}" font-size="12">{etiqueta}</text>')
+
+    elementos.append('</svg>')
+    return "\n".join(elementos)
+
+
+def _renderizar_radar_png(clave):
+    """Dibuja el gráfico de radar con matplotlib a partir de una clave de caché y lo devuelve como PNG"""
+    # Importación diferida: matplotlib solo se carga si se usa este formato
+    import numpy as np
+    from matplotlib.figure import Figure
+
+    arquitecturas = [NOMBRES_RADAR.get(arq, arq) for arq, _, _ in clave]
+    valores = [valor for _, valor, _ in clave]
+    porcentajes = [porcentaje for _, _, porcentaje in clave]
+
+    valores_ideales = [VALOR_IDEAL] * len(arquitecturas)
+    valores_minimos = [VALOR_MINIMO] * len(arquitecturas)
+
+    # Calcular ángulos para cada eje y cerrar el polígono repitiendo el primero
+    N = len(arquitecturas)
+    angulos = [n / float(N) * 2 * np.pi for n in range(N)]
+    angulos += angulos[:1]
+    valores += valores[:1]
+    valores_ideales += valores_ideales[:1]
+    valores_minimos += valores_minimos[:1]
+
+    # Se usa la API orientada a objetos (sin pyplot) para no compartir estado global entre sesiones
+    with _lock_render:
+        fig = Figure(figsize=(6, 5))
+        try:
+            ax = fig.add_subplot(111, polar=True)
+
+            # Añadir los ejes
+            ax.set_xticks(angulos[:-1])
+            ax.set_xticklabels(arquitecturas, size=10)
+
+            # Dibujar límites del gráfico
+            ax.set_rlabel_position(0)
+            ax.set_yticks([0.2, 0.4, 0.6, 0.8, 1.0])
+            ax.set_yticklabels(["20%", "40%", "60%", "80%", "100%"], color="grey", size=8)
+            ax.set_ylim(0, 1)
+
+            # Dibujar cada línea y rellenar área
+            ax.plot(angulos, valores_ideales, linewidth=1, linestyle='dashed', color='blue', label='Ideal', alpha=0.9)
+            ax.plot(angulos, valores, linewidth=2, linestyle='solid', color='green', label='Real', alpha=0.9)
+            ax.plot(angulos, valores_minimos, linewidth=1, linestyle='dotted', color='red', label='Mínimo', alpha=0.9)
+            ax.fill(angulos, valores, color='green', alpha=0.2)
+
+            # Añadir valores numéricos a los puntos del polígono real
+            for i, porcentaje in enumerate(porcentajes):
+                ax.annotate(f"{porcentaje}%",
+                            xy=(angulos[i], valores[i]),
+                            xytext=(angulos[i], valores[i] + 0.05),
+                            ha='center',
+                            va='bottom',
+                            bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.7),
+                            fontsize=8)
+
+            # Añadir título y leyenda
+            ax.set_title('VALORACIÓN ESTILO ARQUITECTÓNICO', size=12, y=1.1)
+            ax.legend(loc='upper right', bbox_to_anchor=(0.1, 0.1), fontsize=8)
+
+            # Mismos parámetros de exportación que st.pyplot
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format="png", dpi=200, bbox_inches="tight")
+            return buffer.getvalue()
+        finally:
+            # Liberar la figura de inmediato en lugar de esperar al recolector
+            fig.clear()
+            del fig
+
+
+def estadisticas_cache_radar():
+    """
+    Devuelve los contadores de la caché de gráficos.
+
+    Returns:
+        dict: Aciertos, fallos (renderizados) y entradas en caché
+    """
+    with _lock_cache:
+        return {**_estadisticas, "entradas": len(_cache)}
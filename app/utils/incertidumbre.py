@@ -0,0 +1,93 @@
+"""
+Estimación de la incertidumbre de la recomendación en modo difuso.
+Los valores de los deslizadores son aproximados: cualquier valor dentro de la misma banda
+de INTERPRETACION_DIFUSA (baja, media, alta) expresa la misma opinión. Se generan miles de
+variantes de las respuestas, muestreando cada valor de forma uniforme dentro de su banda,
+y se evalúan en un único lote con el modelo compilado para estimar la probabilidad de que
+gane cada arquitectura y de cada tipo de recomendación final.
+"""
+import numpy as np
+from context.arquitectura_data import INTERPRETACION_DIFUSA
+from config import MONTECARLO_MUESTRAS, MONTECARLO_SEMILLA, MOTOR_PUNTUACION
+from utils.modelo_evaluacion import MODELO, ARQUITECTURAS
+from utils.inferencia_difusa import puntuar_difuso
+
+# Bandas ordenadas por su límite superior
+_BANDAS = sorted(INTERPRETACION_DIFUSA.values(), key=lambda banda: banda[1])
+_LIMITES_INFERIORES = np.array([banda[0] for banda in _BANDAS], dtype=float)
+_LIMITES_SUPERIORES = np.array([banda[1] for banda in _BANDAS], dtype=float)
+
+
+def bandas_respuestas(vector):
+    """
+    Límites de la banda difusa en la que cae cada respuesta.
+
+    Se usa el mismo criterio que la interpretación de la encuesta: un valor pertenece a la
+    primera banda cuyo límite superior no supera.
+
+    Args:
+        vector (np.ndarray): Vector de respuestas (NaN = sin responder)
+
+    Returns:
+        tuple: (inferiores, superiores), arrays con los límites de cada respuesta (NaN
+            para las preguntas sin responder)
+    """
+    indices = np.minimum(np.searchsorted(_LIMITES_SUPERIORES, np.nan_to_num(vector), side="left"), len(_BANDAS) - 1)
+    sin_responder = np.isnan(vector)
+    inferiores = np.where(sin_responder, np.nan, _LIMITES_INFERIORES[indices])
+    superiores = np.where(sin_responder, np.nan, _LIMITES_SUPERIORES[indices])
+    return inferiores, superiores
+
+
+def simular_respuestas(respuestas, muestras=MONTECARLO_MUESTRAS, semilla=MONTECARLO_SEMILLA):
+    """
+    Genera variantes de las respuestas perturbando cada valor dentro de su banda.
+    Los valores imputados no expresan ninguna opinión y se mantienen fijos.
+
+    Args:
+        respuestas (dict): Respuestas de la encuesta (ver ModeloEvaluacion.vector_respuestas)
+        muestras (int): Número de variantes
+        semilla (int, optional): Semilla del generador (mismas respuestas -> mismo resultado)
+
+    Returns:
+        np.ndarray: Matriz muestras×18 (NaN en las preguntas sin responder)
+    """
+    vector = MODELO.vector_respuestas(respuestas)
+    inferiores, superiores = bandas_respuestas(vector)
+    imputadas = MODELO.mascara_imputadas(respuestas)
+    inferiores[imputadas] = superiores[imputadas] = vector[imputadas]
+    aleatorios = np.random.default_rng(semilla).random((muestras, len(vector)))
+    return inferiores + aleatorios * (superiores - inferiores)
+
+
+def probabilidades_recomendacion(respuestas, muestras=MONTECARLO_MUESTRAS, semilla=MONTECARLO_SEMILLA):
+    """
+    Probabilidad de que gane cada arquitectura bajo la incertidumbre de las respuestas difusas.
+
+    Args:
+        respuestas (dict): Respuestas de la encuesta
+        muestras (int): Número de simulaciones
+        semilla (int, optional): Semilla del generador
+
+    Returns:
+        dict: "ganadora" (probabilidad de que cada arquitectura tenga la mayor puntuación),
+            "recomendacion" (probabilidad de cada tipo final, incluido el híbrido por
+            cercanía), "intervalos" (percentiles 5 y 95 de cada puntuación global) y "muestras"
+    """
+    matriz = simular_respuestas(respuestas, muestras, semilla)
+    evaluacion = MODELO.evaluar(matriz)
+    puntuaciones = evaluacion["puntuaciones"] if MOTOR_PUNTUACION == "lineal" else puntuar_difuso(evaluacion["promedios"])
+    indice_maximo, _, indice_recomendacion = MODELO.recomendar(puntuaciones)
+
+    frecuencia_maximo = np.bincount(indice_maximo, minlength=len(ARQUITECTURAS)) / muestras
+    frecuencia_recomendacion = np.bincount(indice_recomendacion, minlength=len(ARQUITECTURAS)) / muestras
+    percentiles = np.percentile(puntuaciones, [5, 95], axis=0)
+
+    return {
+        "ganadora": {arq: float(p) for arq, p in zip(ARQUITECTURAS, frecuencia_maximo)},
+        "recomendacion": {arq: float(p) for arq, p in zip(ARQUITECTURAS, frecuencia_recomendacion)},
+        "intervalos": {
+            arq: (float(percentiles[0, i]), float(percentiles[1, i])) for i, arq in enumerate(ARQUITECTURAS)
+        },
+        "muestras": muestras
+    }
@@ -0,0 +1,362 @@
+"""
+Índice vectorial local de la documentación de referencia.
+Los archivos de conocimiento de data/ (ver CONOCIMIENTO_PATRONES) se dividen en secciones
+y cada sección se representa con un embedding calculado sin red: un vectorizador de
+hashing (unigramas y bigramas con tf sublineal e idf) reducido con SVD. Los embeddings se
+guardan como una matriz float32 memoria mapeada junto a un archivo de metadatos, y la
+búsqueda de las k secciones más similares (coseno) es un producto matriz-vector.
+
+Si cambia un solo archivo, la reconstrucción incremental vuelve a calcular únicamente sus
+secciones con la proyección existente; la SVD solo se recalcula con --completo o cuando
+la proporción de secciones nuevas supera PROPORCION_RECALCULO.
+
+Uso (desde la carpeta app/):
+    python -m utils.indice_vectorial              # incremental
+    python -m utils.indice_vectorial --completo   # recalcula la proyección
+"""
+import argparse
+import glob
+import hashlib
+import json
+import math
+import os
+import threading
+import zlib
+import numpy as np
+from config import (
+    DATA_DIR,
+    ARCHIVOS_CONTEXTO,
+    CONOCIMIENTO_PATRONES,
+    INDICE_VECTORIAL_DIR,
+    INDICE_VECTORIAL_DIMENSION,
+    INDICE_VECTORIAL_SIMILITUD_MIN,
+)
+from utils.recuperacion import dividir_en_secciones, tokenizar
+
+# Versión del formato del índice (cambiarla invalida los índices existentes)
+VERSION_INDICE = 1
+
+# Número de columnas del vectorizador de hashing (potencia de dos)
+DIMENSION_HASH = 1 << 14
+
+# Proporción de secciones recalculadas a partir de la cual se rehace la SVD
+PROPORCION_RECALCULO = 0.5
+
+ARCHIVO_EMBEDDINGS = "embeddings.npy"
+ARCHIVO_PROYECCION = "proyeccion.npy"
+ARCHIVO_METADATOS = "metadatos.json"
+
+_cargado = None
+_firma_cargado = None
+_lock_carga = threading.Lock()
+
+
+def listar_archivos(directorio=DATA_DIR):
+    """
+    Archivos de conocimiento a indexar, en orden estable.
+
+    Returns:
+        list: Rutas relativas a directorio
+    """
+    rutas = set()
+    for patron in CONOCIMIENTO_PATRONES:
+        rutas.update(glob.glob(os.path.join(directorio, patron)))
+    return sorted(os.path.relpath(ruta, directorio) for ruta in rutas)
+
+
+def arquitectura_de_archivo(ruta_relativa):
+    """Arquitectura a la que pertenece un archivo (None si es documentación general)"""
+    nombre = os.path.basename(ruta_relativa)
+    for arquitectura, archivo in ARCHIVOS_CONTEXTO.items():
+        if nombre == archivo:
+            return arquitectura
+    base = os.path.splitext(nombre)[0]
+    for arquitectura in ARCHIVOS_CONTEXTO:
+        if base == arquitectura or base.startswith(f"{arquitectura}_"):
+            return arquitectura
+    return None
+
+
+def fragmentar_archivo(ruta, ruta_relativa):
+    """
+    Divide un archivo de conocimiento en secciones.
+
+    Los .json deben tener un campo 'contexto' con texto markdown; el resto de archivos se
+    leen como markdown.
+
+    Returns:
+        list: Secciones (ver utils.recuperacion.dividir_en_secciones) con el campo 'archivo'
+    """
+    with open(ruta, "r", encoding="utf-8") as f:
+        contenido = f.read()
+    if ruta.endswith(".json"):
+        contenido = json.loads(contenido).get("contexto", "")
+    titulo = os.path.splitext(os.path.basename(ruta_relativa))[0].replace("_", " ").capitalize()
+    secciones = dividir_en_secciones(contenido, arquitectura_de_archivo(ruta_relativa), titulo)
+    for seccion in secciones:
+        seccion["archivo"] = ruta_relativa
+    return secciones
+
+
+def vector_hash(texto):
+    """
+    Vector de hashing de un texto: unigramas y bigramas, tf sublineal y signo por hash.
+
+    Args:
+        texto (str): Texto a vectorizar
+
+    Returns:
+        np.ndarray: Vector float32 de longitud DIMENSION_HASH
+    """
+    terminos = tokenizar(texto)
+    rasgos = terminos + [f"{a} {b}" for a, b in zip(terminos, terminos[1:])]
+    vector = np.zeros(DIMENSION_HASH, dtype=np.float32)
+    conteos = {}
+    for rasgo in rasgos:
+        conteos[rasgo] = conteos.get(rasgo, 0) + 1
+    for rasgo, tf in conteos.items():
+        h = zlib.crc32(rasgo.encode("utf-8"))
+        signo = 1.0 if h & 0x80000000 else -1.0
+        vector[h & (DIMENSION_HASH - 1)] += signo * (1.0 + math.log(tf))
+    return vector
+
+
+def _texto_seccion(seccion):
+    return f"{seccion['titulo']}\n{seccion['texto']}"
+
+
+def _normalizar_filas(matriz):
+    normas = np.linalg.norm(matriz, axis=1, keepdims=True)
+    normas[normas == 0] = 1.0
+    return matriz / normas
+
+
+def calcular_proyeccion(secciones, dimension=INDICE_VECTORIAL_DIMENSION):
+    """
+    Calcula la proyección hashing -> embedding (idf y SVD truncada).
+
+    Args:
+        secciones (list): Secciones con las que se ajusta la proyección
+        dimension (int): Dimensión máxima de los embeddings
+
+    Returns:
+        np.ndarray: Matriz float32 (DIMENSION_HASH x k) con el idf ya incorporado
+    """
+    hashes = np.stack([vector_hash(_texto_seccion(seccion)) for seccion in secciones])
+    n = len(secciones)
+    frecuencia_documental = np.count_nonzero(hashes, axis=0)
+    idf = (np.log((1 + n) / (1 + frecuencia_documental)) + 1).astype(np.float32)
+    _, valores_singulares, vt = np.linalg.svd(hashes * idf, full_matrices=False)
+    k = max(1, min(dimension, int(np.count_nonzero(valores_singulares > 1e-6))))
+    return (idf[:, None] * vt[:k].T).astype(np.float32)
+
+
+def embeber(textos, proyeccion):
+    """
+    Calcula los embeddings normalizados de una lista de textos.
+
+    Returns:
+        np.ndarray: Matriz float32 (len(textos) x k) con filas de norma 1
+    """
+    if not textos:
+        return np.zeros((0, proyeccion.shape[1]), dtype=np.float32)
+    hashes = np.stack([vector_hash(texto) for texto in textos])
+    return _normalizar_filas(hashes @ proyeccion).astype(np.float32)
+
+
+def _huella_archivo(ruta):
+    with open(ruta, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _leer_metadatos(directorio):
+    ruta = os.path.join(directorio, ARCHIVO_METADATOS)
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta, "r", encoding="utf-8") as f:
+        metadatos = json.load(f)
+    if metadatos.get("version") != VERSION_INDICE or metadatos.get("dimension_hash") != DIMENSION_HASH:
+        return None
+    return metadatos
+
+
+def construir_indice(completo=False, directorio=INDICE_VECTORIAL_DIR, dimension=INDICE_VECTORIAL_DIMENSION):
+    """
+    Construye o actualiza el índice vectorial en disco.
+
+    Args:
+        completo (bool): Recalcular la proyección y todos los embeddings
+        directorio (str): Carpeta del índice
+        dimension (int): Dimensión máxima de los embeddings (solo en reconstrucciones completas)
+
+    Returns:
+        dict: Resumen con el modo ("completo", "incremental" o "sin cambios"), el número
+            de secciones y los archivos recalculados
+    """
+    os.makedirs(directorio, exist_ok=True)
+    anterior = None if completo else _leer_metadatos(directorio)
+
+    archivos = {}
+    for ruta_relativa in listar_archivos():
+        ruta = os.path.join(DATA_DIR, ruta_relativa)
+        estado = os.stat(ruta)
+        archivos[ruta_relativa] = {"mtime_ns": estado.st_mtime_ns, "tamano": estado.st_size}
+
+    # Detectar los archivos nuevos o modificados (por tamaño/fecha y, si difieren, por contenido)
+    previos = anterior["archivos"] if anterior else {}
+    cambiados = []
+    for ruta_relativa, info in archivos.items():
+        previo = previos.get(ruta_relativa)
+        if previo and (previo["mtime_ns"], previo["tamano"]) == (info["mtime_ns"], info["tamano"]):
+            info["sha1"] = previo["sha1"]
+            continue
+        info["sha1"] = _huella_archivo(os.path.join(DATA_DIR, ruta_relativa))
+        if not previo or previo["sha1"] != info["sha1"]:
+            cambiados.append(ruta_relativa)
+    eliminados = [ruta for ruta in previos if ruta not in archivos]
+
+    if anterior and not cambiados and not eliminados:
+        if any(previos[ruta]["mtime_ns"] != info["mtime_ns"] for ruta, info in archivos.items()):
+            for ruta, info in archivos.items():
+                info["filas"] = previos[ruta]["filas"]
+            anterior["archivos"] = archivos
+            _escribir_metadatos(directorio, anterior)
+        return {"modo": "sin cambios", "secciones": len(anterior["secciones"]), "recalculados": []}
+
+    # Secciones de cada archivo: reutilizar las del índice anterior si el archivo no cambió
+    secciones_por_archivo = {}
+    for ruta_relativa in archivos:
+        if anterior and ruta_relativa not in cambiados:
+            inicio, fin = previos[ruta_relativa]["filas"]
+            secciones_por_archivo[ruta_relativa] = anterior["secciones"][inicio:fin]
+        else:
+            secciones_por_archivo[ruta_relativa] = fragmentar_archivo(os.path.join(DATA_DIR, ruta_relativa), ruta_relativa)
+    secciones = [seccion for ruta in archivos for seccion in secciones_por_archivo[ruta]]
+
+    nuevas = sum(len(secciones_por_archivo[ruta]) for ruta in cambiados)
+    incremental = anterior is not None and nuevas <= PROPORCION_RECALCULO * max(1, len(secciones))
+
+    if incremental:
+        proyeccion = np.load(os.path.join(directorio, ARCHIVO_PROYECCION))
+        embeddings_previos = np.load(os.path.join(directorio, ARCHIVO_EMBEDDINGS), mmap_mode="r")
+    else:
+        proyeccion = calcular_proyeccion(secciones, dimension) if secciones else np.zeros((DIMENSION_HASH, 1), np.float32)
+
+    # Escribir en temporales y renombrar al final para no dejar índices a medias
+    ruta_embeddings = os.path.join(directorio, ARCHIVO_EMBEDDINGS)
+    embeddings = np.lib.format.open_memmap(
+        f"{ruta_embeddings}.tmp", mode="w+", dtype=np.float32, shape=(len(secciones), proyeccion.shape[1])
+    )
+    fila = 0
+    for ruta_relativa in archivos:
+        grupo = secciones_por_archivo[ruta_relativa]
+        if incremental and ruta_relativa not in cambiados:
+            inicio, fin = previos[ruta_relativa]["filas"]
+            embeddings[fila:fila + len(grupo)] = embeddings_previos[inicio:fin]
+        else:
+            embeddings[fila:fila + len(grupo)] = embeber([_texto_seccion(s) for s in grupo], proyeccion)
+        archivos[ruta_relativa]["filas"] = [fila, fila + len(grupo)]
+        fila += len(grupo)
+    embeddings.flush()
+    del embeddings
+    if incremental:
+        del embeddings_previos
+
+    if not incremental:
+        ruta_proyeccion = os.path.join(directorio, ARCHIVO_PROYECCION)
+        with open(f"{ruta_proyeccion}.tmp", "wb") as f:
+            np.save(f, proyeccion)
+        os.replace(f"{ruta_proyeccion}.tmp", ruta_proyeccion)
+    os.replace(f"{ruta_embeddings}.tmp", ruta_embeddings)
+    _escribir_metadatos(directorio, {
+        "version": VERSION_INDICE,
+        "dimension_hash": DIMENSION_HASH,
+        "dimension": int(proyeccion.shape[1]),
+        "archivos": archivos,
+        "secciones": secciones
+    })
+
+    return {
+        "modo": "incremental" if incremental else "completo",
+        "secciones": len(secciones),
+        "recalculados": cambiados if incremental else list(archivos)
+    }
+
+
+def _escribir_metadatos(directorio, metadatos):
+    ruta = os.path.join(directorio, ARCHIVO_METADATOS)
+    with open(f"{ruta}.tmp", "w", encoding="utf-8") as f:
+        json.dump(metadatos, f, ensure_ascii=False)
+    os.replace(f"{ruta}.tmp", ruta)
+
+
+def cargar_indice(directorio=INDICE_VECTORIAL_DIR):
+    """
+    Abre el índice construido (embeddings memoria mapeados, proyección y metadatos).
+    Se vuelve a abrir automáticamente si se reconstruye en disco.
+
+    Returns:
+        tuple: (embeddings, proyeccion, secciones) o None si no hay índice válido
+    """
+    global _cargado, _firma_cargado
+    ruta_metadatos = os.path.join(directorio, ARCHIVO_METADATOS)
+    try:
+        firma = os.stat(ruta_metadatos).st_mtime_ns
+    except OSError:
+        return None
+
+    with _lock_carga:
+        if _firma_cargado != firma:
+            _cargado = None
+            metadatos = _leer_metadatos(directorio)
+            if metadatos is not None:
+                embeddings = np.load(os.path.join(directorio, ARCHIVO_EMBEDDINGS), mmap_mode="r")
+                proyeccion = np.load(os.path.join(directorio, ARCHIVO_PROYECCION))
+                if embeddings.shape == (len(metadatos["secciones"]), proyeccion.shape[1]):
+                    _cargado = (embeddings, proyeccion, metadatos["secciones"])
+            _firma_cargado = firma
+        return _cargado
+
+
+def buscar(consulta, k, arquitecturas=None, similitud_minima=INDICE_VECTORIAL_SIMILITUD_MIN):
+    """
+    Secciones más similares (coseno) a una consulta.
+
+    Args:
+        consulta (str): Texto de la consulta
+        k (int): Número máximo de secciones
+        arquitecturas (list, optional): Limitar a estas arquitecturas (la documentación
+            general, sin arquitectura, siempre se incluye)
+        similitud_minima (float): Descartar secciones menos similares que este valor
+
+    Returns:
+        list: Tuplas (similitud, sección) de mayor a menor similitud; vacía si no hay índice
+    """
+    indice = cargar_indice()
+    if indice is None or k <= 0:
+        return []
+    embeddings, proyeccion, secciones = indice
+    if not secciones:
+        return []
+
+    consulta_embebida = embeber([consulta], proyeccion)[0]
+    similitudes = np.asarray(embeddings @ consulta_embebida)
+    if arquitecturas:
+        permitidas = set(arquitecturas) | {None}
+        mascara = np.fromiter((s["arquitectura"] in permitidas for s in secciones), bool, len(secciones))
+        similitudes = np.where(mascara, similitudes, -np.inf)
+
+    k = min(k, len(secciones))
+    mejores = np.argpartition(-similitudes, k - 1)[:k]
+    mejores = mejores[np.argsort(-similitudes[mejores], kind="stable")]
+    return [(float(similitudes[i]), secciones[i]) for i in mejores if similitudes[i] >= similitud_minima]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Construye el índice vectorial de la documentación de data/.")
+    parser.add_argument("--completo", action="store_true", help="Recalcular la proyección y todos los embeddings")
+    args = parser.parse_args()
+    resumen = construir_indice(completo=args.completo)
+    print(f"Índice vectorial ({resumen['modo']}) en {INDICE_VECTORIAL_DIR}: {resumen['secciones']} secciones")
+    for ruta in resumen["recalculados"]:
+        print(f"  recalculado: {ruta}")
@@ -0,0 +1,236 @@
+"""
+Motor de puntuación por inferencia difusa (Mamdani).
+Alternativa al motor lineal del modelo compilado: el promedio de cada categoría se
+fuzzifica con funciones trapezoidales construidas a partir de las bandas de
+INTERPRETACION_DIFUSA (baja, media, alta), una base de reglas asigna a cada arquitectura
+un nivel de adecuación (mínimo para el Y, suma acotada para combinar las reglas con el mismo
+consecuente y máximo para agregar los conjuntos recortados) y la puntuación final es el
+centroide del conjunto de salida. La suma acotada, junto con pertenencias de entrada que
+suman 1, hace que cada puntuación sea monótona en los promedios de sus categorías: con el
+máximo, dos reglas con el mismo consecuente en bandas contiguas bajaban su activación en la
+transición y la puntuación retrocedía.
+
+Todo se calcula sobre arrays de NumPy, así que se puntúan lotes completos de encuestas a la vez.
+
+Uso (desde la carpeta app/) para comparar ambos motores con encuestas aleatorias:
+    python -m utils.inferencia_difusa --muestras 100000
+"""
+import numpy as np
+from config import INFERENCIA_ANCHO_TRANSICION, INFERENCIA_PUNTOS
+from context.arquitectura_data import INTERPRETACION_DIFUSA
+from utils.modelo_evaluacion import MODELO, ARQUITECTURAS, ROL_AUTONOMIA, ROL_GLOBAL, ROL_EVENTOS
+
+NIVELES = ["baja", "media", "alta"]
+
+# Encuestas por bloque en la defuzzificación (acota la memoria del array N×4×3×puntos)
+TAMANO_BLOQUE = 4096
+
+# Nivel de adecuación del enfoque híbrido según los niveles de microservicios (filas)
+# y de eventos (columnas)
+_TABLA_HIBRIDO = [
+    ["baja", "baja", "media"],
+    ["baja", "media", "media"],
+    ["media", "media", "alta"],
+]
+
+# Base de reglas: (antecedentes {rol de categoría: nivel}, arquitectura, nivel de adecuación)
+REGLAS = [
+    # Microservicios: autonomía de servicios, reforzada por la escalabilidad global
+    ({ROL_AUTONOMIA: "alta"}, "microservicios", "alta"),
+    ({ROL_AUTONOMIA: "media", ROL_GLOBAL: "alta"}, "microservicios", "alta"),
+    ({ROL_AUTONOMIA: "media"}, "microservicios", "media"),
+    ({ROL_AUTONOMIA: "baja"}, "microservicios", "baja"),
+    # Eventos: comunicación asíncrona, reforzada por la integración global
+    ({ROL_EVENTOS: "alta"}, "eventos", "alta"),
+    ({ROL_EVENTOS: "media", ROL_GLOBAL: "alta"}, "eventos", "alta"),
+    ({ROL_EVENTOS: "media"}, "eventos", "media"),
+    ({ROL_EVENTOS: "baja"}, "eventos", "baja"),
+    # Monolítico: lo contrario de la autonomía de servicios, penalizado si hay muchos eventos
+    ({ROL_AUTONOMIA: "baja"}, "monolitico", "alta"),
+    ({ROL_AUTONOMIA: "media"}, "monolitico", "media"),
+    ({ROL_AUTONOMIA: "alta"}, "monolitico", "baja"),
+    ({ROL_EVENTOS: "alta"}, "monolitico", "baja"),
+] + [
+    # Híbrido: combinación de microservicios y eventos
+    ({ROL_AUTONOMIA: nivel_ms, ROL_EVENTOS: nivel_ev}, "hibrido", _TABLA_HIBRIDO[i][j])
+    for i, nivel_ms in enumerate(NIVELES) for j, nivel_ev in enumerate(NIVELES)
+]
+
+
+def trapecios_entrada(bandas=INTERPRETACION_DIFUSA, ancho=INFERENCIA_ANCHO_TRANSICION):
+    """
+    Funciones de pertenencia trapezoidales de los niveles de entrada.
+    Cada transición está centrada entre dos bandas consecutivas y tiene la anchura indicada,
+    de modo que las pertenencias de un valor suman siempre 1.
+
+    Returns:
+        np.ndarray: Matriz 3×4 con los vértices (a, b, c, d) de cada trapecio en el orden de NIVELES
+    """
+    corte_bajo = (bandas["baja"][1] + bandas["media"][0]) / 2
+    corte_alto = (bandas["media"][1] + bandas["alta"][0]) / 2
+    medio = ancho / 2
+    return np.array([
+        [-np.inf, -np.inf, corte_bajo - medio, corte_bajo + medio],
+        [corte_bajo - medio, corte_bajo + medio, corte_alto - medio, corte_alto + medio],
+        [corte_alto - medio, corte_alto + medio, np.inf, np.inf],
+    ])
+
+
+def pertenencia_trapecio(valores, trapecios):
+    """
+    Grado de pertenencia de cada valor a cada trapecio.
+
+    Args:
+        valores (np.ndarray): Array de valores de cualquier forma
+        trapecios (np.ndarray): Matriz K×4 de vértices (a, b, c, d)
+
+    Returns:
+        np.ndarray: Array con una dimensión final más, de tamaño K
+    """
+    x = np.asarray(valores, dtype=float)[..., None]
+    a, b, c, d = trapecios.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        subida = np.where(np.isinf(a), 1.0, (x - a) / (b - a))
+        bajada = np.where(np.isinf(d), 1.0, (d - x) / (d - c))
+    return np.clip(np.minimum(subida, bajada), 0.0, 1.0)
+
+
+def conjuntos_salida(puntos=INFERENCIA_PUNTOS):
+    """
+    Conjuntos triangulares de adecuación baja, media y alta sobre el universo [0, 1].
+
+    Returns:
+        tuple: (universo de `puntos` valores, matriz 3×puntos de pertenencias)
+    """
+    universo = np.linspace(0.0, 1.0, puntos)
+    triangulos = np.array([
+        [-np.inf, 0.0, 0.0, 0.5],
+        [0.0, 0.5, 0.5, 1.0],
+        [0.5, 1.0, 1.0, np.inf],
+    ])
+    return universo, pertenencia_trapecio(universo, triangulos).T
+
+
+class MotorDifuso:
+    """
+    Base de reglas compilada a índices para evaluarla sobre lotes.
+
+    Args:
+        reglas (list, optional): Reglas (antecedentes, arquitectura, nivel)
+        modelo (ModeloEvaluacion, optional): Modelo con el orden de las categorías y sus roles
+    """
+
+    def __init__(self, reglas=REGLAS, modelo=MODELO):
+        self.categorias = list(modelo.categorias)
+        self.trapecios = trapecios_entrada()
+        self.universo, self.salida = conjuntos_salida()
+
+        # Antecedentes como índices en la matriz aplanada de pertenencias (categoría × nivel);
+        # el índice extra apunta a una columna de unos para las reglas con menos antecedentes
+        max_antecedentes = max(len(antecedentes) for antecedentes, _, _ in reglas)
+        neutro = len(self.categorias) * len(NIVELES)
+        self.antecedentes = np.full((len(reglas), max_antecedentes), neutro)
+        self.consecuentes = np.zeros((len(reglas), len(ARQUITECTURAS) * len(NIVELES)), dtype=bool)
+        for r, (antecedentes, arquitectura, nivel) in enumerate(reglas):
+            for k, (rol, nivel_entrada) in enumerate(antecedentes.items()):
+                self.antecedentes[r, k] = modelo.indice_rol[rol] * len(NIVELES) + NIVELES.index(nivel_entrada)
+            self.consecuentes[r, ARQUITECTURAS.index(arquitectura) * len(NIVELES) + NIVELES.index(nivel)] = True
+
+    def activaciones(self, promedios):
+        """
+        Activación de cada nivel de adecuación de cada arquitectura.
+
+        Args:
+            promedios (np.ndarray): Matriz N×3 de promedios por categoría
+
+        Returns:
+            np.ndarray: Matriz N×4×3 (arquitectura × nivel)
+        """
+        pertenencias = pertenencia_trapecio(promedios, self.trapecios).reshape(len(promedios), -1)
+        pertenencias = np.hstack([pertenencias, np.ones((len(promedios), 1))])
+        disparo = pertenencias[:, self.antecedentes].min(axis=2)
+        # Suma acotada de los disparos de las reglas de cada consecuente
+        activacion = np.minimum(disparo @ self.consecuentes, 1.0)
+        return activacion.reshape(len(promedios), len(ARQUITECTURAS), len(NIVELES))
+
+    def puntuar(self, promedios):
+        """
+        Puntuaciones globales por inferencia difusa.
+
+        Args:
+            promedios (np.ndarray): Matriz N×3 de promedios por categoría (orden de MODELO.categorias)
+
+        Returns:
+            np.ndarray: Matriz N×4 en el orden de ARQUITECTURAS
+        """
+        promedios = np.atleast_2d(np.asarray(promedios, dtype=float))
+        puntuaciones = np.zeros((len(promedios), len(ARQUITECTURAS)))
+        for inicio in range(0, len(promedios), TAMANO_BLOQUE):
+            activacion = self.activaciones(promedios[inicio:inicio + TAMANO_BLOQUE])
+            # Conjuntos recortados por su activación y agregados con el máximo: N×4×puntos
+            # (nivel a nivel, para no reducir sobre un eje intermedio)
+            agregado = np.minimum(activacion[..., 0, None], self.salida[0])
+            recortado = np.empty_like(agregado)
+            for nivel in range(1, len(NIVELES)):
+                np.minimum(activacion[..., nivel, None], self.salida[nivel], out=recortado)
+                np.maximum(agregado, recortado, out=agregado)
+            area = agregado.sum(axis=2)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                puntuaciones[inicio:inicio + TAMANO_BLOQUE] = np.where(
+                    area > 0, (agregado @ self.universo) / area, 0.0
+                )
+        return puntuaciones
+
+
+_motor = None
+
+
+def obtener_motor():
+    """Motor difuso compartido, compilado la primera vez que se usa"""
+    global _motor
+    if _motor is None:
+        _motor = MotorDifuso()
+    return _motor
+
+
+def puntuar_difuso(promedios):
+    """
+    Puntúa un lote de promedios por categoría con el motor difuso compartido.
+
+    Args:
+        promedios (np.ndarray): Matriz N×3 de promedios por categoría
+
+    Returns:
+        np.ndarray: Matriz N×4 en el orden de ARQUITECTURAS
+    """
+    return obtener_motor().puntuar(promedios)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Compara el motor lineal y el difuso con encuestas aleatorias.")
+    parser.add_argument("--muestras", type=int, default=100000, help="Encuestas aleatorias (por defecto 100000)")
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    matriz = np.random.default_rng(args.semilla).random((args.muestras, len(MODELO.ids)))
+
+    inicio = time.perf_counter()
+    evaluacion = MODELO.evaluar(matriz)
+    tiempo_lineal = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    difusas = puntuar_difuso(evaluacion["promedios"])
+    tiempo_difuso = time.perf_counter() - inicio
+
+    recomendacion_lineal = MODELO.recomendar(evaluacion["puntuaciones"])[2]
+    recomendacion_difusa = MODELO.recomendar(difusas)[2]
+    print(f"Motor lineal: {tiempo_lineal * 1000:.1f} ms ({args.muestras / tiempo_lineal:,.0f} encuestas/s)")
+    print(f"Motor difuso: {tiempo_difuso * 1000:.1f} ms ({args.muestras / tiempo_difuso:,.0f} encuestas/s, "
+          "sin contar los promedios)")
+    print(f"Misma recomendación: {np.mean(recomendacion_lineal == recomendacion_difusa):.1%}")
+    for k, arquitectura in enumerate(ARQUITECTURAS):
+        print(f"  {arquitectura}: lineal {np.mean(recomendacion_lineal == k):.1%}, "
+              f"difuso {np.mean(recomendacion_difusa == k):.1%}")
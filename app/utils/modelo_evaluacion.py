@@ -0,0 +1,291 @@
+"""
+Modelo de evaluación compilado a partir del banco de preguntas (preguntas, pesos y roles de
+las categorías).
+Se construye una sola vez al importar el módulo y reduce el cálculo de puntuaciones
+a productos matriciales sobre vectores de respuestas ordenados por pregunta.
+"""
+import hashlib
+import numpy as np
+from context.arquitectura_data import BANCO_PREGUNTAS
+from config import UMBRAL_CERCANIA
+
+# Roles de las categorías que intervienen en las puntuaciones globales (ver utils.banco_preguntas)
+ROL_AUTONOMIA = "autonomia"
+ROL_GLOBAL = "global"
+ROL_EVENTOS = "eventos"
+
+# Orden canónico de las arquitecturas (columnas de la proyección)
+ARQUITECTURAS = ["microservicios", "eventos", "monolitico", "hibrido"]
+
+# Versión del cálculo de las puntuaciones (forma parte de la huella del modelo, así que
+# cambiarla invalida los artefactos precalculados como la tabla binaria)
+VERSION_CALCULO = 2
+
+
+class ModeloEvaluacion:
+    """
+    Forma compilada del cuestionario.
+
+    Atributos:
+        ids (list): Ids de las preguntas en orden de columna
+        indice_pregunta (dict): Id de pregunta (str) -> columna
+        categorias (list): Nombres de las categorías en orden de columna
+        indice_rol (dict): Rol de categoría -> índice de la categoría que lo cumple
+        indice_categoria (np.ndarray): Categoría (índice) de cada pregunta
+        pesos (np.ndarray): Peso de cada pregunta
+        conteos (np.ndarray): Número de preguntas por categoría
+        matriz_categorias (np.ndarray): Matriz 18×3 con el peso de cada pregunta en su categoría
+        proyeccion (np.ndarray): Matriz 3×4 de promedios por categoría a puntuaciones globales
+        desplazamiento (np.ndarray): Término independiente de las puntuaciones globales
+        proyeccion_global (np.ndarray): Matriz 18×4 de respuestas a puntuaciones globales
+            (para un cuestionario completo)
+        banco (BancoPreguntas): Banco de origen (None si se compiló desde una lista)
+
+    Args:
+        preguntas (list): Categorías con sus preguntas; las que intervienen en las puntuaciones
+            globales tienen "rol" y "peso"
+        fraccion_global (dict): Fracción de la categoría global para "microservicios" y "eventos"
+        banco (BancoPreguntas, optional): Banco de origen
+    """
+
+    def __init__(self, preguntas, fraccion_global, banco=None):
+        self.banco = banco
+        self.ids = [pregunta['id'] for categoria in preguntas for pregunta in categoria['preguntas']]
+        self.indice_pregunta = {str(id_pregunta): columna for columna, id_pregunta in enumerate(self.ids)}
+        self.categorias = [categoria['categoria'] for categoria in preguntas]
+        self.indice_rol = {categoria['rol']: indice for indice, categoria in enumerate(preguntas) if categoria.get('rol')}
+        self.textos = [pregunta['texto'] for categoria in preguntas for pregunta in categoria['preguntas']]
+        self.indice_categoria = np.array([
+            indice for indice, categoria in enumerate(preguntas) for _ in categoria['preguntas']
+        ])
+        self.pesos = np.array([pregunta['peso'] for categoria in preguntas for pregunta in categoria['preguntas']])
+        self.conteos = np.bincount(self.indice_categoria, minlength=len(self.categorias)).astype(float)
+
+        self.matriz_categorias = np.zeros((len(self.ids), len(self.categorias)))
+        self.matriz_categorias[np.arange(len(self.ids)), self.indice_categoria] = self.pesos
+        self.matriz_pertenencia = np.zeros_like(self.matriz_categorias)
+        self.matriz_pertenencia[np.arange(len(self.ids)), self.indice_categoria] = 1.0
+
+        self.proyeccion, self.desplazamiento = self._compilar_proyeccion(preguntas, fraccion_global)
+        self.proyeccion_global = (self.matriz_categorias / self.conteos) @ self.proyeccion
+
+    def _compilar_proyeccion(self, preguntas, fraccion_global):
+        """Precalcula los coeficientes de las puntuaciones globales a partir de los roles y pesos de las categorías"""
+        faltantes = [rol for rol in (ROL_AUTONOMIA, ROL_GLOBAL, ROL_EVENTOS) if rol not in self.indice_rol]
+        if faltantes:
+            raise ValueError(f"Ninguna categoría del cuestionario tiene el rol {faltantes}")
+        ms = self.indice_rol[ROL_AUTONOMIA]
+        glo = self.indice_rol[ROL_GLOBAL]
+        ev = self.indice_rol[ROL_EVENTOS]
+
+        # Microservicios: autonomía de servicios y parte de la categoría global
+        peso_ms_autonomia = preguntas[ms]["peso"]
+        peso_ms_global = preguntas[glo]["peso"] * fraccion_global["microservicios"]
+        total_ms = peso_ms_autonomia + peso_ms_global
+
+        # Eventos: categoría de eventos y parte de la categoría global
+        peso_ev_eventos = preguntas[ev]["peso"]
+        peso_ev_global = preguntas[glo]["peso"] * fraccion_global["eventos"]
+        total_ev = peso_ev_eventos + peso_ev_global
+
+        proyeccion = np.zeros((len(self.categorias), len(ARQUITECTURAS)))
+        proyeccion[ms, 0] = peso_ms_autonomia / total_ms
+        proyeccion[glo, 0] = peso_ms_global / total_ms
+        proyeccion[ev, 1] = peso_ev_eventos / total_ev
+        proyeccion[glo, 1] = peso_ev_global / total_ev
+        # Monolítico es el inverso de microservicios
+        proyeccion[:, 2] = -proyeccion[:, 0]
+        # Híbrido es el promedio entre microservicios y eventos
+        proyeccion[:, 3] = (proyeccion[:, 0] + proyeccion[:, 1]) / 2
+
+        desplazamiento = np.array([0.0, 0.0, 1.0, 0.0])
+
+        # Pesos sin normalizar para proyectar con el mismo orden de operaciones que la fórmula
+        # original (dividir la suma ponderada por el total), de modo que los empates exactos
+        # entre arquitecturas se resuelven igual
+        self._pesos_globales = (ms, glo, ev, peso_ms_autonomia, peso_ms_global, total_ms,
+                                peso_ev_eventos, peso_ev_global, total_ev)
+        return proyeccion, desplazamiento
+
+    def columna(self, id_pregunta):
+        """
+        Columna de una pregunta a partir de su id o de su clave cualificada del banco.
+
+        Raises:
+            KeyError: Si la pregunta no existe o la clave es de otro banco o versión
+        """
+        if self.banco is not None:
+            id_pregunta = self.banco.id_local(id_pregunta)
+        return self.indice_pregunta[str(id_pregunta)]
+
+    def vector_respuestas(self, respuestas):
+        """
+        Convierte un diccionario de respuestas de la encuesta en un vector ordenado por pregunta.
+
+        Args:
+            respuestas (dict): Id de pregunta (o clave cualificada) -> {"valor": ...} o valor numérico
+                (o RespuestasSesion, que ya guarda el vector)
+
+        Returns:
+            np.ndarray: Vector de 18 valores (NaN para las preguntas sin responder)
+        """
+        if hasattr(respuestas, "vector"):
+            return respuestas.vector()
+        vector = np.full(len(self.ids), np.nan)
+        for id_pregunta, respuesta in respuestas.items():
+            valor = respuesta['valor'] if isinstance(respuesta, dict) else respuesta
+            vector[self.columna(id_pregunta)] = valor
+        return vector
+
+    def mascara_imputadas(self, respuestas):
+        """
+        Preguntas cuyo valor se imputó al terminar antes la encuesta adaptativa.
+
+        Args:
+            respuestas (dict): Respuestas en el formato de vector_respuestas
+
+        Returns:
+            np.ndarray: Vector booleano en el orden del modelo (True = valor imputado)
+        """
+        if isinstance(getattr(respuestas, "imputadas", None), np.ndarray):
+            return respuestas.imputadas.copy()
+        mascara = np.zeros(len(self.ids), dtype=bool)
+        for id_pregunta, respuesta in respuestas.items():
+            if isinstance(respuesta, dict) and respuesta.get("imputada"):
+                mascara[self.columna(id_pregunta)] = True
+        return mascara
+
+    def evaluar(self, matriz):
+        """
+        Calcula sumas, promedios por categoría y puntuaciones globales de un lote de respuestas.
+
+        Args:
+            matriz (np.ndarray): Matriz N×18 de respuestas (NaN = sin responder)
+
+        Returns:
+            dict: "sumas" y "conteos" (N×3), "promedios" (N×3) y "puntuaciones" (N×4)
+        """
+        evaluacion = self.agregar_categorias(matriz)
+        evaluacion["puntuaciones"] = self.proyectar(evaluacion["promedios"])
+        return evaluacion
+
+    def agregar_categorias(self, matriz):
+        """
+        Calcula solo las sumas, conteos y promedios por categoría de un lote de respuestas
+        (sin las puntuaciones globales).
+
+        Args:
+            matriz (np.ndarray): Matriz N×18 de respuestas (NaN = sin responder)
+
+        Returns:
+            dict: "sumas", "conteos" y "promedios" (N×3)
+        """
+        respondidas = ~np.isnan(matriz)
+        valores = np.where(respondidas, matriz, 0.0)
+
+        sumas = _producto_ordenado(valores, self.matriz_categorias)
+        conteos = _producto_ordenado(respondidas.astype(float), self.matriz_pertenencia)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            promedios = np.where(conteos > 0, sumas / conteos, 0.0)
+
+        return {"sumas": sumas, "conteos": conteos, "promedios": promedios}
+
+    def jacobiano(self, vector):
+        """
+        Derivadas de las puntuaciones globales respecto a cada respuesta.
+
+        Con el conjunto de preguntas respondidas fijo, las puntuaciones son lineales en las
+        respuestas, así que las derivadas son exactas en todo el intervalo [0, 1].
+
+        Args:
+            vector (np.ndarray): Vector de 18 respuestas (NaN = sin responder)
+
+        Returns:
+            np.ndarray: Matriz 18×4; fila j = variación de cada puntuación global por unidad
+                de la respuesta j (cero para las preguntas sin responder)
+        """
+        respondidas = ~np.isnan(vector)
+        conteos = respondidas.astype(float) @ self.matriz_pertenencia
+        conteos_pregunta = conteos[self.indice_categoria]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            escala = np.where(respondidas, 1.0 / conteos_pregunta, 0.0)
+        return (self.matriz_categorias * escala[:, None]) @ self.proyeccion
+
+    def proyectar(self, promedios):
+        """
+        Proyecta promedios por categoría (N×3) sobre las puntuaciones globales (N×4).
+
+        Equivale a promedios @ proyeccion + desplazamiento, pero se calcula con el orden de
+        operaciones de la fórmula original para obtener exactamente los mismos valores.
+        """
+        ms, glo, ev, peso_ms_autonomia, peso_ms_global, total_ms, peso_ev_eventos, peso_ev_global, total_ev = self._pesos_globales
+        puntuaciones = np.empty((promedios.shape[0], len(ARQUITECTURAS)))
+        puntuaciones[:, 0] = (promedios[:, ms] * peso_ms_autonomia + promedios[:, glo] * peso_ms_global) / total_ms
+        puntuaciones[:, 1] = (promedios[:, ev] * peso_ev_eventos + promedios[:, glo] * peso_ev_global) / total_ev
+        puntuaciones[:, 2] = 1 - puntuaciones[:, 0]
+        puntuaciones[:, 3] = (puntuaciones[:, 0] + puntuaciones[:, 1]) / 2
+        return puntuaciones
+
+    def recomendar(self, puntuaciones):
+        """
+        Determina la recomendación de un lote de puntuaciones globales.
+
+        Args:
+            puntuaciones (np.ndarray): Matriz N×4 en el orden de ARQUITECTURAS
+
+        Returns:
+            tuple: (indice_maximo, cercanas, indice_recomendacion) donde indice_maximo es el
+                índice de la arquitectura con mayor puntuación (el primero en caso de empate),
+                cercanas es una matriz N×4 booleana e indice_recomendacion el índice del tipo final
+        """
+        filas = np.arange(puntuaciones.shape[0])
+        indice_maximo = np.argmax(puntuaciones, axis=1)
+        max_puntuacion = puntuaciones[filas, indice_maximo]
+
+        cercanas = (max_puntuacion[:, None] - puntuaciones) < UMBRAL_CERCANIA
+        cercanas[filas, indice_maximo] = False
+
+        indice_recomendacion = np.where(
+            cercanas.any(axis=1),
+            ARQUITECTURAS.index("hibrido"),
+            indice_maximo
+        )
+        return indice_maximo, cercanas, indice_recomendacion
+
+    def huella(self):
+        """
+        Identificador corto de los parámetros del modelo.
+
+        Cambia cuando cambian las preguntas, los pesos o la proyección, y sirve para
+        invalidar artefactos precalculados a partir del modelo.
+        """
+        contenido = repr((self.ids, self.pesos.tolist(), self.proyeccion.tolist(),
+                          self.desplazamiento.tolist(), UMBRAL_CERCANIA, VERSION_CALCULO))
+        return hashlib.sha1(contenido.encode("utf-8")).hexdigest()[:12]
+
+
+def _producto_ordenado(matriz, coeficientes):
+    """
+    Producto matricial que acumula columna a columna en un orden fijo.
+
+    A diferencia de un producto BLAS, el resultado de cada fila no depende del tamaño
+    del lote, por lo que evaluar una encuesta sola o dentro de un lote da el mismo valor exacto.
+    """
+    resultado = np.zeros((matriz.shape[0], coeficientes.shape[1]))
+    for columna in range(matriz.shape[1]):
+        resultado += matriz[:, columna, None] * coeficientes[columna]
+    return resultado
+
+
+def compilar_modelo():
+    """
+    Compila el modelo de evaluación a partir del banco de preguntas configurado.
+
+    Returns:
+        ModeloEvaluacion: Modelo compilado
+    """
+    return ModeloEvaluacion(BANCO_PREGUNTAS.categorias, BANCO_PREGUNTAS.fraccion_global, banco=BANCO_PREGUNTAS)
+
+
+# Modelo compartido por la aplicación, compilado una vez al importar
+MODELO = compilar_modelo()
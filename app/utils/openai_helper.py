@@ -1,13 +1,40 @@
 import os
 import json
+import threading
+import time
 import openai
-from dotenv import load_dotenv
+from utils.cache_archivos import cargar_json
+from utils import cache_respuestas
+from utils.cliente_openai import obtener_cliente
+from utils.presupuesto_tokens import ajustar_a_presupuesto
+from utils.recuperacion import secciones_relevantes, formatear_secciones
+from config import (
+    CACHE_RESPUESTAS_ACTIVA,
+    OPENAI_API_KEY,
+    OPENAI_MODEL,
+    OPENAI_MAX_TOKENS_PROMPT,
+    OPENAI_API_BASE,
+    DATA_DIR,
+    ARCHIVOS_CONTEXTO,
+    CONTEXTO_SECCIONES_TOP_K,
+)
 
-# Cargar variables de entorno
-load_dotenv()
+# Configurar la API key de OpenAI (las variables de entorno se cargan una sola vez en config)
+openai.api_key = OPENAI_API_KEY
 
-# Configurar la API key de OpenAI
-openai.api_key = os.getenv("OPENAI_API_KEY")
+# Permitir apuntar a otro endpoint compatible con la API de OpenAI
+if OPENAI_API_BASE:
+    openai.api_base = OPENAI_API_BASE
+
+# Encabezado del mensaje con el resumen de resultados del usuario (se excluye de la clave de caché)
+ENCABEZADO_RESULTADOS = "Información resumida de la encuesta del usuario:"
+
+MENSAJE_SIN_API_KEY = "Error: No se ha configurado la API key de OpenAI. Por favor, configura la variable de entorno OPENAI_API_KEY."
+
+# Métricas de tiempo hasta el primer token de las respuestas en streaming (solo las que
+# genera el modelo; las servidas desde la caché se cuentan aparte para no falsear el TTFT)
+_metricas_streaming = {"respuestas": 0, "ultimo_ttft": 0.0, "suma_ttft": 0.0, "max_ttft": 0.0, "aciertos_cache": 0}
+_lock_metricas = threading.Lock()
 
 def get_openai_response(user_message, context=None):
     """
@@ -24,131 +51,268 @@ def get_openai_response(user_message, context=None):
     try:
         # Verificar que la API key está configurada
         if not openai.api_key:
-            return "Error: No se ha configurado la API key de OpenAI. Por favor, configura la variable de entorno OPENAI_API_KEY."
+            return MENSAJE_SIN_API_KEY
         
-        # Construir el sistema de mensajes
-        system_prompt = """
-        Eres un asistente experto en arquitecturas de software. Tu tarea es ayudar a los usuarios a elegir
-        la arquitectura más adecuada para sus proyectos basándose en sus respuestas a un cuestionario de evaluación.
+        messages = construir_mensajes(user_message, context)
         
-        Las principales arquitecturas que puedes recomendar son:
-        1. Microservicios: Sistemas distribuidos con servicios independientes y autónomos.
-        2. Arquitectura orientada a eventos: Sistemas basados en la comunicación por eventos y desacoplamiento.
-        3. Arquitectura monolítica: Un solo sistema integrado con todos los componentes juntos.
-        4. Arquitecturas híbridas: Combinación de enfoques según las necesidades específicas.
+        # Reutilizar la respuesta si la misma consulta ya se hizo antes
+        clave = clave_cache(messages, context) if CACHE_RESPUESTAS_ACTIVA else None
+        if clave:
+            respuesta_cache = cache_respuestas.obtener(clave)
+            if respuesta_cache is not None:
+                return respuesta_cache
         
-        Para cada recomendación, debes explicar:
-        - Por qué es adecuada para el caso específico
-        - Ventajas y desventajas
-        - Consideraciones de implementación
-        - Posibles tecnologías a utilizar
+        # Obtener respuesta de OpenAI
+        inicio = time.perf_counter()
+        response = obtener_cliente().chat_completion(
+            model=OPENAI_MODEL,
+            messages=messages,
+            temperature=0.7,
+            max_tokens=1000
+        )
+        contenido = response.choices[0].message.content
         
-        Basado en los resultados de la encuesta del usuario, personaliza tus respuestas.
-        """
+        if clave:
+            cache_respuestas.guardar(clave, contenido, time.perf_counter() - inicio)
         
-        messages = [{"role": "system", "content": system_prompt}]
+        return contenido
+    
+    except Exception as e:
+        print(f"Error al comunicarse con OpenAI: {e}")
+        return f"Lo siento, ha ocurrido un error al procesar tu solicitud. Detalles: {str(e)}"
+
+def get_openai_response_stream(user_message, context=None):
+    """
+    Versión en streaming de get_openai_response: genera los fragmentos de texto
+    de la respuesta a medida que llegan de OpenAI.
+    
+    Args:
+        user_message (str): El mensaje del usuario
+        context (dict, optional): Contexto adicional para la consulta (ver get_openai_response)
+    
+    Yields:
+        str: Fragmentos consecutivos de la respuesta
+    """
+    inicio = time.perf_counter()
+    primer_fragmento = True
+    try:
+        # Verificar que la API key está configurada
+        if not openai.api_key:
+            yield MENSAJE_SIN_API_KEY
+            return
         
-        # Agregar contexto si está disponible
-        if context:
-            # Verificar si hay arquitecturas con puntuaciones cercanas
-            if context.get("tiene_arquitecturas_cercanas", False):
-                arq_principal = context.get("arquitectura_principal", "")
-                arq_cercanas = context.get("arquitecturas_cercanas", [])
-                
-                # Agregar instrucciones específicas para el caso de arquitecturas cercanas
-                hybrid_prompt = f"""
-                IMPORTANTE: En este caso, el usuario tiene varias arquitecturas con puntuaciones muy cercanas:
-                - Arquitectura principal: {arq_principal}
-                - Arquitecturas cercanas: {', '.join(arq_cercanas)}
-                
-                {context.get('guia_hibrida', '')}
-                
-                Cuando respondas, considera estos aspectos híbridos y profundiza en:
-                1. Cómo pueden combinarse efectivamente estas arquitecturas
-                2. Qué elementos de cada una deberían priorizarse
-                3. Estrategias de implementación incremental
-                4. Patrones arquitectónicos que faciliten la integración
-                5. Ejemplos concretos de sistemas que utilizan enfoques híbridos similares
-                
-                Sé específico con ejemplos y recomendaciones concretas, no solo teóricas.
-                """
-                
-                messages.append({"role": "system", "content": hybrid_prompt})
-            
-            # Agregar resultados de la encuesta como contexto
-            if "resultados_encuesta" in context:
-                resultados = context["resultados_encuesta"]
-                # Convertir solo lo necesario a texto para evitar mensajes demasiado largos
-                puntuaciones_globales = resultados.get("puntuaciones_globales", {})
-                recomendacion = resultados.get("recomendacion", {})
-                
-                categorias = [cat for cat in resultados.keys() if cat not in ["puntuaciones_globales", "recomendacion"]]
-                promedios_categorias = {cat: resultados[cat].get("promedio", 0) for cat in categorias}
-                
-                # Crear un resumen más compacto de los resultados
-                resultados_resumidos = {
-                    "puntuaciones_globales": puntuaciones_globales,
-                    "recomendacion": recomendacion,
-                    "promedios_categorias": promedios_categorias
-                }
-                
-                resultados_texto = json.dumps(resultados_resumidos, indent=2, ensure_ascii=False)
-                context_message = f"""
-                Información resumida de la encuesta del usuario:
-                {resultados_texto}
-                
-                Interpretación preliminar: {context.get('interpretacion_preliminar', 'No disponible')}
-                """
-                messages.append({"role": "system", "content": context_message})
-            
-            # Cargar contextos específicos por tipo de arquitectura
-            if "resultados_encuesta" in context and "recomendacion" in context["resultados_encuesta"]:
-                recomendacion = context["resultados_encuesta"]["recomendacion"]
-                tipo_recomendacion = recomendacion.get("tipo", "")
-                
-                # Si hay arquitecturas cercanas, cargar contextos específicos para todas ellas
-                if context.get("tiene_arquitecturas_cercanas", False):
-                    # Cargar contexto de la arquitectura principal
-                    contexto_principal = cargar_contexto_arquitectura(tipo_recomendacion)
-                    if contexto_principal:
-                        messages.append({"role": "system", "content": contexto_principal})
-                    
-                    # Cargar contexto de las arquitecturas cercanas
-                    for arq_cercana in context.get("arquitecturas_cercanas", []):
-                        contexto_cercana = cargar_contexto_arquitectura(arq_cercana)
-                        if contexto_cercana:
-                            messages.append({"role": "system", "content": contexto_cercana})
-                else:
-                    # Solo cargar el contexto de la arquitectura recomendada
-                    contexto_arquitectura = cargar_contexto_arquitectura(tipo_recomendacion)
-                    if contexto_arquitectura:
-                        messages.append({"role": "system", "content": contexto_arquitectura})
-            
-            # Agregar historial de chat si está disponible
-            if "historial_chat" in context:
-                for msg in context["historial_chat"]:
-                    messages.append(msg)
+        messages = construir_mensajes(user_message, context)
         
-        # Agregar el mensaje actual del usuario
-        messages.append({"role": "user", "content": user_message})
+        # Si la respuesta está en la caché se entrega completa en un único fragmento
+        clave = clave_cache(messages, context) if CACHE_RESPUESTAS_ACTIVA else None
+        if clave:
+            respuesta_cache = cache_respuestas.obtener(clave)
+            if respuesta_cache is not None:
+                with _lock_metricas:
+                    _metricas_streaming["aciertos_cache"] += 1
+                yield respuesta_cache
+                return
         
-        # Obtener respuesta de OpenAI
-        response = openai.ChatCompletion.create(
-            model=os.getenv("OPENAI_MODEL"),
+        # Solicitar la respuesta en streaming
+        response = obtener_cliente().chat_completion_stream(
+            model=OPENAI_MODEL,
             messages=messages,
             temperature=0.7,
             max_tokens=1000
         )
         
-        return response.choices[0].message.content
+        fragmentos = []
+        for contenido in response:
+            if primer_fragmento:
+                _registrar_tiempo_primer_token(time.perf_counter() - inicio)
+                primer_fragmento = False
+            fragmentos.append(contenido)
+            yield contenido
+        
+        # Guardar la respuesta completa solo si el stream terminó sin errores
+        if clave:
+            cache_respuestas.guardar(clave, "".join(fragmentos), time.perf_counter() - inicio)
     
     except Exception as e:
         print(f"Error al comunicarse con OpenAI: {e}")
-        return f"Lo siento, ha ocurrido un error al procesar tu solicitud. Detalles: {str(e)}"
+        yield f"Lo siento, ha ocurrido un error al procesar tu solicitud. Detalles: {str(e)}"
+
+def construir_mensajes(user_message, context=None):
+    """
+    Construye la lista de mensajes que se envía a OpenAI.
+    
+    Args:
+        user_message (str): El mensaje del usuario
+        context (dict, optional): Contexto adicional (ver get_openai_response)
+    
+    Returns:
+        list: Mensajes con los prompts de sistema, el historial (recortado al presupuesto
+            OPENAI_MAX_TOKENS_PROMPT) y el mensaje del usuario
+    """
+    # Construir el sistema de mensajes
+    system_prompt = """
+    Eres un asistente experto en arquitecturas de software. Tu tarea es ayudar a los usuarios a elegir
+    la arquitectura más adecuada para sus proyectos basándose en sus respuestas a un cuestionario de evaluación.
+    
+    Las principales arquitecturas que puedes recomendar son:
+    1. Microservicios: Sistemas distribuidos con servicios independientes y autónomos.
+    2. Arquitectura orientada a eventos: Sistemas basados en la comunicación por eventos y desacoplamiento.
+    3. Arquitectura monolítica: Un solo sistema integrado con todos los componentes juntos.
+    4. Arquitecturas híbridas: Combinación de enfoques según las necesidades específicas.
+    
+    Para cada recomendación, debes explicar:
+    - Por qué es adecuada para el caso específico
+    - Ventajas y desventajas
+    - Consideraciones de implementación
+    - Posibles tecnologías a utilizar
+    
+    Basado en los resultados de la encuesta del usuario, personaliza tus respuestas.
+    """
+    
+    messages = [{"role": "system", "content": system_prompt}]
+    
+    # Agregar contexto si está disponible
+    if context:
+        # Verificar si hay arquitecturas con puntuaciones cercanas
+        if context.get("tiene_arquitecturas_cercanas", False):
+            arq_principal = context.get("arquitectura_principal", "")
+            arq_cercanas = context.get("arquitecturas_cercanas", [])
+            
+            # Agregar instrucciones específicas para el caso de arquitecturas cercanas
+            hybrid_prompt = f"""
+            IMPORTANTE: En este caso, el usuario tiene varias arquitecturas con puntuaciones muy cercanas:
+            - Arquitectura principal: {arq_principal}
+            - Arquitecturas cercanas: {', '.join(arq_cercanas)}
+            
+            {context.get('guia_hibrida', '')}
+            
+            Cuando respondas, considera estos aspectos híbridos y profundiza en:
+            1. Cómo pueden combinarse efectivamente estas arquitecturas
+            2. Qué elementos de cada una deberían priorizarse
+            3. Estrategias de implementación incremental
+            4. Patrones arquitectónicos que faciliten la integración
+            5. Ejemplos concretos de sistemas que utilizan enfoques híbridos similares
+            
+            Sé específico con ejemplos y recomendaciones concretas, no solo teóricas.
+            """
+            
+            messages.append({"role": "system", "content": hybrid_prompt})
+        
+        # Agregar resultados de la encuesta como contexto
+        if "resultados_encuesta" in context:
+            resultados = context["resultados_encuesta"]
+            # Convertir solo lo necesario a texto para evitar mensajes demasiado largos
+            puntuaciones_globales = resultados.get("puntuaciones_globales", {})
+            recomendacion = resultados.get("recomendacion", {})
+            
+            categorias = [cat for cat in resultados.keys() if cat not in ["puntuaciones_globales", "recomendacion"]]
+            promedios_categorias = {cat: resultados[cat].get("promedio", 0) for cat in categorias}
+            
+            # Crear un resumen más compacto de los resultados
+            resultados_resumidos = {
+                "puntuaciones_globales": puntuaciones_globales,
+                "recomendacion": recomendacion,
+                "promedios_categorias": promedios_categorias
+            }
+            
+            resultados_texto = json.dumps(resultados_resumidos, indent=2, ensure_ascii=False)
+            context_message = f"""
+            {ENCABEZADO_RESULTADOS}
+            {resultados_texto}
+            
+            Interpretación preliminar: {context.get('interpretacion_preliminar', 'No disponible')}
+            """
+            if context.get("preguntas_sin_responder"):
+                # No presentar los valores neutros de las preguntas omitidas como respuestas del usuario
+                context_message += f"""
+            El usuario no respondió {context['preguntas_sin_responder']} preguntas (la encuesta terminó en cuanto
+            la recomendación estuvo decidida); los promedios incluyen un valor neutro (0.5) para ellas, así que
+            no deduzcas de esos promedios opiniones que el usuario no ha expresado.
+            """
+            messages.append({"role": "system", "content": context_message})
+        
+        # Cargar contextos específicos por tipo de arquitectura
+        if "resultados_encuesta" in context and "recomendacion" in context["resultados_encuesta"]:
+            recomendacion = context["resultados_encuesta"]["recomendacion"]
+            tipo_recomendacion = recomendacion.get("tipo", "")
+            
+            # Si hay arquitecturas cercanas, usar los contextos de todas ellas
+            arquitecturas_contexto = [tipo_recomendacion]
+            if context.get("tiene_arquitecturas_cercanas", False):
+                arquitecturas_contexto += [
+                    arq for arq in context.get("arquitecturas_cercanas", []) if arq != tipo_recomendacion
+                ]
+            
+            if CONTEXTO_SECCIONES_TOP_K > 0:
+                # Solo las secciones más relevantes para la pregunta actual
+                secciones = secciones_relevantes(user_message, arquitecturas_contexto, CONTEXTO_SECCIONES_TOP_K)
+                contexto_secciones = formatear_secciones(secciones)
+                if contexto_secciones:
+                    messages.append({"role": "system", "content": contexto_secciones})
+            else:
+                # Documentos completos de cada arquitectura
+                for arquitectura in arquitecturas_contexto:
+                    contexto_arquitectura = cargar_contexto_arquitectura(arquitectura)
+                    if contexto_arquitectura:
+                        messages.append({"role": "system", "content": contexto_arquitectura})
+        
+    # Agregar el historial de chat y el mensaje actual del usuario dentro del presupuesto de tokens
+    historial = context.get("historial_chat", []) if context else []
+    return ajustar_a_presupuesto(
+        messages,
+        historial,
+        {"role": "user", "content": user_message},
+        OPENAI_MAX_TOKENS_PROMPT
+    )
+
+def clave_cache(messages, context=None):
+    """
+    Clave de la caché de respuestas para una consulta.
+
+    El resumen de resultados del usuario (puntuaciones con todos sus decimales) se excluye:
+    la clave depende solo del tipo de recomendación y las arquitecturas cercanas, de los
+    demás mensajes (prompts, secciones de contexto e historial) y de la pregunta.
+
+    Args:
+        messages (list): Mensajes construidos con construir_mensajes
+        context (dict, optional): Contexto de la consulta (ver get_openai_response)
+
+    Returns:
+        str: Clave de caché
+    """
+    recomendacion = ((context or {}).get("resultados_encuesta") or {}).get("recomendacion")
+    estables = [
+        mensaje for mensaje in messages
+        if not (mensaje.get("role") == "system" and mensaje.get("content", "").lstrip().startswith(ENCABEZADO_RESULTADOS))
+    ]
+    return cache_respuestas.clave_mensajes(estables, OPENAI_MODEL, recomendacion)
+
+def _registrar_tiempo_primer_token(segundos):
+    """Acumula el tiempo hasta el primer token de una respuesta en streaming"""
+    with _lock_metricas:
+        _metricas_streaming["respuestas"] += 1
+        _metricas_streaming["ultimo_ttft"] = segundos
+        _metricas_streaming["suma_ttft"] += segundos
+        _metricas_streaming["max_ttft"] = max(_metricas_streaming["max_ttft"], segundos)
+
+def obtener_metricas_streaming():
+    """
+    Devuelve las métricas de tiempo hasta el primer token (TTFT) de las respuestas en streaming.
+    
+    Returns:
+        dict: Número de respuestas, último, medio y máximo TTFT en segundos de las
+            respuestas generadas por el modelo, y número de respuestas servidas desde la caché
+    """
+    with _lock_metricas:
+        metricas = dict(_metricas_streaming)
+    suma = metricas.pop("suma_ttft")
+    metricas["ttft_medio"] = suma / metricas["respuestas"] if metricas["respuestas"] else 0.0
+    return metricas
 
 def cargar_contexto_arquitectura(tipo_arquitectura):
     """
     Carga el contexto específico para un tipo de arquitectura desde un archivo JSON.
+    El archivo se lee de disco solo la primera vez o cuando cambia (ver utils.cache_archivos).
     
     Args:
         tipo_arquitectura (str): Tipo de arquitectura (microservicios, eventos, monolitico, hibrido)
@@ -158,33 +322,21 @@ def cargar_contexto_arquitectura(tipo_arquitectura):
     """
     try:
         # Mapear el tipo de arquitectura al nombre del archivo
-        archivos_contexto = {
-            "microservicios": "contexto_microservicios.json",
-            "eventos": "contexto_eventos.json",
-            "monolitico": "contexto_monolitico.json",
-            "hibrido": "contexto_hibrido.json"
-        }
-        
-        archivo = archivos_contexto.get(tipo_arquitectura)
+        archivo = ARCHIVOS_CONTEXTO.get(tipo_arquitectura)
         if not archivo:
             return None
         
         # Construir ruta al archivo de contexto (dentro de la carpeta data)
-        ruta_archivo = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-            "data",
-            archivo
-        )
+        ruta_archivo = os.path.join(DATA_DIR, archivo)
         
         # Verificar si el archivo existe
         if not os.path.exists(ruta_archivo):
             print(f"Archivo de contexto {ruta_archivo} no encontrado")
             return None
         
-        # Cargar el contenido del archivo
-        with open(ruta_archivo, 'r', encoding='utf-8') as f:
-            datos = json.load(f)
-            
+        # Cargar el contenido del archivo (desde la caché si no ha cambiado)
+        datos = cargar_json(ruta_archivo)
+        
         # El archivo debe contener un campo 'contexto' con el texto
         if 'contexto' in datos:
             return datos['contexto']
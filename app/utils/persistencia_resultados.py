@@ -0,0 +1,292 @@
+"""
+Persistencia de los resultados de las encuestas.
+Cada encuesta finalizada se añade como un registro JSONL a RESULTADOS_FILE. La escritura
+la hace un hilo en segundo plano que agrupa los registros y hace fsync cada
+RESULTADOS_INTERVALO_FSYNC segundos, de modo que la página nunca espera al disco.
+
+Cuando el archivo activo supera RESULTADOS_MAX_BYTES se rota a un segmento con marca de
+tiempo (resultados.<fecha>.jsonl). Si se acumulan más de RESULTADOS_MAX_SEGMENTOS
+segmentos, se compactan en un único segmento comprimido (.jsonl.gz) sin líneas dañadas
+ni registros duplicados.
+"""
+import atexit
+import glob
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from config import (
+    RESULTADOS_FILE,
+    RESULTADOS_INTERVALO_FSYNC,
+    RESULTADOS_MAX_LOTE,
+    RESULTADOS_MAX_BYTES,
+    RESULTADOS_MAX_SEGMENTOS,
+)
+from context.arquitectura_data import BANCO_PREGUNTAS
+
+_escritor = None
+_lock_escritor = threading.Lock()
+
+
+def crear_registro(respuestas, resultados, sesion=None):
+    """
+    Construye el registro que se guarda de una encuesta.
+
+    Args:
+        respuestas (dict): Respuestas de la encuesta (id de pregunta -> dict con 'valor')
+        resultados (dict): Resultados devueltos por procesar_respuestas
+        sesion (dict, optional): Métricas de la sesión en la que se completó la encuesta
+
+    Returns:
+        dict: Registro con identificador, fecha, banco de preguntas ("<banco>@v<versión>"),
+            valores respondidos y resultados
+    """
+    registro = {
+        "id": uuid.uuid4().hex,
+        "fecha": datetime.now(timezone.utc).isoformat(),
+        # Los ids de las respuestas son locales al banco: sin él no se pueden comparar entre versiones
+        "banco": BANCO_PREGUNTAS.identificador,
+        # Las respuestas imputadas al terminar antes la encuesta adaptativa no se guardan
+        "respuestas": {
+            str(id_pregunta): respuesta["valor"] for id_pregunta, respuesta in respuestas.items()
+            if not respuesta.get("imputada")
+        },
+        "resultados": dict(resultados)
+    }
+    if sesion:
+        registro["sesion"] = sesion
+    return registro
+
+
+def segmentos(ruta=RESULTADOS_FILE):
+    """
+    Segmentos rotados o compactados del archivo de resultados, del más antiguo al más reciente.
+
+    Returns:
+        list: Rutas de los segmentos (sin incluir el archivo activo)
+    """
+    base, extension = os.path.splitext(ruta)
+    return sorted(glob.glob(f"{base}.*{extension}") + glob.glob(f"{base}.*{extension}.gz"))
+
+
+def _abrir(ruta):
+    if ruta.endswith(".gz"):
+        return gzip.open(ruta, "rt", encoding="utf-8")
+    return open(ruta, "r", encoding="utf-8")
+
+
+def leer_registros(ruta=RESULTADOS_FILE):
+    """
+    Recorre todos los registros guardados en orden cronológico.
+    Las líneas dañadas (p. ej. una escritura interrumpida) se ignoran.
+
+    Yields:
+        dict: Registros de encuestas
+    """
+    for archivo in segmentos(ruta) + ([ruta] if os.path.exists(ruta) else []):
+        try:
+            with _abrir(archivo) as f:
+                for linea in f:
+                    try:
+                        yield json.loads(linea)
+                    except ValueError:
+                        continue
+        except (OSError, EOFError):
+            continue
+
+
+class EscritorResultados:
+    """
+    Escritor en segundo plano del archivo de resultados.
+
+    Args:
+        ruta (str): Archivo JSONL activo
+        intervalo_fsync (float): Segundos máximos que un registro espera antes de llegar a disco
+        max_lote (int): Registros a partir de los cuales se escribe sin esperar al intervalo
+        max_bytes (int): Tamaño del archivo activo a partir del cual se rota
+        max_segmentos (int): Segmentos rotados a partir de los cuales se compactan
+        al_escribir (callable, optional): Función que recibe cada lote ya sincronizado en disco
+    """
+
+    def __init__(self, ruta=RESULTADOS_FILE, intervalo_fsync=RESULTADOS_INTERVALO_FSYNC,
+                 max_lote=RESULTADOS_MAX_LOTE, max_bytes=RESULTADOS_MAX_BYTES,
+                 max_segmentos=RESULTADOS_MAX_SEGMENTOS, al_escribir=None):
+        self.ruta = ruta
+        self.al_escribir = al_escribir
+        self.intervalo_fsync = intervalo_fsync
+        self.max_lote = max_lote
+        self.max_bytes = max_bytes
+        self.max_segmentos = max_segmentos
+        self._cola = queue.Queue()
+        # Las sesiones encolan desde sus propios hilos y el escritor actualiza el resto de contadores
+        self._metricas = {"encolados": 0, "escritos": 0, "lotes": 0, "rotaciones": 0, "compactaciones": 0, "errores": 0}
+        self._lock_metricas = threading.Lock()
+        self._hilo = threading.Thread(target=self._ejecutar, name="escritor-resultados", daemon=True)
+        self._hilo.start()
+
+    def registrar(self, registro):
+        """Encola un registro para escribirlo; nunca bloquea"""
+        self._contar(encolados=1)
+        self._cola.put(registro)
+
+    def _contar(self, **incrementos):
+        with self._lock_metricas:
+            for nombre, incremento in incrementos.items():
+                self._metricas[nombre] += incremento
+
+    def vaciar(self, timeout=None):
+        """
+        Espera a que todos los registros encolados estén escritos y sincronizados en disco.
+
+        Returns:
+            bool: True si se vació la cola antes del timeout
+        """
+        listo = threading.Event()
+        self._cola.put(listo)
+        return listo.wait(timeout)
+
+    def _ejecutar(self):
+        lote = []
+        eventos = []
+        limite = None
+        while True:
+            espera = None if limite is None else max(0.0, limite - time.monotonic())
+            try:
+                elemento = self._cola.get(timeout=espera)
+                if isinstance(elemento, threading.Event):
+                    eventos.append(elemento)
+                else:
+                    lote.append(elemento)
+                    if limite is None:
+                        limite = time.monotonic() + self.intervalo_fsync
+            except queue.Empty:
+                pass
+
+            if lote and (eventos or len(lote) >= self.max_lote or time.monotonic() >= limite):
+                self._escribir(lote)
+                lote = []
+                limite = None
+            for evento in eventos:
+                evento.set()
+            eventos = []
+
+    def _escribir(self, lote):
+        try:
+            directorio = os.path.dirname(self.ruta)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            datos = "".join(json.dumps(registro, ensure_ascii=False) + "\n" for registro in lote)
+            with open(self.ruta, "a", encoding="utf-8") as f:
+                f.write(datos)
+                f.flush()
+                os.fsync(f.fileno())
+                tamano = f.tell()
+            self._contar(escritos=len(lote), lotes=1)
+        except Exception as e:
+            self._contar(errores=1)
+            print(f"Error al guardar los resultados de la encuesta: {e}")
+            return
+
+        if self.al_escribir is not None:
+            try:
+                self.al_escribir(lote)
+            except Exception as e:
+                print(f"Error al actualizar las estadísticas de las encuestas: {e}")
+
+        if tamano >= self.max_bytes:
+            try:
+                self.rotar()
+            except Exception as e:
+                self._contar(errores=1)
+                print(f"Error al rotar el archivo de resultados: {e}")
+
+    def rotar(self):
+        """Convierte el archivo activo en un segmento y compacta si hay demasiados"""
+        if not os.path.exists(self.ruta):
+            return
+        base, extension = os.path.splitext(self.ruta)
+        marca = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        os.replace(self.ruta, f"{base}.{marca}{extension}")
+        self._contar(rotaciones=1)
+        if len(segmentos(self.ruta)) > self.max_segmentos:
+            self.compactar()
+
+    def compactar(self):
+        """
+        Une todos los segmentos en uno comprimido, descartando líneas dañadas y duplicados.
+        El segmento resultante conserva la marca de tiempo del más reciente.
+        """
+        existentes = segmentos(self.ruta)
+        if len(existentes) < 2:
+            return
+        destino = existentes[-1] if existentes[-1].endswith(".gz") else f"{existentes[-1]}.gz"
+        vistos = set()
+        with gzip.open(f"{destino}.tmp", "wt", encoding="utf-8") as salida:
+            for archivo in existentes:
+                with _abrir(archivo) as f:
+                    for linea in f:
+                        try:
+                            registro = json.loads(linea)
+                        except ValueError:
+                            continue
+                        if registro.get("id") in vistos:
+                            continue
+                        vistos.add(registro.get("id"))
+                        salida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        os.replace(f"{destino}.tmp", destino)
+        for archivo in existentes:
+            if archivo != destino:
+                os.remove(archivo)
+        self._contar(compactaciones=1)
+
+    def metricas(self):
+        """
+        Devuelve los contadores del escritor.
+
+        Returns:
+            dict: Registros encolados, escritos, pendientes, lotes, rotaciones, compactaciones y errores
+        """
+        with self._lock_metricas:
+            metricas = dict(self._metricas)
+        metricas["pendientes"] = metricas["encolados"] - metricas["escritos"]
+        return metricas
+
+
+def obtener_escritor():
+    """
+    Devuelve el escritor compartido del proceso, creándolo la primera vez.
+    Cada lote escrito actualiza las estadísticas agregadas (ver utils.estadisticas_agregadas).
+    Al terminar el proceso se escriben los registros pendientes.
+
+    Returns:
+        EscritorResultados: Escritor compartido
+    """
+    global _escritor
+    if _escritor is None:
+        with _lock_escritor:
+            if _escritor is None:
+                from utils.estadisticas_agregadas import obtener_estadisticas
+                _escritor = EscritorResultados(al_escribir=obtener_estadisticas().actualizar_lote)
+                atexit.register(_escritor.vaciar, 5.0)
+    return _escritor
+
+
+def guardar_resultado(respuestas, resultados, sesion=None):
+    """
+    Guarda en segundo plano el resultado de una encuesta finalizada.
+
+    Args:
+        respuestas (dict): Respuestas de la encuesta
+        resultados (dict): Resultados devueltos por procesar_respuestas
+        sesion (dict, optional): Métricas de la sesión (ver crear_registro)
+
+    Returns:
+        dict: Registro encolado
+    """
+    registro = crear_registro(respuestas, resultados, sesion)
+    obtener_escritor().registrar(registro)
+    return registro
@@ -0,0 +1,189 @@
+"""
+Ensamblado de prompts con presupuesto de tokens.
+Cuenta los tokens de cada mensaje y recorta el historial de chat para que cada petición
+a OpenAI quede por debajo de un máximo configurable: se conservan siempre los mensajes
+de sistema y la pregunta actual, se añaden los turnos más recientes que quepan y los
+turnos más antiguos se resumen en un único mensaje de sistema. Si los mensajes de sistema
+por sí solos no caben, como último recurso se recortan los de contexto, empezando por el último.
+"""
+import math
+
+try:
+    import tiktoken
+except ImportError:  # Dependencia opcional: sin ella se usa una estimación por caracteres
+    tiktoken = None
+
+# Tokens adicionales que la API añade por cada mensaje (rol y separadores)
+TOKENS_POR_MENSAJE = 4
+
+# Caracteres por token en la estimación sin tiktoken (conservadora para texto en español)
+CARACTERES_POR_TOKEN = 3.5
+
+# Longitud máxima de cada turno dentro del resumen del historial antiguo
+CARACTERES_RESUMEN_TURNO = 160
+
+# Fracción del presupuesto reservada para el resumen cuando el historial no cabe completo
+PROPORCION_RESUMEN = 0.15
+
+_codificador = None
+
+
+def contar_tokens(texto):
+    """
+    Cuenta (o estima) los tokens de un texto.
+
+    Args:
+        texto (str): Texto a contar
+
+    Returns:
+        int: Número de tokens
+    """
+    global _codificador
+    if not texto:
+        return 0
+    if tiktoken is not None:
+        if _codificador is None:
+            _codificador = tiktoken.get_encoding("cl100k_base")
+        return len(_codificador.encode(texto))
+    return math.ceil(len(texto) / CARACTERES_POR_TOKEN)
+
+
+def tokens_mensaje(mensaje):
+    """Tokens que ocupa un mensaje de chat incluyendo la sobrecarga por mensaje"""
+    return contar_tokens(mensaje.get("content", "")) + TOKENS_POR_MENSAJE
+
+
+def ajustar_a_presupuesto(mensajes_sistema, historial, mensaje_usuario, max_tokens):
+    """
+    Construye la lista de mensajes respetando un máximo de tokens.
+
+    Args:
+        mensajes_sistema (list): Mensajes de sistema (siempre se incluyen, en orden)
+        historial (list): Turnos previos de la conversación, del más antiguo al más reciente
+        mensaje_usuario (dict): Mensaje actual del usuario (siempre se incluye)
+        max_tokens (int): Máximo de tokens del prompt completo
+
+    Returns:
+        list: Mensajes de sistema, resumen del historial antiguo (si lo hay),
+            turnos recientes y mensaje del usuario
+    """
+    mensajes_sistema = recortar_mensajes_sistema(mensajes_sistema, max_tokens - tokens_mensaje(mensaje_usuario))
+    disponibles = max_tokens - sum(tokens_mensaje(m) for m in mensajes_sistema) - tokens_mensaje(mensaje_usuario)
+    mensajes = list(mensajes_sistema)
+
+    # Si todo el historial cabe no hace falta resumir
+    if sum(tokens_mensaje(m) for m in historial) <= disponibles:
+        return mensajes + list(historial) + [mensaje_usuario]
+
+    # Reservar una parte del presupuesto para el resumen de los turnos antiguos
+    reserva_resumen = max(0, min(int(max_tokens * PROPORCION_RESUMEN), disponibles))
+    disponibles -= reserva_resumen
+
+    # Añadir turnos desde el más reciente mientras quepan
+    recientes = []
+    for mensaje in reversed(historial):
+        coste = tokens_mensaje(mensaje)
+        if coste > disponibles:
+            break
+        recientes.append(mensaje)
+        disponibles -= coste
+    recientes.reverse()
+    antiguos = historial[:len(historial) - len(recientes)]
+
+    resumen = resumir_historial(antiguos, reserva_resumen + disponibles)
+    if resumen is not None:
+        mensajes.append(resumen)
+    return mensajes + recientes + [mensaje_usuario]
+
+
+def recortar_mensajes_sistema(mensajes_sistema, max_tokens):
+    """
+    Recorta los mensajes de sistema para que quepan en max_tokens.
+
+    El primero (las instrucciones del asistente) se conserva; los demás (resultados de la
+    encuesta y contexto recuperado) se acortan o eliminan empezando por el último. Si ni
+    siquiera las instrucciones caben, se avisa y se recortan también.
+
+    Args:
+        mensajes_sistema (list): Mensajes de sistema en orden
+        max_tokens (int): Máximo de tokens para el conjunto de mensajes de sistema
+
+    Returns:
+        list: Mensajes de sistema (los recortados son copias)
+    """
+    mensajes = list(mensajes_sistema)
+    exceso = sum(tokens_mensaje(m) for m in mensajes) - max_tokens
+    if exceso <= 0:
+        return mensajes
+
+    print(f"Aviso: los mensajes de sistema superan el presupuesto en {exceso} tokens; se recorta el contexto")
+    for indice in range(len(mensajes) - 1, -1, -1):
+        if exceso <= 0:
+            break
+        if indice == 0:
+            break
+        mensaje = mensajes[indice]
+        coste = tokens_mensaje(mensaje)
+        if coste - TOKENS_POR_MENSAJE > exceso:
+            mensajes[indice] = {**mensaje, "content": _recortar_texto(mensaje.get("content", ""), coste - TOKENS_POR_MENSAJE - exceso)}
+            exceso -= coste - tokens_mensaje(mensajes[indice])
+        else:
+            mensajes[indice] = None
+            exceso -= coste
+    mensajes = [m for m in mensajes if m is not None]
+
+    if exceso > 0:
+        print(f"Aviso: las instrucciones del asistente no caben en el presupuesto; se recortan ({exceso} tokens de más)")
+        coste = tokens_mensaje(mensajes[0])
+        mensajes[0] = {**mensajes[0], "content": _recortar_texto(mensajes[0].get("content", ""), max(0, coste - TOKENS_POR_MENSAJE - exceso))}
+    return mensajes
+
+
+def _recortar_texto(texto, max_tokens):
+    """Prefijo más largo del texto (terminado en "…") que ocupa como mucho max_tokens"""
+    if contar_tokens(texto) <= max_tokens:
+        return texto
+    inferior, superior = 0, len(texto)
+    while inferior < superior:
+        medio = (inferior + superior + 1) // 2
+        if contar_tokens(texto[:medio] + "…") <= max_tokens:
+            inferior = medio
+        else:
+            superior = medio - 1
+    return texto[:inferior] + "…" if inferior else ""
+
+
+def resumir_historial(turnos, max_tokens):
+    """
+    Resume de forma extractiva los turnos antiguos de la conversación.
+
+    Cada turno se abrevia a su comienzo; si el resumen no cabe en max_tokens se
+    conservan los turnos más recientes.
+
+    Args:
+        turnos (list): Mensajes que no caben en el presupuesto
+        max_tokens (int): Máximo de tokens del mensaje de resumen
+
+    Returns:
+        dict: Mensaje de sistema con el resumen, o None si no hay turnos o no cabe ninguno
+    """
+    encabezado = "Resumen de la conversación anterior (turnos antiguos abreviados):"
+    restantes = max_tokens - TOKENS_POR_MENSAJE - contar_tokens(encabezado)
+
+    lineas = []
+    for turno in reversed(turnos):
+        autor = "Usuario" if turno.get("role") == "user" else "Asistente"
+        texto = " ".join(turno.get("content", "").split())
+        if len(texto) > CARACTERES_RESUMEN_TURNO:
+            texto = texto[:CARACTERES_RESUMEN_TURNO].rsplit(" ", 1)[0] + "…"
+        linea = f"- {autor}: {texto}"
+        coste = contar_tokens(linea) + 1
+        if coste > restantes:
+            break
+        lineas.append(linea)
+        restantes -= coste
+
+    if not lineas:
+        return None
+    lineas.reverse()
+    return {"role": "system", "content": encabezado + "\n" + "\n".join(lineas)}
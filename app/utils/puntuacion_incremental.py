@@ -0,0 +1,126 @@
+"""
+Acumulador incremental de puntuaciones para la vista previa de la encuesta.
+Mantiene la suma ponderada y el número de respuestas de cada categoría; cambiar una
+respuesta resta su valor ponderado anterior y suma el nuevo, así que cada actualización
+y el cálculo de las cuatro puntuaciones globales son O(1), sin reevaluar la encuesta.
+Con el motor difuso, los promedios por categoría se puntúan con puntuar_difuso, igual que
+al procesar la encuesta completa.
+"""
+from config import MOTOR_PUNTUACION
+from utils.modelo_evaluacion import MODELO, ARQUITECTURAS
+from utils.inferencia_difusa import puntuar_difuso
+
+# Actualizaciones tras las que las sumas se recalculan desde cero para no acumular error de redondeo
+RESINCRONIZAR_CADA = 256
+
+
+class AcumuladorPuntuaciones:
+    """
+    Puntuaciones de una encuesta en curso, actualizadas respuesta a respuesta.
+
+    Args:
+        modelo (ModeloEvaluacion, optional): Modelo con los pesos y la proyección
+    """
+
+    __slots__ = ("modelo", "valores", "sumas", "conteos", "actualizaciones")
+
+    def __init__(self, modelo=MODELO):
+        self.modelo = modelo
+        self.valores = {}  # Columna de la pregunta en el modelo -> valor
+        self.sumas = [0.0] * len(modelo.categorias)
+        self.conteos = [0] * len(modelo.categorias)
+        self.actualizaciones = 0
+
+    @classmethod
+    def desde_respuestas(cls, respuestas, modelo=MODELO):
+        """
+        Crea un acumulador con las respuestas ya dadas.
+
+        Args:
+            respuestas (dict): Respuestas de la encuesta (id de pregunta -> dict con 'valor')
+            modelo (ModeloEvaluacion, optional): Modelo con los pesos y la proyección
+
+        Returns:
+            AcumuladorPuntuaciones: Acumulador sincronizado con las respuestas
+        """
+        acumulador = cls(modelo)
+        for id_pregunta, respuesta in respuestas.items():
+            acumulador.actualizar(id_pregunta, respuesta["valor"])
+        return acumulador
+
+    def actualizar(self, id_pregunta, valor):
+        """
+        Registra (o cambia) la respuesta a una pregunta.
+
+        Args:
+            id_pregunta: Id de la pregunta (o clave cualificada del banco)
+            valor (float): Nuevo valor de la respuesta
+
+        Returns:
+            bool: True si la respuesta ha cambiado
+        """
+        columna = self.modelo.columna(id_pregunta)
+        anterior = self.valores.get(columna)
+        if anterior == valor:
+            return False
+
+        categoria = self.modelo.indice_categoria[columna]
+        peso = self.modelo.pesos[columna]
+        if anterior is None:
+            self.conteos[categoria] += 1
+        else:
+            self.sumas[categoria] -= peso * anterior
+        self.sumas[categoria] += peso * valor
+        self.valores[columna] = valor
+
+        self.actualizaciones += 1
+        if self.actualizaciones % RESINCRONIZAR_CADA == 0:
+            self._resincronizar()
+        return True
+
+    def quitar(self, id_pregunta):
+        """Elimina la respuesta a una pregunta, si la había"""
+        columna = self.modelo.columna(id_pregunta)
+        anterior = self.valores.pop(columna, None)
+        if anterior is None:
+            return
+        categoria = self.modelo.indice_categoria[columna]
+        self.sumas[categoria] -= self.modelo.pesos[columna] * anterior
+        self.conteos[categoria] -= 1
+
+    def _resincronizar(self):
+        sumas = [0.0] * len(self.sumas)
+        for columna, valor in self.valores.items():
+            sumas[self.modelo.indice_categoria[columna]] += self.modelo.pesos[columna] * valor
+        self.sumas = sumas
+
+    def promedios(self):
+        """Promedio ponderado de cada categoría (0 si no tiene respuestas)"""
+        return [suma / conteo if conteo else 0.0 for suma, conteo in zip(self.sumas, self.conteos)]
+
+    def puntuaciones(self, motor=MOTOR_PUNTUACION):
+        """
+        Puntuaciones globales con las respuestas actuales.
+
+        Args:
+            motor (str, optional): Motor de puntuación ("lineal" o "difuso")
+
+        Returns:
+            dict: Puntuación de cada arquitectura
+        """
+        promedios = self.promedios()
+        if motor == "difuso":
+            difusas = puntuar_difuso([promedios])[0]
+            return {arquitectura: float(difusas[k]) for k, arquitectura in enumerate(ARQUITECTURAS)}
+        proyeccion = self.modelo.proyeccion
+        return {
+            arquitectura: float(self.modelo.desplazamiento[k] + sum(
+                promedios[c] * proyeccion[c, k] for c in range(len(promedios))
+            ))
+            for k, arquitectura in enumerate(ARQUITECTURAS)
+        }
+
+    @property
+    def respondidas(self):
+        """Número de preguntas respondidas"""
+        return len(self.valores)
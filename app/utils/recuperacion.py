@@ -0,0 +1,288 @@
+"""
+Recuperación de secciones de los documentos de contexto de arquitecturas.
+Los textos markdown de data/contexto_*.json se dividen en secciones por encabezado y se
+indexan una sola vez con BM25. Para cada pregunta del chat se envían a OpenAI solo las
+secciones más relevantes de las arquitecturas recomendadas, en lugar de los documentos
+completos. El índice se reconstruye automáticamente si cambia algún archivo de contexto.
+"""
+import math
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter
+from config import DATA_DIR, ARCHIVOS_CONTEXTO, INDICE_VECTORIAL_ACTIVO
+
+# Parámetros estándar de BM25
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Constante de la fusión por rango recíproco entre el ranking léxico y el vectorial
+CONSTANTE_FUSION = 60
+
+# Veces que cuenta el título de una sección respecto a su cuerpo
+PESO_TITULO = 2
+
+# Palabras vacías que no aportan a la relevancia
+PALABRAS_VACIAS = set("""
+a al algo algun alguna algunas alguno algunos ante antes como con contra cual cuales cuando
+de del desde donde durante e el ella ellas ellos en entre era es esa esas ese eso esos esta
+estas este esto estos fue ha hay la las le les lo los mas me mi mis mucho muy no nos o otra
+otras otro otros para pero poco por porque puede pueden que quien se sea ser si sin sobre
+son su sus tambien te tiene tienen tu un una unas uno unos y ya yo debo deberia hacer hago
+""".split())
+
+_indice = None
+_firma_indice = None
+_lock_indice = threading.Lock()
+
+
+def normalizar_termino(palabra):
+    """Reduce una palabra a su forma de indexación (sin tildes y sin plural simple)"""
+    palabra = unicodedata.normalize("NFKD", palabra.lower())
+    palabra = "".join(c for c in palabra if not unicodedata.combining(c))
+    if len(palabra) > 4 and palabra.endswith("es"):
+        return palabra[:-2]
+    if len(palabra) > 3 and palabra.endswith("s"):
+        return palabra[:-1]
+    return palabra
+
+
+def tokenizar(texto):
+    """
+    Divide un texto en términos normalizados, descartando palabras vacías.
+
+    Args:
+        texto (str): Texto a tokenizar
+
+    Returns:
+        list: Términos del texto en orden
+    """
+    terminos = []
+    for palabra in re.findall(r"\w+", texto or ""):
+        termino = normalizar_termino(palabra)
+        if len(termino) > 1 and termino not in PALABRAS_VACIAS and not termino.isdigit():
+            terminos.append(termino)
+    return terminos
+
+
+def dividir_en_secciones(texto, arquitectura, titulo=None):
+    """
+    Divide un documento markdown en secciones por encabezado.
+
+    El encabezado principal (#) da el título del documento; cada encabezado de nivel
+    inferior (##, ###) abre una sección nueva. El texto previo al primer subencabezado
+    forma la sección de introducción.
+
+    Args:
+        texto (str): Documento markdown
+        arquitectura (str): Tipo de arquitectura al que pertenece el documento (None si es general)
+        titulo (str, optional): Título del documento si no tiene encabezado principal
+
+    Returns:
+        list: Secciones como diccionarios con arquitectura, orden, título y texto
+    """
+    titulo_documento = titulo or arquitectura
+    secciones = []
+    titulo_actual = None
+    lineas_actuales = []
+
+    def cerrar_seccion():
+        cuerpo = "\n".join(lineas_actuales).strip()
+        if cuerpo:
+            titulo = f"{titulo_documento} › {titulo_actual}" if titulo_actual else titulo_documento
+            secciones.append({
+                "arquitectura": arquitectura,
+                "orden": len(secciones),
+                "titulo": titulo,
+                "texto": cuerpo
+            })
+
+    for linea in texto.splitlines():
+        encabezado = re.match(r"^(#{1,6})\s+(.*)$", linea)
+        if encabezado and len(encabezado.group(1)) == 1 and not secciones and not lineas_actuales:
+            titulo_documento = encabezado.group(2).strip()
+        elif encabezado:
+            cerrar_seccion()
+            titulo_actual = encabezado.group(2).strip()
+            lineas_actuales = []
+        else:
+            lineas_actuales.append(linea)
+    cerrar_seccion()
+    return secciones
+
+
+class IndiceBM25:
+    """
+    Índice léxico BM25 sobre secciones de documentos.
+
+    Args:
+        secciones (list): Secciones devueltas por dividir_en_secciones
+        k1 (float): Saturación de la frecuencia de términos
+        b (float): Normalización por longitud de la sección
+    """
+
+    def __init__(self, secciones, k1=BM25_K1, b=BM25_B):
+        self.secciones = secciones
+        self.k1 = k1
+        self.b = b
+        self.frecuencias = []
+        self.longitudes = []
+        documentos_por_termino = Counter()
+        for seccion in secciones:
+            terminos = tokenizar(seccion["titulo"]) * PESO_TITULO + tokenizar(seccion["texto"])
+            frecuencias = Counter(terminos)
+            self.frecuencias.append(frecuencias)
+            self.longitudes.append(len(terminos))
+            documentos_por_termino.update(frecuencias.keys())
+
+        n = len(secciones)
+        self.longitud_media = sum(self.longitudes) / n if n else 0.0
+        self.idf = {
+            termino: math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for termino, df in documentos_por_termino.items()
+        }
+
+    def puntuar(self, consulta, indice_seccion):
+        """Puntuación BM25 de una sección para una lista de términos de consulta"""
+        frecuencias = self.frecuencias[indice_seccion]
+        normalizacion = self.k1 * (1 - self.b + self.b * self.longitudes[indice_seccion] / (self.longitud_media or 1))
+        puntuacion = 0.0
+        for termino in consulta:
+            tf = frecuencias.get(termino)
+            if tf:
+                puntuacion += self.idf[termino] * tf * (self.k1 + 1) / (tf + normalizacion)
+        return puntuacion
+
+    def buscar(self, consulta, k, arquitecturas=None, completar=True):
+        """
+        Devuelve las k secciones más relevantes para una consulta.
+
+        Args:
+            consulta (str): Texto de la consulta
+            k (int): Número máximo de secciones
+            arquitecturas (list, optional): Limitar la búsqueda a estas arquitecturas; el
+                orden de la lista desempata a favor de las primeras
+            completar (bool): Si hay menos de k secciones con coincidencias, completar con
+                las introducciones de las arquitecturas (puntuación 0)
+
+        Returns:
+            list: Tuplas (puntuación, sección) de mayor a menor relevancia
+        """
+        terminos = list(dict.fromkeys(tokenizar(consulta)))
+        prioridad = {arq: i for i, arq in enumerate(arquitecturas)} if arquitecturas else None
+
+        candidatas = []
+        for i, seccion in enumerate(self.secciones):
+            if prioridad is not None and seccion["arquitectura"] not in prioridad:
+                continue
+            puntuacion = self.puntuar(terminos, i)
+            if puntuacion > 0:
+                orden = (prioridad[seccion["arquitectura"]] if prioridad else 0, seccion["orden"])
+                candidatas.append((-puntuacion, orden, i))
+        candidatas.sort()
+        resultado = [(-puntuacion, self.secciones[i]) for puntuacion, _, i in candidatas[:k]]
+        if completar:
+            self.completar(resultado, k, arquitecturas)
+        return resultado
+
+    def completar(self, resultado, k, arquitecturas):
+        """Añade a resultado la introducción de cada arquitectura (en orden) hasta tener k secciones"""
+        elegidas = {clave_seccion(seccion) for _, seccion in resultado}
+        for arquitectura in (arquitecturas or []):
+            if len(resultado) >= k:
+                break
+            introduccion = next((s for s in self.secciones if s["arquitectura"] == arquitectura), None)
+            if introduccion is not None and clave_seccion(introduccion) not in elegidas:
+                resultado.append((0.0, introduccion))
+                elegidas.add(clave_seccion(introduccion))
+        return resultado
+
+
+def clave_seccion(seccion):
+    """Identificador de una sección común al índice léxico y al vectorial"""
+    return seccion["arquitectura"], seccion["titulo"]
+
+
+def _rutas_contexto():
+    return {arquitectura: os.path.join(DATA_DIR, archivo) for arquitectura, archivo in ARCHIVOS_CONTEXTO.items()}
+
+
+def obtener_indice():
+    """
+    Devuelve el índice de secciones, construyéndolo la primera vez o si cambian los archivos.
+
+    Returns:
+        IndiceBM25: Índice compartido del proceso
+    """
+    global _indice, _firma_indice
+    from utils.cache_archivos import cargar_json
+
+    rutas = _rutas_contexto()
+    firma = tuple(
+        (ruta, os.stat(ruta).st_mtime_ns) if os.path.exists(ruta) else (ruta, None)
+        for ruta in rutas.values()
+    )
+    with _lock_indice:
+        if _indice is None or firma != _firma_indice:
+            secciones = []
+            for arquitectura, ruta in rutas.items():
+                if not os.path.exists(ruta):
+                    continue
+                texto = cargar_json(ruta).get("contexto", "")
+                secciones.extend(dividir_en_secciones(texto, arquitectura))
+            _indice = IndiceBM25(secciones)
+            _firma_indice = firma
+        return _indice
+
+
+def secciones_relevantes(consulta, arquitecturas, k):
+    """
+    Selecciona las secciones de contexto más relevantes para una pregunta.
+
+    Si existe el índice vectorial (ver utils.indice_vectorial), su ranking se combina con
+    el de BM25 mediante fusión por rango recíproco; si no, se usa solo BM25.
+
+    Args:
+        consulta (str): Pregunta del usuario
+        arquitecturas (list): Arquitecturas cuyo contexto se puede usar, la principal primero
+        k (int): Número máximo de secciones
+
+    Returns:
+        list: Secciones elegidas, de mayor a menor relevancia
+    """
+    indice = obtener_indice()
+    vectoriales = []
+    if INDICE_VECTORIAL_ACTIVO:
+        from utils import indice_vectorial
+        vectoriales = indice_vectorial.buscar(consulta, 2 * k, arquitecturas)
+    if not vectoriales:
+        return [seccion for _, seccion in indice.buscar(consulta, k, arquitecturas)]
+
+    lexicas = indice.buscar(consulta, 2 * k, arquitecturas, completar=False)
+    fusion = {}
+    for ranking in ([seccion for _, seccion in lexicas], [seccion for _, seccion in vectoriales]):
+        for posicion, seccion in enumerate(ranking):
+            clave = clave_seccion(seccion)
+            puntuacion, _ = fusion.get(clave, (0.0, seccion))
+            fusion[clave] = (puntuacion + 1.0 / (CONSTANTE_FUSION + posicion + 1), seccion)
+
+    # sorted es estable: a igual puntuación se mantiene el orden de aparición (BM25 primero)
+    ordenadas = sorted(fusion.values(), key=lambda par: -par[0])[:k]
+    return [seccion for _, seccion in indice.completar(ordenadas, k, arquitecturas)]
+
+
+def formatear_secciones(secciones):
+    """
+    Convierte las secciones elegidas en el texto de un mensaje de sistema.
+
+    Args:
+        secciones (list): Secciones devueltas por secciones_relevantes
+
+    Returns:
+        str: Texto del mensaje, o None si no hay secciones
+    """
+    if not secciones:
+        return None
+    bloques = [f"### {seccion['titulo']}\n{seccion['texto']}" for seccion in secciones]
+    return "Documentación de referencia relevante para la pregunta del usuario:\n\n" + "\n\n".join(bloques)
@@ -0,0 +1,134 @@
+"""
+Análisis de sensibilidad de la recomendación respecto a cada respuesta.
+Las puntuaciones globales son lineales en las respuestas (con el conjunto de preguntas
+respondidas fijo), así que la derivada de cada puntuación respecto a cada respuesta es
+constante (ModeloEvaluacion.jacobiano). Variando una sola respuesta, la arquitectura
+ganadora y el tipo de recomendación solo pueden cambiar en los puntos donde dos
+puntuaciones se igualan o su diferencia cruza UMBRAL_CERCANIA; esos puntos de corte se
+calculan de forma cerrada y se evalúan todos en un único lote.
+"""
+import numpy as np
+from config import UMBRAL_CERCANIA
+from utils.modelo_evaluacion import MODELO, ARQUITECTURAS
+
+# Distancia con la que se evalúa la recomendación justo después de cada punto de corte
+EPSILON_CORTE = 1e-9
+
+# Pares de arquitecturas cuyas diferencias de puntuación generan puntos de corte
+_PARES = [(a, b) for a in range(len(ARQUITECTURAS)) for b in range(a + 1, len(ARQUITECTURAS))]
+
+
+def analizar_sensibilidad(respuestas):
+    """
+    Calcula, para cada pregunta respondida, cuánto influye en las puntuaciones globales y
+    el cambio mínimo de su respuesta que alteraría el resultado.
+
+    Args:
+        respuestas (dict): Respuestas de la encuesta (ver ModeloEvaluacion.vector_respuestas)
+
+    Returns:
+        dict: "ganadora" y "recomendacion" actuales, y "preguntas": lista (en el orden del
+            cuestionario, sin las preguntas con valor imputado) de diccionarios con id, texto, valor, derivadas (por arquitectura),
+            cambio_ganadora / nueva_ganadora (cambio mínimo con signo de la respuesta que
+            cambia la arquitectura de mayor puntuación, o None si ningún valor en [0, 1] la
+            cambia), cambio_recomendacion / nueva_recomendacion (idem para el tipo final) e
+            invertir_cambia (si responder lo contrario, 1 - valor, cambia la recomendación)
+    """
+    vector = MODELO.vector_respuestas(respuestas)
+    # Los valores imputados cuentan en las puntuaciones, pero no son respuestas que analizar
+    respondidas = ~np.isnan(vector) & ~MODELO.mascara_imputadas(respuestas)
+    jacobiano = MODELO.jacobiano(vector)
+    puntuaciones = MODELO.evaluar(vector[None, :])["puntuaciones"][0]
+    indice_maximo, _, indice_recomendacion = MODELO.recomendar(puntuaciones[None, :])
+    ganadora, recomendacion = int(indice_maximo[0]), int(indice_recomendacion[0])
+    valores = np.nan_to_num(vector)
+
+    # Puntos de corte: t tal que (s_a - s_b) + (J_a - J_b)(t - x) = c, con c en {0, ±umbral}
+    a, b = np.array(_PARES).T
+    diferencias = puntuaciones[a] - puntuaciones[b]
+    pendientes = jacobiano[:, a] - jacobiano[:, b]
+    niveles = np.array([0.0, UMBRAL_CERCANIA, -UMBRAL_CERCANIA])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cortes = valores[:, None, None] + (niveles[None, None, :] - diferencias[None, :, None]) / pendientes[:, :, None]
+    cortes = cortes.reshape(len(vector), -1)
+
+    # Evaluar justo después de cada corte (alejándose de la respuesta actual) y en los extremos
+    direccion = np.sign(cortes - valores[:, None])
+    candidatos = np.concatenate([
+        np.clip(cortes + direccion * EPSILON_CORTE, 0.0, 1.0),
+        np.zeros((len(vector), 1)),
+        np.ones((len(vector), 1)),
+        1.0 - valores[:, None]
+    ], axis=1)
+    validos = np.isfinite(candidatos) & respondidas[:, None]
+    validos[:, :cortes.shape[1]] &= (cortes >= 0.0) & (cortes <= 1.0)
+    candidatos = np.where(validos, candidatos, valores[:, None])
+
+    desplazamientos = candidatos - valores[:, None]
+    simuladas = puntuaciones + jacobiano[:, None, :] * desplazamientos[:, :, None]
+    nuevo_maximo, _, nueva_recomendacion = MODELO.recomendar(simuladas.reshape(-1, len(ARQUITECTURAS)))
+    nuevo_maximo = nuevo_maximo.reshape(candidatos.shape)
+    nueva_recomendacion = nueva_recomendacion.reshape(candidatos.shape)
+
+    # El cambio reportado es la distancia al punto de corte (no al punto evaluado)
+    distancias = np.concatenate([cortes - valores[:, None], desplazamientos[:, cortes.shape[1]:]], axis=1)
+    distancias = np.where(validos, distancias, np.nan)
+
+    preguntas = []
+    for j in np.flatnonzero(respondidas):
+        cambio_ganadora, nueva_ganadora = _cambio_minimo(distancias[j], validos[j] & (nuevo_maximo[j] != ganadora), nuevo_maximo[j])
+        cambio_tipo, nuevo_tipo = _cambio_minimo(
+            distancias[j], validos[j] & (nueva_recomendacion[j] != recomendacion), nueva_recomendacion[j]
+        )
+        preguntas.append({
+            "id": MODELO.ids[j],
+            "texto": MODELO.textos[j],
+            "valor": float(vector[j]),
+            "derivadas": {arq: float(d) for arq, d in zip(ARQUITECTURAS, jacobiano[j])},
+            "cambio_ganadora": cambio_ganadora,
+            "nueva_ganadora": nueva_ganadora,
+            "cambio_recomendacion": cambio_tipo,
+            "nueva_recomendacion": nuevo_tipo,
+            "invertir_cambia": bool(nueva_recomendacion[j, -1] != recomendacion)
+        })
+
+    return {
+        "ganadora": ARQUITECTURAS[ganadora],
+        "recomendacion": ARQUITECTURAS[recomendacion],
+        "preguntas": preguntas
+    }
+
+
+def _cambio_minimo(distancias, cambia, indices):
+    """Menor distancia (con signo) entre los candidatos que cambian el resultado, y el nuevo resultado"""
+    if not cambia.any():
+        return None, None
+    posiciones = np.flatnonzero(cambia)
+    mejor = posiciones[np.argmin(np.abs(distancias[posiciones]))]
+    return float(distancias[mejor]), ARQUITECTURAS[int(indices[mejor])]
+
+
+def principales_factores(analisis, n=5):
+    """
+    Preguntas cuya respuesta está más cerca de cambiar la recomendación.
+
+    Se ordenan por el cambio mínimo que altera el tipo de recomendación; las que no pueden
+    cambiarla van al final, ordenadas por la influencia de la respuesta en la diferencia
+    entre la arquitectura ganadora y las demás.
+
+    Args:
+        analisis (dict): Resultado de analizar_sensibilidad
+        n (int): Número de preguntas
+
+    Returns:
+        list: Las n entradas de analisis["preguntas"] más influyentes
+    """
+    ganadora = analisis["ganadora"]
+
+    def clave(pregunta):
+        derivadas = pregunta["derivadas"]
+        influencia = max(abs(derivadas[ganadora] - d) for arq, d in derivadas.items() if arq != ganadora)
+        cambio = pregunta["cambio_recomendacion"]
+        return (cambio is None, abs(cambio) if cambio is not None else 0.0, -influencia)
+
+    return sorted(analisis["preguntas"], key=clave)[:n]
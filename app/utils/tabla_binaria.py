@@ -0,0 +1,218 @@
+"""
+Tabla precalculada de resultados para el modo de respuesta binario.
+En modo binario solo existen 2^N combinaciones de respuestas, así que las puntuaciones
+globales y la recomendación de todas ellas se calculan una vez y se guardan en un
+archivo .npy que se abre como memoria mapeada. Cada combinación se identifica por una
+máscara de bits: el bit j corresponde a la pregunta de la columna j del modelo (1 = Sí).
+Si el banco tiene más de TABLA_BINARIA_MAX_PREGUNTAS preguntas la tabla no se construye y
+los resultados se calculan con el modelo.
+
+Para construir la tabla (desde la carpeta app/):
+    python -m utils.tabla_binaria
+"""
+import os
+import numpy as np
+from config import DATA_DIR, TABLA_BINARIA_MAX_PREGUNTAS
+from utils.modelo_evaluacion import MODELO, ARQUITECTURAS
+
+# Registro de cada combinación: puntuaciones globales y recomendación codificada
+DTYPE_TABLA = np.dtype([
+    ("puntuaciones", "<f8", (len(ARQUITECTURAS),)),
+    ("indice_maximo", "u1"),
+    ("cercanas", "u1"),               # Máscara de bits sobre ARQUITECTURAS
+    ("indice_recomendacion", "u1")
+])
+
+# Número de combinaciones que se evalúan en cada bloque al construir la tabla
+TAMANO_BLOQUE = 1 << 15
+
+# Tabla cargada en memoria mapeada (se carga una vez por proceso)
+_tabla = None
+
+
+def ruta_tabla(modelo=MODELO):
+    """Ruta del archivo de la tabla; incluye la huella del modelo para no usar tablas obsoletas"""
+    return os.path.join(DATA_DIR, f"tabla_binaria_{modelo.huella()}.npy")
+
+
+def tabla_admitida(modelo=MODELO):
+    """Indica si el banco del modelo es lo bastante pequeño para precalcular su tabla"""
+    return len(modelo.ids) <= TABLA_BINARIA_MAX_PREGUNTAS
+
+
+def construir_tabla(ruta=None, modelo=MODELO):
+    """
+    Evalúa todas las combinaciones binarias de respuestas y guarda la tabla en disco.
+
+    Args:
+        ruta (str, optional): Ruta del archivo de salida (por defecto ruta_tabla())
+        modelo (ModeloEvaluacion, optional): Modelo con el que se evalúan las combinaciones
+
+    Returns:
+        str: Ruta del archivo generado, o None si el banco supera TABLA_BINARIA_MAX_PREGUNTAS
+    """
+    if not tabla_admitida(modelo):
+        return None
+    ruta = ruta or ruta_tabla(modelo)
+    total = 1 << len(modelo.ids)
+    bits = np.arange(len(modelo.ids))
+    pesos_cercanas = 1 << np.arange(len(ARQUITECTURAS))
+
+    # Escribir en un temporal y renombrar al final para no dejar tablas a medias
+    ruta_temporal = f"{ruta}.tmp"
+    tabla = np.lib.format.open_memmap(ruta_temporal, mode="w+", dtype=DTYPE_TABLA, shape=(total,))
+    for inicio in range(0, total, TAMANO_BLOQUE):
+        mascaras = np.arange(inicio, min(inicio + TAMANO_BLOQUE, total))
+        respuestas = ((mascaras[:, None] >> bits) & 1).astype(float)
+        puntuaciones = modelo.evaluar(respuestas)["puntuaciones"]
+        indice_maximo, cercanas, indice_recomendacion = modelo.recomendar(puntuaciones)
+
+        bloque = tabla[inicio:inicio + len(mascaras)]
+        bloque["puntuaciones"] = puntuaciones
+        bloque["indice_maximo"] = indice_maximo
+        bloque["cercanas"] = cercanas @ pesos_cercanas
+        bloque["indice_recomendacion"] = indice_recomendacion
+    tabla.flush()
+    del tabla
+    os.replace(ruta_temporal, ruta)
+    return ruta
+
+
+def cargar_tabla(construir=False):
+    """
+    Abre la tabla del modelo actual como memoria mapeada.
+
+    Args:
+        construir (bool): Si es True y la tabla no existe, se construye
+
+    Returns:
+        np.memmap: Tabla de resultados o None si no está disponible
+    """
+    global _tabla
+    if _tabla is None:
+        ruta = ruta_tabla()
+        if not os.path.exists(ruta):
+            if not construir or construir_tabla(ruta) is None:
+                return None
+        _tabla = np.load(ruta, mmap_mode="r")
+    return _tabla
+
+
+def _tabla_obligatoria():
+    """Tabla del modelo actual, construyéndola si hace falta"""
+    tabla = cargar_tabla(construir=True)
+    if tabla is None:
+        raise RuntimeError(
+            f"La tabla binaria no está disponible: el banco tiene {len(MODELO.ids)} preguntas "
+            f"(máximo {TABLA_BINARIA_MAX_PREGUNTAS})"
+        )
+    return tabla
+
+
+def mascaras_respuestas(matriz):
+    """
+    Convierte una matriz N×P de respuestas binarias (0/1) en sus máscaras de bits.
+
+    Returns:
+        np.ndarray: Máscara de cada fila, o -1 si la fila no es binaria o está incompleta
+    """
+    matriz = np.atleast_2d(np.asarray(matriz, dtype=float))
+    binaria = ((matriz == 0) | (matriz == 1)).all(axis=1)
+    mascaras = (np.where(matriz == 1, 1, 0) << np.arange(matriz.shape[1])).sum(axis=1)
+    return np.where(binaria, mascaras, -1)
+
+
+def consultar(vector):
+    """
+    Lee de la tabla el resultado de una encuesta binaria.
+
+    Args:
+        vector (np.ndarray): Vector de respuestas en el orden del modelo
+
+    Returns:
+        tuple: (puntuaciones, indice_maximo, cercanas) o None si la tabla no está
+            disponible o las respuestas no son binarias y completas
+    """
+    tabla = cargar_tabla()
+    if tabla is None:
+        return None
+    mascara = int(mascaras_respuestas(vector)[0])
+    if mascara < 0:
+        return None
+
+    registro = tabla[mascara]
+    cercanas = [bool(registro["cercanas"] >> i & 1) for i in range(len(ARQUITECTURAS))]
+    return np.array(registro["puntuaciones"]), int(registro["indice_maximo"]), cercanas
+
+
+def consultar_lote(matriz):
+    """
+    Lee de la tabla los resultados de un lote de encuestas binarias.
+
+    Args:
+        matriz (np.ndarray): Matriz N×P de respuestas 0/1 completas
+
+    Returns:
+        np.ndarray: Registros de la tabla (DTYPE_TABLA) para cada fila
+    """
+    tabla = _tabla_obligatoria()
+    mascaras = mascaras_respuestas(matriz)
+    if (mascaras < 0).any():
+        raise ValueError("Todas las respuestas deben ser binarias (0 o 1) y estar completas")
+    return tabla[mascaras]
+
+
+def contar_combinaciones(tipo=None, arquitectura_maxima=None, fijas=None):
+    """
+    Cuenta cuántas combinaciones de respuestas binarias llevan a un resultado.
+
+    Args:
+        tipo (str, optional): Tipo de recomendación final (p. ej. "hibrido")
+        arquitectura_maxima (str, optional): Arquitectura con mayor puntuación
+        fijas (dict, optional): Id de pregunta -> 0/1 para restringir las combinaciones
+
+    Returns:
+        int: Número de combinaciones que cumplen todas las condiciones
+    """
+    tabla = _tabla_obligatoria()
+    seleccion = np.ones(len(tabla), dtype=bool)
+
+    if fijas:
+        bits_fijos = 0
+        valores_fijos = 0
+        for id_pregunta, valor in fijas.items():
+            bit = 1 << MODELO.columna(id_pregunta)
+            bits_fijos |= bit
+            if valor:
+                valores_fijos |= bit
+        seleccion &= (np.arange(len(tabla)) & bits_fijos) == valores_fijos
+
+    if tipo is not None:
+        seleccion &= tabla["indice_recomendacion"] == ARQUITECTURAS.index(tipo)
+    if arquitectura_maxima is not None:
+        seleccion &= tabla["indice_maximo"] == ARQUITECTURAS.index(arquitectura_maxima)
+
+    return int(np.count_nonzero(seleccion))
+
+
+def distribucion_recomendaciones():
+    """
+    Número de combinaciones binarias que terminan en cada tipo de recomendación.
+
+    Returns:
+        dict: Tipo de arquitectura -> número de combinaciones
+    """
+    tabla = _tabla_obligatoria()
+    conteos = np.bincount(tabla["indice_recomendacion"], minlength=len(ARQUITECTURAS))
+    return {arquitectura: int(conteo) for arquitectura, conteo in zip(ARQUITECTURAS, conteos)}
+
+
+if __name__ == "__main__":
+    ruta = construir_tabla()
+    if ruta is None:
+        print(f"Tabla binaria omitida: el banco tiene {len(MODELO.ids)} preguntas "
+              f"(máximo {TABLA_BINARIA_MAX_PREGUNTAS}); los resultados se calcularán con el modelo")
+        raise SystemExit(0)
+    print(f"Tabla binaria generada en {ruta}")
+    for arquitectura, conteo in distribucion_recomendaciones().items():
+        print(f"  {arquitectura}: {conteo} combinaciones")
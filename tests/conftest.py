@@ -0,0 +1,8 @@
+"""
+Configuración de pytest: los módulos de la aplicación se importan desde app/,
+igual que al ejecutarla con `streamlit run app/main.py`.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
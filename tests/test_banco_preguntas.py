@@ -0,0 +1,33 @@
+import copy
+import numpy as np
+import pytest
+from context.arquitectura_data import BANCO_PREGUNTAS
+from utils.banco_preguntas import BancoPreguntas
+from utils.modelo_evaluacion import MODELO, ModeloEvaluacion
+
+
+def _variante(cambios=None):
+    categorias = copy.deepcopy(BANCO_PREGUNTAS.categorias)
+    for indice, categoria in enumerate(categorias):
+        categoria.update((cambios or {}).get(indice, {}))
+    return categorias
+
+
+def test_variante_con_otros_nombres_de_categoria_compila_el_mismo_modelo():
+    categorias = _variante({i: {"categoria": f"Bloque {i}"} for i in range(3)})
+    banco = BancoPreguntas("variante", 1, categorias, BANCO_PREGUNTAS.fraccion_global)
+    modelo = ModeloEvaluacion(banco.categorias, banco.fraccion_global, banco=banco)
+
+    np.testing.assert_array_equal(modelo.proyeccion, MODELO.proyeccion)
+    assert modelo.huella() == MODELO.huella()
+
+
+def test_banco_sin_rol_o_con_rol_repetido_falla_al_cargar():
+    with pytest.raises(ValueError, match="rol"):
+        BancoPreguntas("variante", 1, _variante({0: {"rol": None}}), BANCO_PREGUNTAS.fraccion_global)
+    with pytest.raises(ValueError, match="repetido"):
+        BancoPreguntas("variante", 1, _variante({0: {"rol": "global"}}), BANCO_PREGUNTAS.fraccion_global)
+    with pytest.raises(ValueError, match="peso"):
+        BancoPreguntas("variante", 1, _variante({2: {"peso": 0}}), BANCO_PREGUNTAS.fraccion_global)
+    with pytest.raises(ValueError, match="fraccion_global"):
+        BancoPreguntas("variante", 1, _variante(), {"microservicios": 1.0})
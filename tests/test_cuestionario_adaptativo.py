@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+from utils.cuestionario_adaptativo import completar_respuestas, estado_adaptativo, VALOR_IMPUTADO
+from utils.estado_sesion import RespuestasSesion, ResultadosSesion
+from utils.evaluacion_helper import procesar_respuestas
+from utils.incertidumbre import simular_respuestas
+from utils.modelo_evaluacion import MODELO, ARQUITECTURAS
+from utils.sensibilidad import analizar_sensibilidad
+
+RESPONDIDAS = [str(id_pregunta) for id_pregunta in MODELO.ids[:6]]
+
+
+def _parciales():
+    return RespuestasSesion({id_pregunta: 1.0 for id_pregunta in RESPONDIDAS})
+
+
+def test_imputadas_fuera_del_detalle_por_categoria():
+    completas = completar_respuestas(_parciales())
+    resultados = procesar_respuestas(completas, "lineal")
+    for resultados_encuesta in (resultados, ResultadosSesion(resultados, completas)):
+        detalle = [r["id"] for c in MODELO.categorias for r in resultados_encuesta[c]["respuestas"]]
+        assert sorted(detalle) == sorted(RESPONDIDAS)
+    # Los promedios sí incluyen el valor neutro de las preguntas sin responder
+    assert sum(resultados[c]["total_preguntas"] for c in MODELO.categorias) == len(MODELO.ids)
+
+
+def test_imputadas_fuera_de_sensibilidad_y_simulacion():
+    completas = completar_respuestas(_parciales())
+    analisis = analizar_sensibilidad(completas)
+    assert sorted(str(p["id"]) for p in analisis["preguntas"]) == sorted(RESPONDIDAS)
+
+    simuladas = simular_respuestas(completas, muestras=50, semilla=1)
+    imputadas = MODELO.mascara_imputadas(completas)
+    assert imputadas.sum() == len(MODELO.ids) - len(RESPONDIDAS)
+    assert np.all(simuladas[:, imputadas] == VALOR_IMPUTADO)
+
+
+def _encuesta_adaptativa(generador, binaria):
+    """Responde en el orden de influencia hasta que la recomendación queda decidida"""
+    respuestas = {}
+    estado = estado_adaptativo(respuestas)
+    while not estado["decidida"]:
+        id_pregunta = str(estado["pendientes"][0])
+        respuestas[id_pregunta] = {"valor": float(generador.integers(0, 2) if binaria else generador.random())}
+        estado = estado_adaptativo(respuestas)
+    return respuestas, estado
+
+
+@pytest.mark.parametrize("binaria", [True, False])
+def test_recomendacion_decidida_coincide_con_cualquier_final(binaria):
+    generador = np.random.default_rng(7)
+    for _ in range(500):
+        respuestas, estado = _encuesta_adaptativa(generador, binaria)
+        vector = MODELO.vector_respuestas(respuestas)
+        pendientes = np.isnan(vector)
+
+        # Extremos (todo 0 o todo 1), valor imputado y finales aleatorios binarios y continuos
+        finales = np.vstack([
+            np.zeros((1, len(vector))), np.ones((1, len(vector))), np.full((1, len(vector)), VALOR_IMPUTADO),
+            generador.integers(0, 2, (100, len(vector))), generador.random((100, len(vector)))
+        ])
+        matriz = np.where(pendientes, finales, vector)
+        puntuaciones = MODELO.evaluar(matriz)["puntuaciones"]
+        indice_maximo, cercanas, indice_recomendacion = MODELO.recomendar(puntuaciones)
+
+        assert {ARQUITECTURAS[i] for i in indice_recomendacion} == {estado["recomendacion"]}
+        # Con un empate exacto la ganadora puede ser cualquiera de las empatadas
+        ganadora = ARQUITECTURAS.index(estado["ganadora"])
+        assert np.allclose(puntuaciones[:, ganadora], puntuaciones.max(axis=1))
+        # El conjunto de arquitecturas en cabeza (ganadora y cercanas) es el mismo en todos los finales
+        en_cabeza = cercanas.copy()
+        en_cabeza[np.arange(len(matriz)), indice_maximo] = True
+        assert (en_cabeza == np.isin(ARQUITECTURAS, [estado["ganadora"], *estado["cercanas"]])).all()
+        if not estado["cercanas"]:
+            assert {ARQUITECTURAS[i] for i in indice_maximo} == {estado["ganadora"]}
+            assert not cercanas.any()
+
+
+def test_empate_exacto_con_todo_respondido_esta_decidido():
+    # Microservicios y monolítico empatan a 0.5: la diferencia ya no puede cambiar
+    valores = {1: 1, 2: 1, 3: 0, 4: 1, 5: 0, 6: 1, 7: 1, 8: 0, 9: 0, 10: 1, 11: 1, 12: 0, 13: 1, 14: 0, 15: 1, 16: 1, 17: 1, 18: 0}
+    estado = estado_adaptativo({str(id_pregunta): {"valor": float(valor)} for id_pregunta, valor in valores.items()})
+
+    assert estado["decidida"]
+    assert estado["recomendacion"] == "hibrido"
+    assert estado["pendientes"] == []
+
+
+def test_categorias_omitibles_coinciden_con_sus_preguntas():
+    generador = np.random.default_rng(11)
+    for _ in range(300):
+        respondidas = generador.random(len(MODELO.ids)) < generador.random()
+        respuestas = {str(MODELO.ids[j]): float(generador.integers(0, 2)) for j in np.flatnonzero(respondidas)}
+        estado = estado_adaptativo(respuestas)
+        omitibles = {str(id_pregunta) for id_pregunta in estado["omitibles"]}
+        for indice, categoria in enumerate(MODELO.categorias):
+            sin_responder = [str(MODELO.ids[j]) for j in np.flatnonzero(MODELO.indice_categoria == indice) if not respondidas[j]]
+            esperada = bool(sin_responder) and all(id_pregunta in omitibles for id_pregunta in sin_responder)
+            assert (categoria in estado["categorias_omitibles"]) == esperada
@@ -0,0 +1,81 @@
+import json
+from utils.estadisticas_agregadas import (
+    EstadisticasAgregadas,
+    BANCO_REGISTROS_ANTERIORES,
+    MOTOR_REGISTROS_ANTERIORES,
+    cargar_estadisticas,
+)
+
+
+def test_histogramas_separados_por_banco(tmp_path):
+    estadisticas = EstadisticasAgregadas(str(tmp_path / "estadisticas.json"))
+    estadisticas.actualizar({"banco": "arquitectura@v1", "respuestas": {"1": 0.95}, "resultados": {}})
+    estadisticas.actualizar({"banco": "arquitectura@v2", "respuestas": {"1": 0.05}, "resultados": {}})
+    estadisticas.actualizar({"respuestas": {"1": 0.95}, "resultados": {}})
+
+    preguntas = estadisticas.instantanea()["preguntas"]
+    assert preguntas["arquitectura@v2"]["1"][0] == 1
+    assert sum(preguntas["arquitectura@v2"]["1"]) == 1
+    assert preguntas[BANCO_REGISTROS_ANTERIORES]["1"][-1] == 2
+
+
+def test_recomendaciones_y_puntuaciones_separadas_por_motor(tmp_path):
+    estadisticas = EstadisticasAgregadas(str(tmp_path / "estadisticas.json"))
+    resultados = {"recomendacion": {"tipo": "eventos"}, "puntuaciones_globales": {"eventos": 0.8}}
+    estadisticas.actualizar({"resultados": resultados, "sesion": {"motor": "difuso"}})
+    estadisticas.actualizar({"resultados": resultados})
+
+    instantanea = estadisticas.instantanea()
+    assert instantanea["recomendaciones"] == {"difuso": {"eventos": 1}, MOTOR_REGISTROS_ANTERIORES: {"eventos": 1}}
+    assert instantanea["puntuaciones_globales"]["difuso"]["eventos"]["n"] == 1
+
+
+def _registro(id_registro, tipo):
+    return {"id": id_registro, "respuestas": {"1": 0.5}, "resultados": {"recomendacion": {"tipo": tipo}}}
+
+
+def _escribir(ruta, registros):
+    with open(ruta, "a", encoding="utf-8") as f:
+        for registro in registros:
+            f.write(json.dumps(registro) + "\n")
+
+
+def test_carga_reproduce_los_registros_posteriores_a_la_instantanea(tmp_path):
+    ruta = str(tmp_path / "estadisticas.json")
+    resultados = str(tmp_path / "resultados.jsonl")
+    guardados = [_registro(f"r{i}", "eventos") for i in range(3)]
+    _escribir(resultados, guardados)
+    estadisticas = EstadisticasAgregadas(ruta)
+    estadisticas.actualizar_lote(guardados)
+
+    # Un lote llega a disco pero el proceso termina antes de guardar la instantánea
+    _escribir(resultados, [_registro("r3", "hibrido"), _registro("r4", "hibrido")])
+
+    cargadas = cargar_estadisticas(ruta, resultados)
+    instantanea = cargadas.instantanea()
+    assert instantanea["registros"] == 5
+    assert instantanea["recomendaciones"][MOTOR_REGISTROS_ANTERIORES] == {"eventos": 3, "hibrido": 2}
+
+    # La instantánea queda al día: cargarla otra vez no vuelve a sumar la cola
+    assert cargar_estadisticas(ruta, resultados).instantanea()["registros"] == 5
+
+
+def test_instantanea_sin_su_ultimo_registro_se_reconstruye(tmp_path):
+    ruta = str(tmp_path / "estadisticas.json")
+    resultados = str(tmp_path / "resultados.jsonl")
+    EstadisticasAgregadas(ruta).actualizar_lote([_registro("perdido", "eventos")])
+    _escribir(resultados, [_registro("r0", "hibrido")])
+
+    instantanea = cargar_estadisticas(ruta, resultados).instantanea()
+    assert instantanea["registros"] == 1
+    assert instantanea["recomendaciones"][MOTOR_REGISTROS_ANTERIORES] == {"hibrido": 1}
+
+
+def test_instantanea_no_comparte_estado(tmp_path):
+    estadisticas = EstadisticasAgregadas(str(tmp_path / "estadisticas.json"))
+    estadisticas.actualizar(_registro("r0", "eventos"))
+    instantanea = estadisticas.instantanea()
+    estadisticas.actualizar(_registro("r1", "eventos"))
+
+    assert instantanea["recomendaciones"][MOTOR_REGISTROS_ANTERIORES] == {"eventos": 1}
+    assert sum(instantanea["preguntas"][BANCO_REGISTROS_ANTERIORES]["1"]) == 1
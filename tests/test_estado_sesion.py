@@ -0,0 +1,53 @@
+import json
+import pickle
+import numpy as np
+from utils.estado_sesion import RespuestasSesion, ResultadosSesion
+from utils.evaluacion_helper import procesar_respuestas
+from utils.modelo_evaluacion import MODELO
+
+
+def _respuestas_dict(semilla, respondidas=12):
+    generador = np.random.default_rng(semilla)
+    columnas = generador.choice(len(MODELO.ids), respondidas, replace=False)
+    return {
+        str(MODELO.ids[j]): {
+            "valor": float(generador.random()),
+            "peso": float(MODELO.pesos[j]),
+            "categoria": MODELO.categorias[MODELO.indice_categoria[j]]
+        }
+        for j in sorted(columnas)
+    }
+
+
+def test_respuestas_equivalen_al_formato_anterior():
+    original = _respuestas_dict(1)
+    respuestas = RespuestasSesion(original)
+
+    assert {id_pregunta: dict(respuesta) for id_pregunta, respuesta in respuestas.items()} == original
+    assert len(respuestas) == len(original)
+    del respuestas[next(iter(original))]
+    assert next(iter(original)) not in respuestas
+    assert len(respuestas) == len(original) - 1
+
+
+def test_respuestas_copia_y_pickle():
+    respuestas = RespuestasSesion(_respuestas_dict(2))
+    respuestas["1"] = {"valor": 0.5, "imputada": True}
+    vector = respuestas.vector()
+
+    for copia in (respuestas.copy(), pickle.loads(pickle.dumps(respuestas))):
+        assert copia.modelo is MODELO
+        assert dict(copia.items()) == dict(respuestas.items())
+        assert copia["1"]["imputada"] is True
+        # Las copias son independientes del original
+        copia["2"] = 0.25
+        assert np.array_equal(respuestas.vector(), vector, equal_nan=True)
+
+
+def test_resultados_equivalen_a_procesar_respuestas():
+    original = _respuestas_dict(3)
+    resultados = procesar_respuestas(original, "lineal")
+    sesion = ResultadosSesion(resultados, RespuestasSesion(original))
+
+    assert json.loads(json.dumps(dict(sesion))) == json.loads(json.dumps(resultados))
+    assert json.loads(json.dumps(dict(pickle.loads(pickle.dumps(sesion))))) == json.loads(json.dumps(resultados))
@@ -0,0 +1,46 @@
+import io
+import json
+from herramientas.evaluar_lote import evaluar_bloque, evaluar_flujo
+
+
+def _lineas(*registros):
+    return [json.dumps(registro) + "\n" for registro in registros]
+
+
+def test_linea_invalida_entre_dos_validas():
+    lineas = _lineas(
+        {"id": "a", "respuestas": {"1": 1}},
+        {"id": "bad", "respuestas": {"99": 1}},
+        {"id": "c", "respuestas": {"2": 1}},
+    )
+    texto, errores = evaluar_bloque(lineas, 1)
+    salida = [json.loads(linea) for linea in texto.splitlines()]
+
+    assert errores == 1
+    assert [registro["id"] for registro in salida] == ["a", 2, "c"]
+    assert "error" in salida[1]
+    assert "recomendacion" in salida[0] and "recomendacion" in salida[2]
+
+
+def test_linea_invalida_al_final_no_desplaza_resultados():
+    lineas = _lineas(
+        {"id": "a", "respuestas": {"1": 1}},
+        {"id": "c", "respuestas": {"2": 1}},
+        {"id": "bad", "respuestas": {"99": 1}},
+    )
+    texto, errores = evaluar_bloque(lineas, 1)
+    salida = [json.loads(linea) for linea in texto.splitlines()]
+    unico = [json.loads(evaluar_bloque(_lineas(registro), 1)[0]) for registro in
+             ({"id": "a", "respuestas": {"1": 1}}, {"id": "c", "respuestas": {"2": 1}})]
+
+    assert errores == 1
+    assert salida[:2] == unico
+    assert "error" in salida[2]
+
+
+def test_flujo_con_json_invalido():
+    entrada = io.StringIO('{"id": "a", "respuestas": {"1": 0}}\nno es json\n')
+    salida = io.StringIO()
+    total, errores = evaluar_flujo(entrada, salida, tamano_bloque=1)
+    assert (total, errores) == (2, 1)
+    assert len(salida.getvalue().splitlines()) == 2
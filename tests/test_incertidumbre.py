@@ -0,0 +1,24 @@
+import numpy as np
+from context.arquitectura_data import INTERPRETACION_DIFUSA
+from utils.incertidumbre import bandas_respuestas, simular_respuestas
+from utils.modelo_evaluacion import MODELO
+
+
+def test_bandas_en_los_limites():
+    valores = np.array([0.0, 0.33, 0.34, 0.66, 0.67, 1.0, np.nan])
+    inferiores, superiores = bandas_respuestas(valores)
+    esperadas = [INTERPRETACION_DIFUSA[b] for b in ("baja", "baja", "media", "media", "alta", "alta")]
+
+    assert list(zip(inferiores[:-1], superiores[:-1])) == esperadas
+    assert np.isnan(inferiores[-1]) and np.isnan(superiores[-1])
+
+
+def test_simulaciones_dentro_de_la_banda_de_cada_respuesta():
+    limites = [0.33, 0.34, 0.66, 0.67]
+    respuestas = {
+        str(id_pregunta): {"valor": limites[i % len(limites)]} for i, id_pregunta in enumerate(MODELO.ids)
+    }
+    simuladas = simular_respuestas(respuestas, muestras=500, semilla=3)
+    inferiores, superiores = bandas_respuestas(MODELO.vector_respuestas(respuestas))
+
+    assert np.all((simuladas >= inferiores) & (simuladas <= superiores))
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from utils import inferencia_difusa
+from utils.inferencia_difusa import MotorDifuso, pertenencia_trapecio, trapecios_entrada, puntuar_difuso
+from utils.modelo_evaluacion import MODELO, ARQUITECTURAS, ROL_AUTONOMIA, ROL_EVENTOS
+
+VALORES = np.linspace(0.0, 1.0, 201)
+
+
+def test_pertenencias_de_entrada_suman_uno():
+    pertenencias = pertenencia_trapecio(VALORES, trapecios_entrada())
+    np.testing.assert_allclose(pertenencias.sum(axis=-1), 1.0, atol=1e-12)
+    assert pertenencias.min() >= 0.0 and pertenencias.max() <= 1.0
+
+
+@pytest.mark.parametrize("arquitectura, rol, sentido", [
+    ("microservicios", ROL_AUTONOMIA, 1),
+    ("monolitico", ROL_AUTONOMIA, -1),
+    ("eventos", ROL_EVENTOS, 1),
+    ("hibrido", ROL_AUTONOMIA, 1),
+    ("hibrido", ROL_EVENTOS, 1),
+])
+def test_puntuacion_monotona_en_su_categoria(arquitectura, rol, sentido):
+    categoria = MODELO.indice_rol[rol]
+    k = ARQUITECTURAS.index(arquitectura)
+    # Recorrer la categoría con las demás fijas en varios puntos de la rejilla
+    for fijos in np.random.default_rng(3).random((20, len(MODELO.categorias))):
+        promedios = np.tile(fijos, (len(VALORES), 1))
+        promedios[:, categoria] = VALORES
+        puntuaciones = puntuar_difuso(promedios)[:, k]
+        assert np.all(sentido * np.diff(puntuaciones) >= -1e-12)
+
+
+def test_lote_e_individual_coinciden(monkeypatch):
+    # Bloques pequeños para que el lote cruce varios límites de bloque
+    monkeypatch.setattr(inferencia_difusa, "TAMANO_BLOQUE", 7)
+    promedios = np.random.default_rng(4).random((50, len(MODELO.categorias)))
+    motor = MotorDifuso()
+
+    lote = motor.puntuar(promedios)
+    individuales = np.vstack([motor.puntuar(fila) for fila in promedios])
+    np.testing.assert_array_equal(lote, individuales)
@@ -0,0 +1,108 @@
+"""
+Paridad del motor lineal con la fórmula original de evaluacion_helper (antes de compilar
+el modelo): mismas puntuaciones bit a bit y misma recomendación, también en los empates.
+"""
+import numpy as np
+import pytest
+from context.arquitectura_data import PREGUNTAS_ARQUITECTURA
+from utils.evaluacion_helper import procesar_respuestas, procesar_respuestas_lote
+from utils.modelo_evaluacion import MODELO, ARQUITECTURAS
+
+CAT_MS = "División y Autonomía de Servicios"
+CAT_GLOBAL = "Disponibilidad, Integración y Escalabilidad Global"
+CAT_EVENTOS = "Arquitectura Orientada a Eventos"
+# Pesos por categoría de la configuración original
+PESOS_CATEGORIAS = {CAT_MS: 0.4, CAT_GLOBAL: 0.35, CAT_EVENTOS: 0.25}
+
+
+def puntuaciones_originales(respuestas):
+    """Copia del cálculo original: promedio = Σ(valor·peso)/n y combinación por categoría"""
+    sumas = {categoria["categoria"]: 0 for categoria in PREGUNTAS_ARQUITECTURA}
+    conteos = dict.fromkeys(sumas, 0)
+    for respuesta in respuestas.values():
+        sumas[respuesta["categoria"]] += respuesta["valor"] * respuesta["peso"]
+        conteos[respuesta["categoria"]] += 1
+    promedios = {c: sumas[c] / conteos[c] if conteos[c] > 0 else 0 for c in sumas}
+
+    peso_ms_autonomia = PESOS_CATEGORIAS[CAT_MS]
+    peso_ms_global = PESOS_CATEGORIAS[CAT_GLOBAL] * 0.7
+    ms = (promedios[CAT_MS] * peso_ms_autonomia + promedios[CAT_GLOBAL] * peso_ms_global) / (peso_ms_autonomia + peso_ms_global)
+    peso_ev_eventos = PESOS_CATEGORIAS[CAT_EVENTOS]
+    peso_ev_global = PESOS_CATEGORIAS[CAT_GLOBAL] * 0.3
+    ev = (promedios[CAT_EVENTOS] * peso_ev_eventos + promedios[CAT_GLOBAL] * peso_ev_global) / (peso_ev_eventos + peso_ev_global)
+    puntuaciones = {"microservicios": ms, "eventos": ev, "monolitico": 1 - ms, "hibrido": (ms + ev) / 2}
+
+    maxima = max(puntuaciones, key=lambda x: puntuaciones[x])
+    cercanas = [a for a in puntuaciones if a != maxima and puntuaciones[maxima] - puntuaciones[a] < 0.15]
+    return promedios, puntuaciones, maxima, cercanas
+
+
+def respuestas_desde_vector(vector):
+    respuestas = {}
+    for categoria in PREGUNTAS_ARQUITECTURA:
+        for pregunta in categoria["preguntas"]:
+            valor = vector[MODELO.indice_pregunta[str(pregunta["id"])]]
+            if not np.isnan(valor):
+                respuestas[str(pregunta["id"])] = {"valor": float(valor), "peso": pregunta["peso"],
+                                                   "categoria": categoria["categoria"]}
+    return respuestas
+
+
+def _matriz(semilla, binaria):
+    rng = np.random.default_rng(semilla)
+    matriz = rng.integers(0, 2, (3000, len(MODELO.ids))).astype(float) if binaria else rng.random((3000, len(MODELO.ids)))
+    matriz[rng.random(matriz.shape) < 0.1] = np.nan
+    return matriz
+
+
+@pytest.mark.parametrize("binaria", [True, False])
+def test_lote_e_individual_coinciden_con_la_formula_original(binaria):
+    matriz = _matriz(1, binaria)
+    lote = procesar_respuestas_lote(matriz, "lineal")
+    for fila in range(len(matriz)):
+        respuestas = respuestas_desde_vector(matriz[fila])
+        promedios, puntuaciones, maxima, cercanas = puntuaciones_originales(respuestas)
+
+        esperadas = [puntuaciones[a] for a in ARQUITECTURAS]
+        assert lote["puntuaciones_globales"][fila].tolist() == esperadas
+        assert ARQUITECTURAS[lote["indice_maximo"][fila]] == maxima
+
+        resultados = procesar_respuestas(respuestas, "lineal")
+        assert [resultados["puntuaciones_globales"][a] for a in ARQUITECTURAS] == esperadas
+        assert [resultados[c]["promedio"] for c in promedios] == list(promedios.values())
+        assert resultados["recomendacion"]["cercanas"] == cercanas
+
+
+def test_empates_exactos_se_resuelven_como_la_formula_original():
+    # Promedios iguales en todas las categorías: microservicios y monolítico empatan en 0.5
+    respuestas = {}
+    for categoria in PREGUNTAS_ARQUITECTURA:
+        for pregunta in categoria["preguntas"]:
+            respuestas[str(pregunta["id"])] = {"valor": 0.5 / pregunta["peso"], "peso": pregunta["peso"],
+                                               "categoria": categoria["categoria"]}
+    _, puntuaciones, maxima, cercanas = puntuaciones_originales(respuestas)
+    resultados = procesar_respuestas(respuestas, "lineal")
+
+    assert [resultados["puntuaciones_globales"][a] for a in ARQUITECTURAS] == [puntuaciones[a] for a in ARQUITECTURAS]
+    assert maxima == "microservicios"
+    assert resultados["recomendacion"]["cercanas"] == cercanas
+    assert resultados["recomendacion"]["descripcion"].startswith("Arquitectura Híbrida (combinando Arquitectura de Microservicios")
+
+
+def test_empates_en_respuestas_binarias():
+    matriz = np.random.default_rng(7).integers(0, 2, (20000, len(MODELO.ids))).astype(float)
+    lote = procesar_respuestas_lote(matriz, "lineal")
+    empates = 0
+    for fila in range(len(matriz)):
+        _, puntuaciones, maxima, _ = puntuaciones_originales(respuestas_desde_vector(matriz[fila]))
+        if sum(p == puntuaciones[maxima] for p in puntuaciones.values()) > 1:
+            empates += 1
+            assert ARQUITECTURAS[lote["indice_maximo"][fila]] == maxima
+    assert empates > 0
+
+
+def test_sin_respuestas():
+    _, puntuaciones, maxima, _ = puntuaciones_originales({})
+    resultados = procesar_respuestas({}, "lineal")
+    assert resultados["puntuaciones_globales"] == puntuaciones
+    assert maxima == "monolitico" and resultados["recomendacion"]["tipo"] == "monolitico"
@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+
+import openai
+from utils import openai_helper
+
+
+def test_aciertos_de_cache_no_cuentan_en_el_ttft(monkeypatch):
+    monkeypatch.setattr(openai, "api_key", "sk-prueba")
+    monkeypatch.setattr(openai_helper, "CACHE_RESPUESTAS_ACTIVA", True)
+    monkeypatch.setattr(openai_helper, "construir_mensajes", lambda mensaje, contexto=None: [{"role": "user", "content": mensaje}])
+    monkeypatch.setattr(openai_helper.cache_respuestas, "obtener", lambda clave: "respuesta guardada")
+    antes = openai_helper.obtener_metricas_streaming()
+
+    assert list(openai_helper.get_openai_response_stream("hola")) == ["respuesta guardada"]
+
+    despues = openai_helper.obtener_metricas_streaming()
+    assert despues["respuestas"] == antes["respuestas"]
+    assert despues["aciertos_cache"] == antes["aciertos_cache"] + 1
+
+
+def _contexto(puntuaciones, promedios, tipo="hibrido", cercanas=("microservicios", "eventos")):
+    resultados = {
+        "puntuaciones_globales": puntuaciones,
+        "recomendacion": {"tipo": tipo, "puntuacion": max(puntuaciones.values()), "cercanas": list(cercanas)},
+    }
+    for categoria, promedio in promedios.items():
+        resultados[categoria] = {"promedio": promedio, "respuestas": []}
+    return {
+        "resultados_encuesta": resultados,
+        "interpretacion_preliminar": f"Puntuación principal {max(puntuaciones.values())}",
+        "tiene_arquitecturas_cercanas": bool(cercanas),
+        "arquitecturas_cercanas": list(cercanas),
+    }
+
+
+def test_puntuaciones_distintas_con_la_misma_recomendacion_comparten_clave():
+    pregunta = "¿Cómo empiezo la migración?"
+    primero = _contexto(
+        {"monolitica": 0.41237, "microservicios": 0.71234, "eventos": 0.69871, "serverless": 0.5512},
+        {"Autonomía": 0.6731, "Escalabilidad": 0.7012, "Eventos": 0.6644},
+    )
+    segundo = _contexto(
+        {"monolitica": 0.38002, "microservicios": 0.65519, "eventos": 0.64108, "serverless": 0.50071},
+        {"Autonomía": 0.6012, "Escalabilidad": 0.6633, "Eventos": 0.6137},
+    )
+    mensajes_primero = openai_helper.construir_mensajes(pregunta, primero)
+    mensajes_segundo = openai_helper.construir_mensajes(pregunta, segundo)
+
+    # Los prompts difieren (llevan las puntuaciones), pero la clave de caché no
+    assert mensajes_primero != mensajes_segundo
+    assert openai_helper.clave_cache(mensajes_primero, primero) == openai_helper.clave_cache(mensajes_segundo, segundo)
+    assert openai_helper.clave_cache(mensajes_primero, primero) == openai_helper.clave_cache(
+        openai_helper.construir_mensajes("como empiezo la migracion", primero), primero
+    )
+
+    # Otra recomendación o otras arquitecturas cercanas no comparten la entrada
+    otro_tipo = _contexto(primero["resultados_encuesta"]["puntuaciones_globales"], {"Autonomía": 0.6731}, tipo="microservicios", cercanas=())
+    assert openai_helper.clave_cache(openai_helper.construir_mensajes(pregunta, otro_tipo), otro_tipo) != openai_helper.clave_cache(mensajes_primero, primero)
+    otras_cercanas = _contexto(primero["resultados_encuesta"]["puntuaciones_globales"], {"Autonomía": 0.6731}, cercanas=("microservicios", "serverless"))
+    assert openai_helper.clave_cache(openai_helper.construir_mensajes(pregunta, otras_cercanas), otras_cercanas) != openai_helper.clave_cache(mensajes_primero, primero)
+
+
+def test_segunda_consulta_con_otras_puntuaciones_acierta_en_la_cache(monkeypatch):
+    guardadas = {}
+    monkeypatch.setattr(openai, "api_key", "sk-prueba")
+    monkeypatch.setattr(openai_helper, "CACHE_RESPUESTAS_ACTIVA", True)
+    monkeypatch.setattr(openai_helper.cache_respuestas, "obtener", guardadas.get)
+    monkeypatch.setattr(openai_helper.cache_respuestas, "guardar", lambda clave, respuesta, latencia: guardadas.__setitem__(clave, respuesta))
+    llamadas = []
+
+    class _Cliente:
+        def chat_completion(self, **kwargs):
+            llamadas.append(kwargs)
+            mensaje = SimpleNamespace(content="respuesta del modelo")
+            return SimpleNamespace(choices=[SimpleNamespace(message=mensaje)])
+
+    monkeypatch.setattr(openai_helper, "obtener_cliente", _Cliente)
+    primero = _contexto({"microservicios": 0.71234, "eventos": 0.69871}, {"Autonomía": 0.6731})
+    segundo = _contexto({"microservicios": 0.65519, "eventos": 0.64108}, {"Autonomía": 0.6012})
+
+    assert openai_helper.get_openai_response("¿Qué patrón uso?", primero) == "respuesta del modelo"
+    assert openai_helper.get_openai_response("¿Qué patrón uso?", segundo) == "respuesta del modelo"
+    assert len(llamadas) == 1
@@ -0,0 +1,17 @@
+import os
+import subprocess
+import sys
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+
+
+def test_pagina_de_inicio_no_carga_el_modelo():
+    # Con streamlit sustituido por un módulo vacío, importar la página de inicio no debe
+    # cargar el modelo de evaluación (las páginas se importan solo al visitarlas)
+    codigo = (
+        "import sys, types; sys.modules['streamlit'] = types.ModuleType('streamlit'); "
+        "import pages.inicio; "
+        "print(sorted(m for m in ('numpy', 'utils.modelo_evaluacion', 'utils.banco_preguntas') if m in sys.modules))"
+    )
+    salida = subprocess.run([sys.executable, "-c", codigo], cwd=APP, capture_output=True, text=True, check=True)
+    assert salida.stdout.strip() == "[]"
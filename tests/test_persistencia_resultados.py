@@ -0,0 +1,74 @@
+import gzip
+import json
+import threading
+from utils.persistencia_resultados import EscritorResultados, leer_registros, segmentos
+
+
+def _registros(n, prefijo="r"):
+    return [{"id": f"{prefijo}{i}", "respuestas": {"1": 0.5}, "resultados": {}} for i in range(n)]
+
+
+def test_vaciar_deja_los_registros_en_disco(tmp_path):
+    ruta = str(tmp_path / "resultados.jsonl")
+    lotes = []
+    # Con un intervalo y un lote tan grandes, solo vaciar() provoca la escritura
+    escritor = EscritorResultados(ruta, intervalo_fsync=3600, max_lote=10000, al_escribir=lotes.append)
+    registros = _registros(50)
+    for registro in registros:
+        escritor.registrar(registro)
+
+    assert escritor.vaciar(timeout=5)
+    assert list(leer_registros(ruta)) == registros
+    assert [len(lote) for lote in lotes] == [50]
+    metricas = escritor.metricas()
+    assert (metricas["encolados"], metricas["escritos"], metricas["pendientes"]) == (50, 50, 0)
+
+
+def test_contadores_con_registros_desde_varios_hilos(tmp_path):
+    escritor = EscritorResultados(str(tmp_path / "resultados.jsonl"), intervalo_fsync=0.01, max_lote=7)
+    hilos = [
+        threading.Thread(target=lambda k=k: [escritor.registrar(r) for r in _registros(200, f"h{k}-")])
+        for k in range(8)
+    ]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert escritor.vaciar(timeout=5)
+    metricas = escritor.metricas()
+    assert metricas["encolados"] == metricas["escritos"] == 1600
+    assert metricas["pendientes"] == 0
+
+
+def test_rotacion_al_superar_max_bytes(tmp_path):
+    ruta = str(tmp_path / "resultados.jsonl")
+    escritor = EscritorResultados(ruta, intervalo_fsync=3600, max_bytes=1, max_segmentos=100)
+    registros = _registros(3)
+    for registro in registros:
+        escritor.registrar(registro)
+        assert escritor.vaciar(timeout=5)
+
+    # Cada lote supera max_bytes: el archivo activo se rota tras cada escritura
+    assert len(segmentos(ruta)) == 3
+    assert not (tmp_path / "resultados.jsonl").exists()
+    assert list(leer_registros(ruta)) == registros
+    assert escritor.metricas()["rotaciones"] == 3
+
+
+def test_compactacion_descarta_duplicados_y_lineas_danadas(tmp_path):
+    ruta = str(tmp_path / "resultados.jsonl")
+    primeros, segundos = _registros(3), _registros(5)[2:]
+    with open(tmp_path / "resultados.20240101T000000000000.jsonl", "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(r) + "\n" for r in primeros)
+        f.write('{"id": "incompl')
+    with open(tmp_path / "resultados.20240102T000000000000.jsonl", "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(r) + "\n" for r in segundos)
+
+    escritor = EscritorResultados(ruta)
+    escritor.compactar()
+
+    assert segmentos(ruta) == [str(tmp_path / "resultados.20240102T000000000000.jsonl.gz")]
+    with gzip.open(segmentos(ruta)[0], "rt", encoding="utf-8") as f:
+        assert [json.loads(linea)["id"] for linea in f] == ["r0", "r1", "r2", "r3", "r4"]
+    assert escritor.metricas()["compactaciones"] == 1
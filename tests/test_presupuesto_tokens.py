@@ -0,0 +1,31 @@
+from utils.presupuesto_tokens import ajustar_a_presupuesto, tokens_mensaje
+
+
+def _total(mensajes):
+    return sum(tokens_mensaje(m) for m in mensajes)
+
+
+def test_contexto_de_sistema_se_recorta_si_no_cabe():
+    sistema = [
+        {"role": "system", "content": "Eres un asistente de arquitectura de software."},
+        {"role": "system", "content": "Resultados de la encuesta: " + "microservicios 0.7 " * 10},
+        {"role": "system", "content": "Documentación de referencia: " + "texto largo " * 2000},
+    ]
+    usuario = {"role": "user", "content": "¿Qué arquitectura me recomiendas?"}
+    historial = [{"role": "user", "content": "hola"}, {"role": "assistant", "content": "hola, ¿en qué te ayudo?"}]
+
+    mensajes = ajustar_a_presupuesto(sistema, historial, usuario, 300)
+
+    assert _total(mensajes) <= 300
+    assert mensajes[0] == sistema[0]
+    assert mensajes[-1] == usuario
+    assert mensajes[1] == sistema[1]
+    assert mensajes[2]["content"].endswith("…")
+    assert len(sistema[2]["content"]) > len(mensajes[2]["content"])
+
+
+def test_sin_exceso_no_se_modifica_el_contexto():
+    sistema = [{"role": "system", "content": "Instrucciones"}, {"role": "system", "content": "Contexto"}]
+    usuario = {"role": "user", "content": "pregunta"}
+
+    assert ajustar_a_presupuesto(sistema, [], usuario, 1000) == sistema + [usuario]
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from utils.modelo_evaluacion import MODELO, ARQUITECTURAS
+from utils.evaluacion_helper import procesar_respuestas
+from utils.puntuacion_incremental import AcumuladorPuntuaciones, RESINCRONIZAR_CADA
+
+
+def _puntuaciones_modelo(valores):
+    vector = np.full(len(MODELO.ids), np.nan)
+    for id_pregunta, valor in valores.items():
+        vector[MODELO.columna(id_pregunta)] = valor
+    return MODELO.evaluar(vector[None, :])["puntuaciones"][0]
+
+
+def _comprobar(acumulador, valores):
+    puntuaciones = acumulador.puntuaciones("lineal")
+    assert acumulador.respondidas == len(valores)
+    np.testing.assert_allclose([puntuaciones[a] for a in ARQUITECTURAS], _puntuaciones_modelo(valores), atol=1e-12)
+
+
+def test_acumulador_coincide_con_el_modelo_tras_cambios():
+    generador = np.random.default_rng(5)
+    acumulador = AcumuladorPuntuaciones()
+    valores = {}
+    for paso in range(2 * RESINCRONIZAR_CADA + 10):
+        id_pregunta = str(MODELO.ids[generador.integers(len(MODELO.ids))])
+        if generador.random() < 0.2:
+            acumulador.quitar(id_pregunta)
+            valores.pop(id_pregunta, None)
+        else:
+            valor = float(generador.random())
+            acumulador.actualizar(id_pregunta, valor)
+            valores[id_pregunta] = valor
+        if paso % 17 == 0:
+            _comprobar(acumulador, valores)
+    _comprobar(acumulador, valores)
+
+
+def test_acumulador_reconstruido_desde_respuestas():
+    valores = {str(id_pregunta): float(i % 2) for i, id_pregunta in enumerate(MODELO.ids[:7])}
+    acumulador = AcumuladorPuntuaciones.desde_respuestas({k: {"valor": v} for k, v in valores.items()})
+    _comprobar(acumulador, valores)
+
+    # Una encuesta nueva empieza sin respuestas
+    _comprobar(AcumuladorPuntuaciones.desde_respuestas({}), {})
+
+
+def test_claves_cualificadas_y_simples_son_la_misma_pregunta():
+    acumulador = AcumuladorPuntuaciones()
+    id_pregunta = str(MODELO.ids[0])
+    acumulador.actualizar(id_pregunta, 1.0)
+    acumulador.actualizar(MODELO.banco.clave(id_pregunta), 0.5)
+    _comprobar(acumulador, {id_pregunta: 0.5})
+
+    with pytest.raises(KeyError):
+        acumulador.actualizar(f"otro@v1:{id_pregunta}", 1.0)
+
+
+def test_vista_previa_difusa_coincide_con_la_encuesta_procesada():
+    generador = np.random.default_rng(11)
+    respuestas = {
+        str(id_pregunta): {"valor": float(generador.random())}
+        for id_pregunta in MODELO.ids if generador.random() < 0.7
+    }
+    acumulador = AcumuladorPuntuaciones.desde_respuestas(respuestas)
+
+    puntuaciones = acumulador.puntuaciones("difuso")
+    esperadas = procesar_respuestas(respuestas, motor="difuso")["puntuaciones_globales"]
+    np.testing.assert_allclose([puntuaciones[a] for a in ARQUITECTURAS], [esperadas[a] for a in ARQUITECTURAS], atol=1e-12)
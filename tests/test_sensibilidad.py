@@ -0,0 +1,87 @@
+import numpy as np
+from config import UMBRAL_CERCANIA
+from utils.modelo_evaluacion import MODELO, ARQUITECTURAS
+from utils.sensibilidad import analizar_sensibilidad
+
+REJILLA = np.linspace(0.0, 1.0, 4001)
+PASO = REJILLA[1] - REJILLA[0]
+
+
+def _respuestas(vector):
+    return {str(id_pregunta): {"valor": float(valor)} for id_pregunta, valor in zip(MODELO.ids, vector)}
+
+
+def _recomendaciones(vector, j, valores):
+    """Recomendación reevaluando el modelo con la respuesta j en cada uno de los valores"""
+    matriz = np.tile(vector, (len(valores), 1))
+    matriz[:, j] = valores
+    return MODELO.recomendar(MODELO.evaluar(matriz)["puntuaciones"])[2]
+
+
+def _comprobar_pregunta(vector, pregunta, recomendacion):
+    j = MODELO.columna(pregunta["id"])
+    x = vector[j]
+    en_rejilla = _recomendaciones(vector, j, REJILLA)
+    distintas = REJILLA[en_rejilla != recomendacion] - x
+
+    cambio = pregunta["cambio_recomendacion"]
+    if cambio is None:
+        assert len(distintas) == 0
+    else:
+        # El corte analítico está entre el último punto de la rejilla sin cambio y el primero con cambio
+        mas_cercana = distintas[np.argmin(np.abs(distintas))]
+        assert np.sign(mas_cercana) == np.sign(cambio)
+        assert abs(cambio) <= abs(mas_cercana) + 1e-9
+        assert abs(mas_cercana) - abs(cambio) <= PASO + 1e-9
+        # Justo después del corte, la reevaluación da la recomendación anunciada
+        despues = np.clip(x + cambio + np.sign(cambio) * 1e-7, 0.0, 1.0)
+        assert ARQUITECTURAS[_recomendaciones(vector, j, [despues])[0]] == pregunta["nueva_recomendacion"]
+
+    invertida = _recomendaciones(vector, j, [1.0 - x])[0]
+    assert pregunta["invertir_cambia"] == (invertida != recomendacion)
+
+
+def test_cambio_recomendacion_coincide_con_la_reevaluacion_en_rejilla():
+    generador = np.random.default_rng(21)
+    vistos = {"cambio": 0, "sin_cambio": 0, "invertir": 0}
+    for vector in generador.random((40, len(MODELO.ids))):
+        analisis = analizar_sensibilidad(_respuestas(vector))
+        recomendacion = ARQUITECTURAS.index(analisis["recomendacion"])
+        for pregunta in analisis["preguntas"]:
+            _comprobar_pregunta(vector, pregunta, recomendacion)
+            vistos["cambio" if pregunta["cambio_recomendacion"] is not None else "sin_cambio"] += 1
+            vistos["invertir"] += pregunta["invertir_cambia"]
+    assert all(vistos.values())
+
+
+def test_respuesta_junto_al_umbral_de_cercania():
+    # Colocar una respuesta a ±delta del punto en que la diferencia entre las dos primeras
+    # arquitecturas cruza UMBRAL_CERCANIA: el cambio mínimo es delta hacia el umbral
+    generador = np.random.default_rng(22)
+    delta = 1e-4
+    probados = 0
+    for vector in generador.random((200, len(MODELO.ids))):
+        puntuaciones = MODELO.evaluar(vector[None, :])["puntuaciones"][0]
+        primera, segunda = np.argsort(-puntuaciones)[:2]
+        diferencia = puntuaciones[primera] - puntuaciones[segunda]
+        jacobiano = MODELO.jacobiano(vector)
+        pendiente = jacobiano[:, primera] - jacobiano[:, segunda]
+        j = int(np.argmax(np.abs(pendiente)))
+        corte = vector[j] + (UMBRAL_CERCANIA - diferencia) / pendiente[j]
+        if not delta < corte < 1 - delta:
+            continue
+
+        for lado in (-1.0, 1.0):
+            desplazado = vector.copy()
+            desplazado[j] = corte + lado * delta
+            # Las demás arquitecturas no deben interferir en la recomendación junto al corte
+            antes, despues = _recomendaciones(desplazado, j, [corte + lado * delta, corte - lado * delta])
+            if antes == despues:
+                continue
+            analisis = analizar_sensibilidad(_respuestas(desplazado))
+            pregunta = next(p for p in analisis["preguntas"] if MODELO.columna(p["id"]) == j)
+            assert abs(pregunta["cambio_recomendacion"] + lado * delta) < 1e-9
+            assert "hibrido" in (analisis["recomendacion"], pregunta["nueva_recomendacion"])
+            _comprobar_pregunta(desplazado, pregunta, ARQUITECTURAS.index(analisis["recomendacion"]))
+            probados += 1
+    assert probados >= 10
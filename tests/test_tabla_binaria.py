@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from utils import tabla_binaria
+from utils.evaluacion_helper import procesar_respuestas, procesar_respuestas_lote
+from utils.modelo_evaluacion import MODELO, ARQUITECTURAS
+
+
+@pytest.fixture(scope="module")
+def tabla(tmp_path_factory):
+    ruta = tabla_binaria.construir_tabla(str(tmp_path_factory.mktemp("tabla") / "tabla.npy"))
+    anterior = tabla_binaria._tabla
+    tabla_binaria._tabla = np.load(ruta, mmap_mode="r")
+    yield tabla_binaria._tabla
+    tabla_binaria._tabla = anterior
+
+
+def _respuestas(fila):
+    return {str(id_pregunta): {"valor": float(valor)} for id_pregunta, valor in zip(MODELO.ids, fila)}
+
+
+def test_tabla_coincide_con_el_modelo(tabla):
+    matriz = np.random.default_rng(3).integers(0, 2, (2000, len(MODELO.ids))).astype(float)
+    lote = procesar_respuestas_lote(matriz, "lineal")
+    for fila in range(len(matriz)):
+        resultados = procesar_respuestas(_respuestas(matriz[fila]), "lineal")
+        assert [resultados["puntuaciones_globales"][a] for a in ARQUITECTURAS] == lote["puntuaciones_globales"][fila].tolist()
+        cercanas = [a for a, cercana in zip(ARQUITECTURAS, lote["cercanas"][fila]) if cercana]
+        assert resultados["recomendacion"]["cercanas"] == cercanas
+
+
+def test_consulta_binaria_no_proyecta(tabla, monkeypatch):
+    def sin_proyeccion(*args, **kwargs):
+        raise AssertionError("la tabla binaria no debería necesitar la proyección")
+
+    monkeypatch.setattr(MODELO, "proyectar", sin_proyeccion)
+    monkeypatch.setattr(MODELO, "evaluar", sin_proyeccion)
+    resultados = procesar_respuestas(_respuestas(np.ones(len(MODELO.ids))), "lineal")
+    assert resultados["recomendacion"]["tipo"] in ARQUITECTURAS
+
+
+def test_banco_mayor_que_el_maximo_no_construye_tabla(tmp_path, monkeypatch):
+    monkeypatch.setattr(tabla_binaria, "TABLA_BINARIA_MAX_PREGUNTAS", len(MODELO.ids) - 1)
+    ruta = tmp_path / "tabla.npy"
+
+    assert tabla_binaria.construir_tabla(str(ruta)) is None
+    assert list(tmp_path.iterdir()) == []